@@ -5,7 +5,11 @@ A modular toolkit for evaluating AI-generated audio descriptions
 against human-written reference audio descriptions.
 
 Modules:
-    - matchers: Sequence matching algorithms (Cluster, DP, Overlap)
+    - matchers: Sequence matching algorithms (Cluster, DP, Anchored DP, Overlap, Assignment)
+    - streaming: Windowed matchers for unbounded or live event streams
+    - embeddings: Cached sentence embeddings for semantic text similarity
+    - sweep: Matcher hyper-parameter sweeps with shared similarity components
+    - incremental: Re-matching after small edits to the generated AD
     - evaluators: Evaluation metrics (LLM, BERTScore, METEOR, CIDEr, CRITIC)
     - config: YAML configuration management
     - utils: Common utility functions
@@ -19,13 +23,22 @@ from .utils import (
     generate_output_filename,
     extract_characters_from_csv,
     ADEvent,
+    EventTable,
 )
 from .matchers import (
     ClusterMatcher,
     DPMatcher,
+    AnchoredDPMatcher,
     OverlapMatcher,
+    AssignmentMatcher,
     get_matcher,
 )
+from .streaming import (
+    StreamingClusterMatcher,
+    StreamingDPMatcher,
+    StreamingOverlapMatcher,
+    get_streaming_matcher,
+)
 
 __version__ = "1.0.0"
 __all__ = [
@@ -39,9 +52,17 @@ __all__ = [
     "generate_output_filename",
     "extract_characters_from_csv",
     "ADEvent",
+    "EventTable",
     # Matchers
     "ClusterMatcher",
     "DPMatcher",
+    "AnchoredDPMatcher",
     "OverlapMatcher",
+    "AssignmentMatcher",
     "get_matcher",
+    # Streaming
+    "StreamingClusterMatcher",
+    "StreamingDPMatcher",
+    "StreamingOverlapMatcher",
+    "get_streaming_matcher",
 ]
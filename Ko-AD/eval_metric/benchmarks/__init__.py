@@ -0,0 +1,12 @@
+"""
+Benchmarks for eval_metric matchers.
+
+Modules:
+    - overlap_index: OverlapMatcher interval index vs. brute-force scan
+    - synthetic: Seeded synthetic AD event streams
+    - matcher_suite: Time/memory suite for every registered matcher with baseline comparison
+
+Usage:
+    python -m eval_metric.benchmarks.overlap_index
+    python -m eval_metric.benchmarks.matcher_suite --baseline baseline.json
+"""
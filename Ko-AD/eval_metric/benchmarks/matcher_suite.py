@@ -0,0 +1,268 @@
+"""
+Benchmark suite for every registered matcher.
+
+Runs each matcher in eval_metric.matchers.MATCHERS (plus a banded DP case)
+over synthetic AD streams from 100 to 100k reference events, recording wall
+time, peak traced memory and pair counts. Results are written as JSON and can
+be compared with a stored baseline: slower or larger runs beyond the
+tolerances, or changed pair counts, are reported as regressions and make the
+command exit with status 1.
+
+Usage:
+    python -m eval_metric.benchmarks.matcher_suite --output results.json
+    python -m eval_metric.benchmarks.matcher_suite --baseline baseline.json
+    python -m eval_metric.benchmarks.matcher_suite --sizes 100 1000 --cases cluster dp --output baseline.json
+    python -m eval_metric.benchmarks.matcher_suite --events-per-min 30 --jitter-sec 3 --text-overlap 0.3
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+
+import numpy as np
+
+from ..matchers import MATCHERS, get_matcher
+from .synthetic import SyntheticConfig, generate_streams
+
+
+# Constructor arguments per registered matcher (single process so memory is traced)
+CASE_KWARGS: Dict[str, Dict[str, Any]] = {
+    'dp_anchored': {'n_jobs': 1},
+}
+
+# Extra configurations benchmarked alongside the registered matchers: name -> (method, kwargs)
+EXTRA_CASES: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    'dp_banded': ('dp', {'band_sec': 30.0}),
+}
+
+# Largest reference size per case; quadratic full-table DP is skipped beyond this
+MAX_EVENTS: Dict[str, int] = {
+    'dp': 5000,
+    'dp_anchored': 10000,
+}
+
+
+def build_cases() -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """Return every benchmark case as name -> (matcher method, kwargs)."""
+    cases = {name: (name, CASE_KWARGS.get(name, {})) for name in MATCHERS}
+    cases.update(EXTRA_CASES)
+    return cases
+
+
+def run_case(method: str, kwargs: Dict[str, Any], gen_events, ref_events, repeat: int, trace_memory: bool) -> Dict[str, Any]:
+    """
+    Time one matcher configuration on one pair of streams.
+    
+    Args:
+        method: Matcher method name
+        kwargs: Matcher constructor arguments
+        gen_events: Generated AD events
+        ref_events: Reference AD events
+        repeat: Timed runs (the fastest is reported)
+        trace_memory: Also run once under tracemalloc for peak memory
+        
+    Returns:
+        Result fields for this case
+    """
+    matcher = get_matcher(method, **kwargs)
+    
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        pairs = matcher.match(gen_events, ref_events)
+        best = min(best, time.perf_counter() - t0)
+    
+    peak_mb: Optional[float] = None
+    if trace_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        matcher.match(gen_events, ref_events)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    
+    return {
+        'seconds': best,
+        'peak_mb': peak_mb,
+        'pairs': len(pairs),
+        'matched_pairs': sum(1 for p in pairs if p.matched),
+    }
+
+
+def run_suite(
+    sizes: List[int],
+    cases: Optional[List[str]] = None,
+    repeat: int = 1,
+    trace_memory: bool = True,
+    synthetic: Optional[SyntheticConfig] = None
+) -> Dict[str, Any]:
+    """
+    Run the benchmark suite.
+    
+    Args:
+        sizes: Reference event counts
+        cases: Case names to run (default: all)
+        repeat: Timed runs per case
+        trace_memory: Record peak traced memory
+        synthetic: Stream settings (density, jitter, text overlap, seed, ...);
+            n_ref is replaced by each size (default: SyntheticConfig())
+        
+    Returns:
+        Dictionary with 'meta' and 'results' (one row per case and size);
+        meta['synthetic'] holds the exact settings of each size's streams
+    """
+    synthetic = synthetic or SyntheticConfig()
+    all_cases = build_cases()
+    selected = cases or list(all_cases)
+    unknown = [c for c in selected if c not in all_cases]
+    if unknown:
+        raise ValueError(f"Unknown benchmark case(s): {unknown}. Available: {list(all_cases)}")
+    
+    rows = []
+    configs = []
+    for n in sizes:
+        config = replace(synthetic, n_ref=n)
+        configs.append(asdict(config))
+        gen_events, ref_events = generate_streams(config)
+        
+        for name in selected:
+            max_events = MAX_EVENTS.get(name)
+            if max_events is not None and n > max_events:
+                continue
+            method, kwargs = all_cases[name]
+            result = run_case(method, kwargs, gen_events, ref_events, repeat, trace_memory)
+            rows.append({'case': name, 'size': n, 'n_gen': len(gen_events), 'n_ref': len(ref_events), **result})
+            
+            peak = f"{result['peak_mb']:.1f} MB" if result['peak_mb'] is not None else '-'
+            print(f"  {name:<12} n={n:<7} {result['seconds']:>9.4f}s  {peak:>10}  pairs={result['pairs']}", flush=True)
+    
+    return {
+        'meta': {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'synthetic': configs,
+        },
+        'results': rows,
+    }
+
+
+def compare_with_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    time_tolerance: float = 0.25,
+    memory_tolerance: float = 0.25
+) -> List[str]:
+    """
+    Compare results with a baseline run.
+    
+    Args:
+        results: Output of run_suite
+        baseline: Previously saved output of run_suite
+        time_tolerance: Allowed relative slowdown (0.25 = 25%)
+        memory_tolerance: Allowed relative growth of peak memory
+        
+    Returns:
+        List of regression descriptions (empty if none)
+    """
+    base_rows = {(r['case'], r['size']): r for r in baseline.get('results', [])}
+    regressions = []
+    
+    # Timings are only comparable on identical streams
+    base_configs = {c['n_ref']: c for c in baseline.get('meta', {}).get('synthetic', []) if isinstance(c, dict)}
+    for config in results['meta']['synthetic']:
+        base_config = base_configs.get(config['n_ref'])
+        if base_config is not None and base_config != config:
+            changed = sorted(k for k in config if base_config.get(k) != config[k])
+            regressions.append(f"n={config['n_ref']}: synthetic settings differ from baseline ({', '.join(changed)})")
+    
+    for row in results['results']:
+        base = base_rows.get((row['case'], row['size']))
+        if base is None:
+            continue
+        label = f"{row['case']} n={row['size']}"
+        
+        if row['pairs'] != base['pairs'] or row['matched_pairs'] != base['matched_pairs']:
+            regressions.append(
+                f"{label}: pairs changed {base['pairs']}/{base['matched_pairs']} -> "
+                f"{row['pairs']}/{row['matched_pairs']} (total/matched)"
+            )
+        if row['seconds'] > base['seconds'] * (1 + time_tolerance):
+            regressions.append(f"{label}: time {base['seconds']:.4f}s -> {row['seconds']:.4f}s")
+        if (row['peak_mb'] is not None and base.get('peak_mb') is not None
+                and row['peak_mb'] > base['peak_mb'] * (1 + memory_tolerance)):
+            regressions.append(f"{label}: peak memory {base['peak_mb']:.1f} MB -> {row['peak_mb']:.1f} MB")
+    
+    return regressions
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Matcher benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='Reference event counts (default: 100 1000 10000 100000)')
+    parser.add_argument('--cases', type=str, nargs='+',
+                        help=f"Cases to run (default: all of {list(build_cases())})")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Timed runs per case; the fastest is reported (default: 1)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the tracemalloc run')
+    defaults = SyntheticConfig()
+    parser.add_argument('--seed', type=int, default=defaults.seed,
+                        help=f'Random seed (default: {defaults.seed})')
+    parser.add_argument('--events-per-min', type=float, default=defaults.events_per_min,
+                        help=f'Reference events per minute (default: {defaults.events_per_min})')
+    parser.add_argument('--jitter-sec', type=float, default=defaults.jitter_sec,
+                        help=f'Std. dev. of generated timing offsets (default: {defaults.jitter_sec})')
+    parser.add_argument('--text-overlap', type=float, default=defaults.text_overlap,
+                        help=f'Fraction of generated words copied from the reference (default: {defaults.text_overlap})')
+    parser.add_argument('--described-rate', type=float, default=defaults.described_rate,
+                        help=f'Probability a reference event is described (default: {defaults.described_rate})')
+    parser.add_argument('--spurious-rate', type=float, default=defaults.spurious_rate,
+                        help=f'Extra generated events per reference event (default: {defaults.spurious_rate})')
+    parser.add_argument('--output', '-o', type=str,
+                        help='Write results JSON to this path')
+    parser.add_argument('--baseline', '-b', type=str,
+                        help='Baseline results JSON to compare against')
+    parser.add_argument('--time-tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown vs. baseline (default: 0.25)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                        help='Allowed relative peak memory growth vs. baseline (default: 0.25)')
+    args = parser.parse_args()
+    
+    synthetic = SyntheticConfig(
+        events_per_min=args.events_per_min,
+        jitter_sec=args.jitter_sec,
+        text_overlap=args.text_overlap,
+        described_rate=args.described_rate,
+        spurious_rate=args.spurious_rate,
+        seed=args.seed,
+    )
+    results = run_suite(args.sizes, args.cases, args.repeat, not args.no_memory, synthetic)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to: {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.time_tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs. {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions vs. {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
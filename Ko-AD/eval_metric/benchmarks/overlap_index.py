@@ -0,0 +1,103 @@
+"""
+Benchmark for the OverlapMatcher interval index.
+
+Times OverlapMatcher (sorted-array interval index) against a brute-force
+scan of every reference event for every generated event, on synthetic
+AD streams (see synthetic.py) from 100 to 100k reference events.
+
+Usage:
+    python -m eval_metric.benchmarks.overlap_index
+    python -m eval_metric.benchmarks.overlap_index --sizes 100 1000 10000 --naive-max 10000
+"""
+
+import argparse
+import time
+from dataclasses import replace
+from typing import List, Optional
+
+from ..utils import ADEvent
+from ..matchers import OverlapMatcher
+from .synthetic import SyntheticConfig, generate_streams
+
+
+# Dense, short events: one start every 3 s on average, 0.5-4.5 s long
+STREAM_CONFIG = SyntheticConfig(events_per_min=20.0, min_duration=0.5, max_duration=4.5)
+
+
+def naive_overlap_count(gen_events: List[ADEvent], ref_events: List[ADEvent], min_overlap_sec: float) -> int:
+    """Count qualifying (gen, ref) overlaps by scanning every pair."""
+    count = 0
+    for gen_event in gen_events:
+        for ref_event in ref_events:
+            if gen_event.overlap_duration(ref_event) >= min_overlap_sec:
+                count += 1
+    return count
+
+
+def run(sizes: List[int], naive_max: int, min_overlap_sec: float = 0.5, seed: int = 0) -> List[dict]:
+    """
+    Run the benchmark for each size.
+    
+    Args:
+        sizes: Number of reference events per run
+        naive_max: Largest size for which the brute-force scan is timed
+        min_overlap_sec: OverlapMatcher threshold
+        seed: Random seed
+        
+    Returns:
+        List of result rows
+    """
+    matcher = OverlapMatcher(min_overlap_sec=min_overlap_sec)
+    rows = []
+    
+    for n in sizes:
+        gen_events, ref_events = generate_streams(replace(STREAM_CONFIG, n_ref=n, seed=seed))
+        
+        t0 = time.perf_counter()
+        pairs = matcher.match(gen_events, ref_events)
+        indexed_sec = time.perf_counter() - t0
+        indexed_links = sum(p.num_ref_items for p in pairs)
+        
+        naive_sec: Optional[float] = None
+        if n <= naive_max:
+            t0 = time.perf_counter()
+            naive_links = naive_overlap_count(gen_events, ref_events, min_overlap_sec)
+            naive_sec = time.perf_counter() - t0
+            if naive_links != indexed_links:
+                raise RuntimeError(f"Mismatch at n={n}: indexed={indexed_links}, naive={naive_links}")
+        
+        rows.append({
+            'events': n,
+            'gen_events': len(gen_events),
+            'links': indexed_links,
+            'indexed_sec': indexed_sec,
+            'naive_sec': naive_sec,
+        })
+    
+    return rows
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="OverlapMatcher interval index benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='Reference event counts to benchmark (default: 100 1000 10000 100000)')
+    parser.add_argument('--naive-max', type=int, default=3000,
+                        help='Largest size to also time the brute-force scan (default: 3000)')
+    parser.add_argument('--min-overlap', type=float, default=0.5,
+                        help='Minimum overlap in seconds (default: 0.5)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed (default: 0)')
+    args = parser.parse_args()
+    
+    rows = run(args.sizes, args.naive_max, args.min_overlap, args.seed)
+    
+    print(f"{'events':>8} {'links':>8} {'indexed (s)':>12} {'naive (s)':>12} {'speedup':>8}")
+    for row in rows:
+        naive = f"{row['naive_sec']:.4f}" if row['naive_sec'] is not None else '-'
+        speedup = f"{row['naive_sec'] / row['indexed_sec']:.1f}x" if row['naive_sec'] is not None else '-'
+        print(f"{row['events']:>8} {row['links']:>8} {row['indexed_sec']:>12.4f} {naive:>12} {speedup:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Synthetic AD event streams for benchmarks.
+
+Builds a reference stream and a generated stream derived from it: each
+reference event is described by the generator with some probability, with
+jittered timing and partially overlapping text, and the generator also adds
+spurious events of its own. All randomness comes from one seed.
+
+Usage:
+    from eval_metric.benchmarks.synthetic import SyntheticConfig, generate_streams
+    gen_events, ref_events = generate_streams(SyntheticConfig(n_ref=10000, seed=1))
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from ..utils import ADEvent
+
+
+# Vocabulary for synthetic descriptions; sampled with Zipf-like weights
+_VOCAB = (
+    "a the man woman boy girl he she they his her door car room street window table "
+    "walks runs looks turns smiles opens closes sits stands holds takes gives watches "
+    "enters leaves picks up down into out of at on in from toward away slowly quickly "
+    "night day morning rain light dark phone letter bag glass cup hand face eyes head "
+    "old young tall small red black white blue green office kitchen hallway stairs"
+).split()
+_WEIGHTS = [1.0 / (rank + 1) for rank in range(len(_VOCAB))]
+
+
+@dataclass
+class SyntheticConfig:
+    """Parameters for a synthetic pair of AD streams."""
+    n_ref: int = 1000  # Number of reference events
+    events_per_min: float = 12.0  # Reference density
+    min_duration: float = 1.0  # Event duration range (seconds)
+    max_duration: float = 6.0
+    jitter_sec: float = 1.5  # Std. dev. of generated start/end offsets
+    text_overlap: float = 0.5  # Fraction of a generated text copied from its reference
+    described_rate: float = 0.85  # Probability a reference event is described
+    spurious_rate: float = 0.1  # Extra generated events per reference event
+    min_words: int = 4  # Words per description
+    max_words: int = 14
+    seed: int = 0
+
+
+def _random_text(rng: random.Random, n_words: int) -> str:
+    """Draw a description of n_words words."""
+    return ' '.join(rng.choices(_VOCAB, weights=_WEIGHTS, k=n_words))
+
+
+def _derived_text(rng: random.Random, text: str, overlap: float) -> str:
+    """Keep each word of text with probability overlap and replace the rest."""
+    words = [w if rng.random() < overlap else rng.choices(_VOCAB, weights=_WEIGHTS)[0]
+             for w in text.split()]
+    return ' '.join(words)
+
+
+def _finalize(events: List[Tuple[float, float, str]]) -> List[ADEvent]:
+    """Sort (start, end, text) tuples by start and number them."""
+    events.sort(key=lambda e: e[0])
+    return [ADEvent(start=s, end=e, text=t, index=idx) for idx, (s, e, t) in enumerate(events)]
+
+
+def generate_streams(config: SyntheticConfig) -> Tuple[List[ADEvent], List[ADEvent]]:
+    """
+    Generate a (generated, reference) pair of AD streams.
+    
+    Args:
+        config: Stream parameters
+        
+    Returns:
+        (gen_events, ref_events), each sorted by start time
+    """
+    rng = random.Random(config.seed)
+    mean_gap = 60.0 / config.events_per_min
+    
+    ref, gen = [], []
+    t = 0.0
+    for _ in range(config.n_ref):
+        t += rng.expovariate(1.0 / mean_gap)
+        duration = rng.uniform(config.min_duration, config.max_duration)
+        text = _random_text(rng, rng.randint(config.min_words, config.max_words))
+        ref.append((t, t + duration, text))
+        
+        if rng.random() < config.described_rate:
+            g_start = max(0.0, t + rng.gauss(0.0, config.jitter_sec))
+            g_end = max(g_start + config.min_duration / 2, t + duration + rng.gauss(0.0, config.jitter_sec))
+            gen.append((g_start, g_end, _derived_text(rng, text, config.text_overlap)))
+    
+    total = t + config.max_duration
+    for _ in range(int(round(config.n_ref * config.spurious_rate))):
+        start = rng.uniform(0.0, total)
+        duration = rng.uniform(config.min_duration, config.max_duration)
+        gen.append((start, start + duration, _random_text(rng, rng.randint(config.min_words, config.max_words))))
+    
+    return _finalize(gen), _finalize(ref)
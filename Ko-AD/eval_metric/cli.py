@@ -20,11 +20,11 @@ from .utils import (
     get_time_range,
     generate_output_filename,
     calculate_coverage_stats,
-    extract_characters_from_csv,
     MatchedPair,
 )
 from .matchers import get_matcher
 from .evaluators import get_evaluator
+from .evaluators.critic_cache import cached_characters_from_csv
 
 
 def parse_args():
@@ -54,6 +54,9 @@ Examples:
     
     # Include CRITIC evaluation (requires character list)
     python -m eval_metric -g ad.json -r ad.csv --all-metrics --include-critic --characters chars.json
+    
+    # Sweep matcher settings (precision/recall/F1 per setting)
+    python -m eval_metric -g ad.json -r ad.csv --sweep grid.yaml --jobs 8
         """
     )
     
@@ -84,7 +87,7 @@ Examples:
     
     # Matcher options
     parser.add_argument('--matcher', type=str, default='cluster',
-                        choices=['cluster', 'dp', 'overlap'],
+                        choices=['cluster', 'dp', 'dp_anchored', 'overlap', 'assignment'],
                         help='Matching method (default: cluster)')
     parser.add_argument('--min-overlap', type=float, default=0.5,
                         help='Minimum overlap in seconds for matching (default: 0.5)')
@@ -94,6 +97,8 @@ Examples:
                         help='Weight for time similarity in DP (default: 0.3)')
     parser.add_argument('--w-text', type=float, default=0.7,
                         help='Weight for text similarity in DP (default: 0.7)')
+    parser.add_argument('--text-sim', type=str, choices=['token', 'embedding'],
+                        help='Text similarity for DP/assignment matching (default: token)')
     
     # LLM options
     parser.add_argument('--api-key', type=str,
@@ -104,6 +109,10 @@ Examples:
     # BERTScore options
     parser.add_argument('--bert-model', type=str, default='roberta-large',
                         help='BERT model for BERTScore (default: roberta-large)')
+    parser.add_argument('--bert-cache-dir', type=str,
+                        help='Directory for the BERTScore token embedding cache')
+    parser.add_argument('--threads', type=int,
+                        help='torch CPU threads for neural models')
     parser.add_argument('--device', type=str,
                         help='Device for neural models (cuda/cpu)')
     
@@ -117,6 +126,12 @@ Examples:
     parser.add_argument('--save-config', type=str,
                         help='Save current configuration to YAML file')
     
+    # Sweep options
+    parser.add_argument('--sweep', type=str,
+                        help='YAML grid of matcher settings to sweep (skips metric evaluation)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for --sweep (default: 1)')
+    
     return parser.parse_args()
 
 
@@ -166,16 +181,39 @@ def run_evaluation(
     
     # Create matcher
     print(f"\nMatching using {config.matcher.method} method...")
-    matcher_kwargs = {'min_overlap_sec': config.matcher.min_overlap_sec}
-    if config.matcher.method == 'dp':
-        matcher_kwargs.update({
+    if config.matcher.method == 'assignment':
+        matcher_kwargs = {
             'w_time': config.matcher.w_time,
             'w_text': config.matcher.w_text,
             'gap_penalty_gen': config.matcher.gap_penalty_gen,
             'gap_penalty_ref': config.matcher.gap_penalty_ref,
             'time_scale': config.matcher.time_scale,
             'time_soft': config.matcher.time_soft,
-        })
+            'window_sec': config.matcher.window_sec,
+            'n_jobs': config.matcher.n_jobs,
+            'text_sim': config.matcher.text_sim,
+            'embedding_model': config.matcher.embedding_model,
+            'embedding_cache_dir': config.matcher.embedding_cache_dir,
+        }
+    elif config.matcher.method in ('dp', 'dp_anchored'):
+        matcher_kwargs = {
+            'w_time': config.matcher.w_time,
+            'w_text': config.matcher.w_text,
+            'gap_penalty_gen': config.matcher.gap_penalty_gen,
+            'gap_penalty_ref': config.matcher.gap_penalty_ref,
+            'time_scale': config.matcher.time_scale,
+            'time_soft': config.matcher.time_soft,
+            'band_sec': config.matcher.band_sec,
+            'band_radius': config.matcher.band_radius,
+            'dp_fill': config.matcher.dp_fill,
+            'text_sim': config.matcher.text_sim,
+            'embedding_model': config.matcher.embedding_model,
+            'embedding_cache_dir': config.matcher.embedding_cache_dir,
+        }
+        if config.matcher.method == 'dp_anchored':
+            matcher_kwargs['n_jobs'] = config.matcher.n_jobs
+    else:
+        matcher_kwargs = {'min_overlap_sec': config.matcher.min_overlap_sec}
     
     matcher = get_matcher(config.matcher.method, **matcher_kwargs)
     matched_pairs = matcher.match(gen_events, ref_events)
@@ -272,12 +310,30 @@ def run_evaluation(
                 evaluator_kwargs = {
                     'model': config.bertscore.model,
                     'device': config.bertscore.device,
+                    'batch_size': config.bertscore.batch_size,
                     'rescale_with_baseline': config.bertscore.rescale_with_baseline,
+                    'lang': config.bertscore.lang,
+                    'cache_dir': config.bertscore.cache_dir,
+                    'cache_max_gb': config.bertscore.cache_max_gb,
+                    'token_budget': config.bertscore.token_budget,
+                    'num_threads': config.bertscore.num_threads,
+                    'backend': config.bertscore.backend,
+                    'max_deviation': config.bertscore.max_deviation,
+                    'calibration_size': config.bertscore.calibration_size,
+                }
+            elif metric_name == 'meteor':
+                evaluator_kwargs = {
+                    'alpha': config.meteor.alpha,
+                    'beta': config.meteor.beta,
+                    'gamma': config.meteor.gamma,
+                    'n_jobs': config.meteor.n_jobs,
                 }
             elif metric_name == 'cider':
                 evaluator_kwargs = {
                     'n_gram': config.cider.n_gram,
                     'sigma': config.cider.sigma,
+                    'df_mode': config.cider.df_mode,
+                    'df_index': config.cider.df_index,
                 }
             elif metric_name == 'critic':
                 # Auto-extract characters from reference if not provided
@@ -285,8 +341,9 @@ def run_evaluation(
                 if not characters and not config.critic.characters_file:
                     print("  Auto-extracting characters from reference AD...")
                     try:
-                        characters = extract_characters_from_csv(
-                            config.reference_file, 
+                        characters = cached_characters_from_csv(
+                            config.reference_file,
+                            cache_dir=config.critic.cache_dir,
                             min_count=2,
                             use_spacy=True
                         )
@@ -299,6 +356,13 @@ def run_evaluation(
                     'characters': characters,
                     'characters_file': config.critic.characters_file,
                     'device': config.critic.device,
+                    'max_batch': config.critic.max_batch,
+                    'max_wait_ms': config.critic.max_wait_ms,
+                    'coref_mode': config.critic.coref_mode,
+                    'window_chars': config.critic.window_chars,
+                    'window_overlap': config.critic.window_overlap,
+                    'n_jobs': config.critic.n_jobs,
+                    'cache_dir': config.critic.cache_dir,
                 }
             
             evaluator = evaluator_class(**evaluator_kwargs)
@@ -388,6 +452,50 @@ def run_evaluation(
     return {'results': results, 'combined_df': combined_df, 'summary': summary_stats}
 
 
+def run_matcher_sweep(config: EvalConfig, grid_path: str, n_jobs: int = 1) -> pd.DataFrame:
+    """
+    Evaluate a grid of matcher settings on the configured input files.
+    
+    Args:
+        config: EvalConfig object (matcher section supplies defaults)
+        grid_path: Path to YAML grid file
+        n_jobs: Worker processes
+        
+    Returns:
+        DataFrame with one row per setting
+    """
+    from dataclasses import asdict
+    from .sweep import expand_grid, load_grid, run_sweep
+    
+    if not config.generated_file:
+        raise ValueError("Generated AD file is required (--generated or in config)")
+    if not config.reference_file:
+        raise ValueError("Reference AD file is required (--reference or in config)")
+    
+    gen_events = load_generated_ad(config.generated_file)
+    ref_events = load_reference_ad(config.reference_file, time_range=get_time_range(gen_events))
+    print(f"Loaded {len(gen_events)} generated and {len(ref_events)} reference AD events")
+    
+    settings = expand_grid(load_grid(grid_path), base=asdict(config.matcher))
+    print(f"Sweeping {len(settings)} matcher settings with {n_jobs} worker(s)...")
+    sweep_df = run_sweep(gen_events, ref_events, settings, n_jobs=n_jobs)
+    
+    output_path = generate_output_filename(
+        config.generated_file,
+        config.reference_file,
+        config.output.output_dir,
+        prefix="sweep",
+    )
+    sweep_df.to_csv(output_path, index=False)
+    
+    top = sweep_df.sort_values('f1_score', ascending=False).head(10)
+    print(f"\n=== TOP SETTINGS BY F1 ===")
+    print(top.to_string(index=False))
+    print(f"\nSweep results saved to: {output_path}")
+    
+    return sweep_df
+
+
 def main():
     """Main entry point."""
     args = parse_args()
@@ -408,6 +516,17 @@ def main():
         print(f"Configuration saved to: {args.save_config}")
         return
     
+    # Matcher sweep replaces metric evaluation
+    if args.sweep:
+        try:
+            run_matcher_sweep(config, args.sweep, args.jobs)
+        except Exception as e:
+            print(f"ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+        return 0
+    
     # Determine which metrics to run
     if args.all_metrics:
         metrics = ['bertscore', 'meteor', 'cider']
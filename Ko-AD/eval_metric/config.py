@@ -13,7 +13,7 @@ from typing import Dict, Any, Optional, List
 @dataclass
 class MatcherConfig:
     """Configuration for matcher algorithms."""
-    method: str = "cluster"  # cluster, dp, overlap
+    method: str = "cluster"  # cluster, dp, dp_anchored, overlap, assignment
     min_overlap_sec: float = 0.5
     
     # DP-specific parameters
@@ -23,6 +23,14 @@ class MatcherConfig:
     gap_penalty_ref: float = -0.2
     time_scale: float = 10.0
     time_soft: bool = True
+    band_sec: Optional[float] = None  # Banded DP: max start-time difference for a match
+    band_radius: Optional[int] = None  # Banded DP: Sakoe-Chiba radius in events
+    dp_fill: str = "wavefront"  # wavefront, loop
+    n_jobs: Optional[int] = None  # Anchored DP / assignment: worker processes (None = all cores)
+    window_sec: float = 10.0  # Assignment: max start-time difference for a candidate pair
+    text_sim: str = "token"  # DP text similarity: token (Jaccard) or embedding
+    embedding_model: Optional[str] = None  # Sentence embedding model (None = multilingual MiniLM)
+    embedding_cache_dir: Optional[str] = None  # On-disk embedding cache (None = memory only)
 
 
 @dataclass
@@ -39,8 +47,16 @@ class BERTScoreConfig:
     """Configuration for BERTScore evaluation."""
     model: str = "roberta-large"
     device: Optional[str] = None  # auto-detect if None
-    batch_size: int = 64
+    batch_size: int = 64  # maximum texts (or pairs) per batch
+    token_budget: int = 8192  # maximum padded tokens per batch
+    num_threads: Optional[int] = None  # torch CPU threads (None = torch default)
+    backend: str = "fp32"  # fp32 or int8 (dynamic quantization, CPU only)
+    max_deviation: float = 0.01  # int8: max allowed score deviation from fp32
+    calibration_size: int = 64  # int8: distinct pairs compared with fp32 before int8 is accepted
     rescale_with_baseline: bool = False
+    lang: Optional[str] = None  # baseline language ('en' if None and rescaling)
+    cache_dir: Optional[str] = None  # per-token embedding cache (None = disabled)
+    cache_max_gb: Optional[float] = 20.0  # LRU size cap of the cache (None = unlimited)
 
 
 @dataclass
@@ -49,6 +65,7 @@ class METEORConfig:
     alpha: float = 0.9
     beta: float = 3.0
     gamma: float = 0.5
+    n_jobs: Optional[int] = 1  # worker processes for batch scoring (None = all cores)
 
 
 @dataclass
@@ -56,6 +73,8 @@ class CIDErConfig:
     """Configuration for CIDEr evaluation."""
     n_gram: int = 4
     sigma: float = 6.0
+    df_mode: str = "film"  # film (matched references) or corpus (df_index)
+    df_index: Optional[str] = None  # Corpus DF index directory (see evaluators/cider_index.py)
 
 
 @dataclass
@@ -64,6 +83,13 @@ class CRITICConfig:
     characters: List[str] = field(default_factory=list)
     characters_file: Optional[str] = None  # JSON file with character list
     device: str = "cpu"  # cuda:0 for GPU
+    max_batch: int = 32  # pair-level requests: max texts per coreference call
+    max_wait_ms: float = 10.0  # pair-level requests: max wait to fill a batch
+    coref_mode: str = "full"  # full (one prediction per side) or windowed
+    window_chars: int = 4000  # windowed: target characters per window
+    window_overlap: int = 2  # windowed: pairs shared by consecutive windows
+    n_jobs: Optional[int] = 1  # windowed: worker processes on CPU (None = all cores)
+    cache_dir: Optional[str] = None  # reference character list / coreference cache (None = disabled)
 
 
 @dataclass
@@ -224,6 +250,8 @@ def merge_config_with_args(config: EvalConfig, args) -> EvalConfig:
         config.matcher.w_time = args.w_time
     if hasattr(args, 'w_text') and args.w_text is not None:
         config.matcher.w_text = args.w_text
+    if hasattr(args, 'text_sim') and args.text_sim:
+        config.matcher.text_sim = args.text_sim
     
     # Evaluator options
     if hasattr(args, 'metric') and args.metric:
@@ -238,6 +266,10 @@ def merge_config_with_args(config: EvalConfig, args) -> EvalConfig:
     # BERTScore options
     if hasattr(args, 'bert_model') and args.bert_model:
         config.bertscore.model = args.bert_model
+    if hasattr(args, 'bert_cache_dir') and args.bert_cache_dir:
+        config.bertscore.cache_dir = args.bert_cache_dir
+    if hasattr(args, 'threads') and args.threads:
+        config.bertscore.num_threads = args.threads
     if hasattr(args, 'device') and args.device:
         config.bertscore.device = args.device
         config.critic.device = args.device
@@ -259,7 +291,7 @@ reference_file: null
 
 # Matcher configuration
 matcher:
-  method: cluster  # cluster, dp, overlap
+  method: cluster  # cluster, dp, dp_anchored, overlap, assignment
   min_overlap_sec: 0.5
   
   # DP-specific parameters
@@ -269,6 +301,14 @@ matcher:
   gap_penalty_ref: -0.2
   time_scale: 10.0
   time_soft: true
+  band_sec: null  # Banded DP: only pair events within this many seconds
+  band_radius: null  # Banded DP: Sakoe-Chiba radius in events
+  dp_fill: wavefront  # wavefront (vectorized) or loop
+  n_jobs: null  # Anchored DP / assignment: worker processes (null = all cores)
+  window_sec: 10.0  # Assignment: only pair events within this many seconds
+  text_sim: token  # DP text similarity: token (Jaccard) or embedding
+  embedding_model: null  # Sentence embedding model (null = multilingual MiniLM)
+  embedding_cache_dir: null  # On-disk embedding cache (null = memory only)
 
 # LLM Evaluation (Gemini)
 llm:
@@ -281,25 +321,43 @@ llm:
 bertscore:
   model: roberta-large
   device: null  # auto-detect
-  batch_size: 64
+  batch_size: 64  # maximum texts (or pairs) per batch
+  token_budget: 8192  # maximum padded tokens per batch
+  num_threads: null  # torch CPU threads (null = torch default)
+  backend: fp32  # fp32 or int8 (dynamic quantization, CPU only)
+  max_deviation: 0.01  # int8: max allowed score deviation from fp32
+  calibration_size: 64  # int8: distinct pairs compared with fp32 before int8 is accepted
   rescale_with_baseline: false
+  lang: null  # baseline language ('en' if null and rescaling)
+  cache_dir: null  # per-token embedding cache directory (null = disabled)
+  cache_max_gb: 20.0  # LRU size cap of the cache
 
 # METEOR
 meteor:
   alpha: 0.9
   beta: 3.0
   gamma: 0.5
+  n_jobs: 1  # worker processes for batch scoring (null = all cores)
 
 # CIDEr
 cider:
   n_gram: 4
   sigma: 6.0
+  df_mode: film  # film (matched references) or corpus (df_index)
+  df_index: null  # Corpus DF index directory
 
 # CRITIC (Character Identification)
 critic:
   characters: []  # List of character names
   characters_file: null  # Or path to JSON with character list
   device: cpu  # cuda:0 for GPU
+  max_batch: 32  # pair-level requests: max texts per coreference call
+  max_wait_ms: 10.0  # pair-level requests: max wait to fill a batch
+  coref_mode: full  # full (one prediction per side) or windowed
+  window_chars: 4000  # windowed: target characters per window
+  window_overlap: 2  # windowed: pairs shared by consecutive windows
+  n_jobs: 1  # windowed: worker processes on CPU (null = all cores)
+  cache_dir: null  # reference character list / coreference cache (null = disabled)
 
 # Output configuration
 output:
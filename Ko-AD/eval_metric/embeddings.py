@@ -0,0 +1,267 @@
+"""
+Sentence embeddings for semantic text similarity.
+
+Provides a disk-backed embedding cache and a batched cosine similarity that
+can be passed to DPMatcher as batch_text_sim_func (or selected with
+text_sim='embedding'). Every distinct text is encoded once, in batches, and
+each similarity block is a single matrix multiply of normalized embeddings.
+
+Usage:
+    from eval_metric.embeddings import EmbeddingSimilarity
+    sim = EmbeddingSimilarity(cache_dir="~/.cache/ko_ad/embeddings")
+    matcher = DPMatcher(batch_text_sim_func=sim)
+"""
+
+import os
+import hashlib
+import tempfile
+import numpy as np
+from typing import List, Optional, Dict, Tuple
+
+# Optional imports
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+
+# Multilingual (Korean-capable) model small enough for CPU inference
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+
+# ============================================================
+# Disk Cache
+# ============================================================
+
+class EmbeddingCache:
+    """
+    On-disk store of embedding vectors keyed by (model name, text).
+    
+    Each model gets its own directory named by a hash of the model name, and
+    entries are keyed by the SHA-1 of their text. Entries are written in
+    shards: one .npz file per put_many() call holding the keys and the
+    stacked vectors, one row per key. A shard is written to a
+    temporary file and renamed into place, so concurrent writers never see
+    partial files, and reading a cache costs one file open per shard rather
+    than per text.
+    
+    Once more than max_shards shards have been read or written, they are
+    merged into a single shard and the merged files removed, so the number
+    of files (and opens at startup) stays bounded across runs. Only shards
+    whose entries are already in memory are removed; shards added by other
+    processes in the meantime are left for a later compaction.
+    """
+    
+    def __init__(self, cache_dir: str, model_name: str, max_shards: int = 16):
+        """
+        Initialize EmbeddingCache.
+        
+        Args:
+            cache_dir: Root directory of the cache (created on first write)
+            model_name: Model the stored vectors were computed with
+            max_shards: Shard count above which shards are merged into one
+        """
+        model_key = hashlib.sha1(model_name.encode('utf-8')).hexdigest()[:16]
+        self.cache_dir = os.path.join(os.path.expanduser(cache_dir), model_key)
+        self.model_name = model_name
+        self.max_shards = max_shards
+        self._entries: Optional[Dict[str, np.ndarray]] = None
+        self._shards: List[str] = []  # shard files whose entries are in _entries
+    
+    @staticmethod
+    def key(text: str) -> str:
+        """Cache key for a text."""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def _load(self) -> Dict[str, np.ndarray]:
+        """Read every shard once; unreadable shards are skipped."""
+        if self._entries is None:
+            self._entries = {}
+            if os.path.isdir(self.cache_dir):
+                for name in sorted(os.listdir(self.cache_dir)):
+                    if not name.endswith('.npz'):
+                        continue
+                    path = os.path.join(self.cache_dir, name)
+                    try:
+                        with np.load(path) as shard:
+                            keys, data = shard['keys'], shard['data']
+                    except (OSError, ValueError, KeyError):
+                        continue
+                    if data.ndim != 2 or len(data) != len(keys):
+                        continue
+                    self._entries.update(zip(keys.tolist(), data))
+                    self._shards.append(path)
+            if len(self._shards) > self.max_shards:
+                self._compact()
+        return self._entries
+    
+    def _write_shard(self, entries: List[Tuple[str, np.ndarray]]) -> str:
+        """Write (key, vector) entries as one shard and return its path."""
+        keys = [key for key, _ in entries]
+        data = np.stack([vector for _, vector in entries])
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, keys=np.array(keys), data=data)
+            path = os.path.join(self.cache_dir, f"{os.path.basename(tmp_path)[:-4]}.npz")
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+    
+    def _compact(self) -> None:
+        """Merge the shards held in memory into one shard and remove them."""
+        merged = self._write_shard(list(self._entries.items()))
+        for path in self._shards:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # already merged by another process
+        self._shards = [merged]
+    
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached embeddings.
+        
+        Args:
+            texts: Texts to look up
+            
+        Returns:
+            Mapping of text to vector for the texts found in the cache
+        """
+        entries = self._load()
+        found = {}
+        for text in texts:
+            array = entries.get(self.key(text))
+            if array is not None:
+                found[text] = array
+        return found
+    
+    def put_many(self, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Store embeddings as one new shard.
+        
+        Args:
+            arrays: Mapping of text to a 1-D vector; all vectors must share
+                their length and dtype
+        """
+        if not arrays:
+            return
+        entries = self._load()
+        
+        new_entries = [(self.key(t), np.asarray(v)) for t, v in arrays.items()]
+        self._shards.append(self._write_shard(new_entries))
+        entries.update(new_entries)
+        
+        if len(self._shards) > self.max_shards:
+            self._compact()
+
+
+# ============================================================
+# Embedding Similarity
+# ============================================================
+
+class EmbeddingSimilarity:
+    """
+    Cosine similarity of sentence embeddings for every (gen, ref) text pair.
+    
+    Called as func(gen_texts, ref_texts) -> matrix, the signature DPMatcher
+    expects for batch_text_sim_func. Embeddings are L2-normalized and kept in
+    memory for the lifetime of the object (and on disk if cache_dir is set);
+    negative cosines are clipped to 0 so scores share the [0, 1] range of the
+    token-overlap Jaccard similarity.
+    
+    The model is loaded lazily and dropped when the object is pickled, so
+    worker processes reuse the embeddings already computed.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        device: str = "cpu",
+        batch_size: int = 64,
+        cache_dir: Optional[str] = None,
+    ):
+        """
+        Initialize EmbeddingSimilarity.
+        
+        Args:
+            model_name: sentence-transformers model name or path
+            device: Device for encoding (cpu/cuda)
+            batch_size: Texts per encoding batch
+            cache_dir: Directory for the on-disk embedding cache (None = memory only)
+        """
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = batch_size
+        self.cache = EmbeddingCache(cache_dir, model_name) if cache_dir else None
+        self._model = None
+        self._embeddings: Dict[str, np.ndarray] = {}
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_model'] = None
+        return state
+    
+    def _load_model(self):
+        if self._model is None:
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                raise ImportError(
+                    "sentence-transformers is required for embedding similarity. "
+                    "Install with: pip install sentence-transformers"
+                )
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+    
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into L2-normalized float32 vectors."""
+        vectors = self._load_model().encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, encoding only those not already cached.
+        
+        Args:
+            texts: Texts to embed (duplicates are encoded once)
+            
+        Returns:
+            Array of shape (len(texts), dim) with unit-norm rows
+        """
+        missing = [t for t in dict.fromkeys(texts) if t not in self._embeddings]
+        
+        if self.cache is not None and missing:
+            self._embeddings.update(self.cache.get_many(missing))
+            missing = [t for t in missing if t not in self._embeddings]
+        
+        if missing:
+            vectors = self._encode_batch(missing)
+            encoded = dict(zip(missing, vectors))
+            self._embeddings.update(encoded)
+            if self.cache is not None:
+                self.cache.put_many(encoded)
+        
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([self._embeddings[t] for t in texts])
+    
+    def __call__(self, gen_texts: List[str], ref_texts: List[str]) -> np.ndarray:
+        """Similarity matrix of shape (len(gen_texts), len(ref_texts))."""
+        if not gen_texts or not ref_texts:
+            return np.zeros((len(gen_texts), len(ref_texts)), dtype=float)
+        
+        # Encode both sides together so new texts share batches
+        vectors = self.encode(list(gen_texts) + list(ref_texts))
+        G, R = vectors[:len(gen_texts)], vectors[len(gen_texts):]
+        return np.clip(G @ R.T, 0.0, 1.0).astype(float)
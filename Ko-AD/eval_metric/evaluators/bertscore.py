@@ -4,20 +4,138 @@ BERTScore evaluator for Audio Description quality assessment.
 Uses BERT embeddings to compute semantic similarity between texts.
 """
 
-from typing import Dict, Any, Optional, List
+import copy
+import time
+from typing import Dict, Any, Optional, List, Tuple
 import numpy as np
 
 from .base import BaseEvaluator, EvaluationResult
+from .bertscore_cache import TokenEmbeddingCache
 from ..utils import MatchedPair
 
 # Optional imports
 try:
-    from bert_score import score as bert_score_func
+    import torch
+    from torch.nn.utils.rnn import pad_sequence
+    from bert_score import BERTScorer
+    from bert_score.utils import bert_encode, greedy_cos_idf, padding, sent_encode
     BERTSCORE_AVAILABLE = True
 except ImportError:
     BERTSCORE_AVAILABLE = False
 
 
+# ============================================================
+# Resident Scorers
+# ============================================================
+
+# Loaded scorers shared by every evaluator in this process, keyed by settings
+_SCORERS: Dict[Tuple, 'BERTScorer'] = {}
+
+
+def get_bert_scorer(
+    model: str = "roberta-large",
+    device: Optional[str] = None,
+    lang: Optional[str] = None,
+    rescale_with_baseline: bool = False,
+    num_layers: Optional[int] = None,
+) -> 'BERTScorer':
+    """
+    Return the process-wide BERTScorer for these settings, loading it on first use.
+    
+    The model, tokenizer and rescaling baseline stay in memory, so later
+    evaluators (other films, single pairs) reuse them without reloading.
+    
+    Args:
+        model: BERT model to use
+        device: Device to use (cuda/cpu, auto if None)
+        lang: Language of the texts (needed to find the rescaling baseline)
+        rescale_with_baseline: Whether to rescale scores with baseline
+        num_layers: Layer to use (None = bert-score's tuned default for the model)
+        
+    Returns:
+        Shared BERTScorer instance
+    """
+    if not BERTSCORE_AVAILABLE:
+        raise ImportError("bert-score is required. Install with: pip install bert-score")
+    
+    key = (model, device, lang, rescale_with_baseline, num_layers)
+    if key not in _SCORERS:
+        print(f"Loading BERTScore model {model}...")
+        _SCORERS[key] = BERTScorer(
+            model_type=model,
+            num_layers=num_layers,
+            device=device,
+            lang=lang,
+            rescale_with_baseline=rescale_with_baseline,
+        )
+    return _SCORERS[key]
+
+
+# Dynamically quantized copies of resident models, keyed like _SCORERS
+_QUANTIZED: Dict[Tuple, Any] = {}
+
+
+def get_quantized_model(key: Tuple, scorer: 'BERTScorer'):
+    """
+    Return an int8 dynamically quantized copy of a scorer's model, built on first use.
+    
+    Linear layers get int8 weights and run with dynamically quantized
+    activations (torch.quantization.quantize_dynamic); the fp32 model is
+    left untouched. CPU only.
+    
+    Args:
+        key: Settings key of the scorer (see get_bert_scorer)
+        scorer: Scorer whose model is quantized
+        
+    Returns:
+        Quantized model
+    """
+    if key not in _QUANTIZED:
+        print(f"Quantizing BERTScore model {scorer.model_type} to int8...")
+        _QUANTIZED[key] = torch.quantization.quantize_dynamic(
+            copy.deepcopy(scorer._model).cpu().eval(), {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return _QUANTIZED[key]
+
+
+def clear_bert_scorers() -> None:
+    """Release every resident scorer (frees model memory)."""
+    _SCORERS.clear()
+    _QUANTIZED.clear()
+
+
+def token_batches(lengths: np.ndarray, token_budget: int, max_batch: int) -> List[np.ndarray]:
+    """
+    Group items into batches of similar length under a padded-token budget.
+    
+    Items are taken longest first; a batch grows while (items x longest item)
+    stays within token_budget and it holds at most max_batch items. Every
+    batch has at least one item, so over-long items run alone.
+    
+    Args:
+        lengths: Token count of each item
+        token_budget: Maximum padded tokens per batch
+        max_batch: Maximum items per batch
+        
+    Returns:
+        List of index arrays into lengths
+    """
+    order = np.argsort(-np.asarray(lengths), kind='stable')
+    batches = []
+    start = 0
+    while start < len(order):
+        longest = max(int(lengths[order[start]]), 1)
+        size = max(1, min(max_batch, token_budget // longest))
+        batches.append(order[start:start + size])
+        start += size
+    return batches
+
+
+# ============================================================
+# BERTScore Evaluator
+# ============================================================
+
+
 class BERTScoreEvaluator(BaseEvaluator):
     """
     BERTScore evaluator for semantic text similarity.
@@ -31,32 +149,281 @@ class BERTScoreEvaluator(BaseEvaluator):
         device: Optional[str] = None,
         batch_size: int = 64,
         rescale_with_baseline: bool = False,
+        lang: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_gb: Optional[float] = None,
+        token_budget: int = 8192,
+        num_threads: Optional[int] = None,
+        backend: str = "fp32",
+        max_deviation: float = 0.01,
+        calibration_size: int = 64,
         config: Any = None,
     ):
         """
         Initialize BERTScore evaluator.
         
+        The model is loaded on first use and kept resident for the whole
+        process (see get_bert_scorer).
+        
         Args:
             model: BERT model to use
             device: Device to use (cuda/cpu, auto if None)
-            batch_size: Batch size for encoding
+            batch_size: Maximum texts (or pairs) per batch
             rescale_with_baseline: Whether to rescale scores with baseline
+            lang: Language for the rescaling baseline (default 'en' when rescaling)
+            cache_dir: Directory for the per-token embedding cache (None = no cache)
+            cache_max_gb: Size cap of the embedding cache in GB (None = unlimited)
+            token_budget: Maximum padded tokens per batch
+            num_threads: torch intra-op threads for CPU inference, set once here
+                for the whole process (None = torch default)
+            backend: Encoder backend: 'fp32' or 'int8' (dynamically quantized, CPU only)
+            max_deviation: Largest allowed |int8 - fp32| score difference on the
+                calibration pairs; scoring stops with an error beyond it
+            calibration_size: Distinct pairs compared against fp32 before int8
+                is accepted; until then every scoring call adds pairs and the
+                calibration is reported as provisional
             config: Optional BERTScoreConfig object
         """
         super().__init__(config)
         
         if not BERTSCORE_AVAILABLE:
             raise ImportError("bert-score is required. Install with: pip install bert-score")
+        if backend not in ('fp32', 'int8'):
+            raise ValueError(f"Unknown backend: {backend}. Available: ['fp32', 'int8']")
+        if backend == 'int8':
+            if device is None:
+                device = 'cpu'
+            elif device != 'cpu':
+                raise ValueError(f"backend='int8' runs on CPU only, got device={device!r}")
         
         self.model = model
         self.device = device
         self.batch_size = batch_size
         self.rescale_with_baseline = rescale_with_baseline
+        self.lang = lang or ('en' if rescale_with_baseline else None)
+        self.cache_dir = cache_dir
+        self.cache_max_gb = cache_max_gb
+        self._cache: Optional[TokenEmbeddingCache] = None
+        self.token_budget = token_budget
+        self.num_threads = num_threads
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        self.backend = backend
+        self.max_deviation = max_deviation
+        self.calibration_size = calibration_size
+        self.calibration: Optional[Dict[str, Any]] = None
+        self._calibrated_pairs: set = set()
     
     @property
     def metric_name(self) -> str:
         return "BERTScore"
     
+    @property
+    def _scorer_key(self) -> Tuple:
+        return (self.model, self.device, self.lang, self.rescale_with_baseline, None)
+    
+    @property
+    def scorer(self) -> 'BERTScorer':
+        """Resident scorer for this evaluator's settings."""
+        return get_bert_scorer(*self._scorer_key)
+    
+    @property
+    def encoder(self):
+        """Model used for embeddings: the scorer's fp32 model or its int8 copy."""
+        if self.backend == 'int8':
+            return get_quantized_model(self._scorer_key, self.scorer)
+        return self.scorer._model
+    
+    @property
+    def cache(self) -> Optional[TokenEmbeddingCache]:
+        """Per-token embedding cache for this model and layer (None if disabled)."""
+        if self.cache_dir is None:
+            return None
+        if self._cache is None:
+            max_bytes = int(self.cache_max_gb * 2**30) if self.cache_max_gb is not None else None
+            # int8 embeddings differ from fp32 ones, so they are cached separately
+            model_name = self.model if self.backend == 'fp32' else f"{self.model}-{self.backend}"
+            self._cache = TokenEmbeddingCache(self.cache_dir, model_name, self.scorer.num_layers, max_bytes)
+        return self._cache
+    
+    # ============================================================
+    # Embedding and Greedy Matching
+    # ============================================================
+    
+    def _encode(self, texts: List[str], encoder: Any = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Run the model on texts in length-bucketed batches.
+        
+        Texts are tokenized first and sorted by token count, so each batch
+        holds texts of similar length and little compute goes to padding.
+        
+        Args:
+            texts: Distinct texts to encode
+            encoder: Model to run (default: self.encoder)
+            
+        Returns:
+            Mapping of text to ((tokens, dim) embeddings, (tokens,) token ids)
+        """
+        scorer = self.scorer
+        encoder = encoder if encoder is not None else self.encoder
+        token_ids = [sent_encode(scorer._tokenizer, t) for t in texts]
+        lengths = np.array([len(ids) for ids in token_ids])
+        
+        encoded = {}
+        for batch in token_batches(lengths, self.token_budget, self.batch_size):
+            padded, lens, mask = padding([token_ids[i] for i in batch], scorer._tokenizer.pad_token_id)
+            embedding = bert_encode(
+                encoder, padded.to(scorer.device), attention_mask=mask.to(scorer.device)
+            ).cpu().numpy()
+            for row, i in enumerate(batch):
+                encoded[texts[i]] = (
+                    embedding[row, :lens[row]].copy(),
+                    np.asarray(token_ids[i], dtype=np.int32),
+                )
+        return encoded
+    
+    def _embed(self, texts: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Embeddings and token ids of texts, running the model only on cache misses."""
+        unique = list(dict.fromkeys(texts))
+        embedded = self.cache.get_many(unique) if self.cache is not None else {}
+        missing = [t for t in unique if t not in embedded]
+        if missing:
+            encoded = self._encode(missing)
+            if self.cache is not None:
+                self.cache.put_many(encoded)
+            embedded.update(encoded)
+        return embedded
+    
+    def _pad(self, texts: List[str], embedded: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        """Padded embeddings, mask and IDF weights, as bert-score builds them."""
+        scorer = self.scorer
+        special = [scorer._tokenizer.sep_token_id, scorer._tokenizer.cls_token_id]
+        embs, idfs = [], []
+        for text in texts:
+            embedding, ids = embedded[text]
+            embs.append(torch.from_numpy(np.array(embedding, dtype=np.float32)))
+            idfs.append(torch.from_numpy(np.where(np.isin(ids, special), 0.0, 1.0).astype(np.float32)))
+        
+        lens = torch.tensor([len(e) for e in embs], dtype=torch.long)
+        mask = torch.arange(int(lens.max())).expand(len(lens), -1) < lens.unsqueeze(1)
+        emb_pad = pad_sequence(embs, batch_first=True, padding_value=2.0)
+        idf_pad = pad_sequence(idfs, batch_first=True)
+        return emb_pad.to(scorer.device), mask.to(scorer.device), idf_pad.to(scorer.device)
+    
+    def _score(self, gen_texts: List[str], ref_texts: List[str], verbose: bool = False):
+        """
+        BERTScore of aligned text lists.
+        
+        Every distinct text is embedded once (through the cache when
+        enabled); pairs are then greedily matched in batches of similar
+        length and the scores are put back in input order.
+        
+        Args:
+            gen_texts: Candidate texts
+            ref_texts: Reference texts (same length as gen_texts)
+            verbose: Print batching progress
+            
+        Returns:
+            (P, R, F1) float arrays in input order
+        """
+        if self.backend != 'fp32' and (self.calibration is None or self.calibration['provisional']):
+            self.calibrate(gen_texts, ref_texts)
+        
+        embedded = self._embed(list(gen_texts) + list(ref_texts))
+        preds = self._match(gen_texts, ref_texts, embedded, verbose)
+        return preds[:, 0], preds[:, 1], preds[:, 2]
+    
+    def _match(
+        self,
+        gen_texts: List[str],
+        ref_texts: List[str],
+        embedded: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        verbose: bool = False
+    ) -> np.ndarray:
+        """Greedy-match embedded pairs; returns (N, 3) P/R/F1 in input order."""
+        scorer = self.scorer
+        # A pair costs roughly its longer side once padded
+        lengths = np.array([
+            max(len(embedded[g][1]), len(embedded[r][1])) for g, r in zip(gen_texts, ref_texts)
+        ])
+        batches = token_batches(lengths, self.token_budget, self.batch_size)
+        if verbose:
+            print(f"  {len(embedded)} distinct texts, {len(batches)} matching batches")
+        
+        preds = np.zeros((len(gen_texts), 3), dtype=np.float32)
+        with torch.no_grad():
+            for batch in batches:
+                ref_stats = self._pad([ref_texts[i] for i in batch], embedded)
+                gen_stats = self._pad([gen_texts[i] for i in batch], embedded)
+                P, R, F1 = greedy_cos_idf(*ref_stats, *gen_stats)
+                preds[batch] = torch.stack((P, R, F1), dim=-1).cpu().numpy()
+        
+        if scorer.rescale_with_baseline:
+            baseline = scorer.baseline_vals.numpy()
+            preds = (preds - baseline) / (1 - baseline)
+        return preds
+    
+    def calibrate(self, gen_texts: List[str], ref_texts: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Compare the quantized backend with fp32 on a sample of pairs.
+        
+        Evenly spaced pairs not compared before are scored with both the fp32
+        and the quantized model (bypassing the cache), up to calibration_size
+        pairs in total. Results accumulate across calls: the calibration stays
+        provisional, and is re-run automatically before each quantized
+        scoring, until calibration_size distinct pairs have been compared.
+        
+        Args:
+            gen_texts: Candidate texts
+            ref_texts: Reference texts
+            
+        Returns:
+            Calibration summary (pairs, max_deviation, mean_deviation, provisional)
+            
+        Raises:
+            RuntimeError: If the largest P/R/F1 deviation exceeds max_deviation
+        """
+        done = self.calibration['pairs'] if self.calibration is not None else 0
+        candidates = [p for p in dict.fromkeys(zip(gen_texts, ref_texts)) if p not in self._calibrated_pairs]
+        n = min(len(candidates), self.calibration_size - done)
+        if n <= 0:
+            return self.calibration
+        
+        picked = [candidates[k] for k in np.unique(np.linspace(0, len(candidates) - 1, n).astype(int))]
+        gens = [g for g, _ in picked]
+        refs = [r for _, r in picked]
+        texts = list(dict.fromkeys(gens + refs))
+        
+        reference = self._match(gens, refs, self._encode(texts, self.scorer._model))
+        quantized = self._match(gens, refs, self._encode(texts, self.encoder))
+        deviation = np.abs(quantized - reference)
+        
+        total = done + len(picked)
+        previous = self.calibration or {'max_deviation': 0.0, 'mean_deviation': 0.0}
+        calibration = {
+            'pairs': total,
+            'max_deviation': max(previous['max_deviation'], float(deviation.max())),
+            'mean_deviation': (previous['mean_deviation'] * done + float(deviation.mean()) * len(picked)) / total,
+            'provisional': total < self.calibration_size,
+        }
+        status = f"provisional, {total}/{self.calibration_size} pairs" if calibration['provisional'] else "final"
+        print(f"{self.backend} calibration on {total} pairs ({status}): "
+              f"max deviation {calibration['max_deviation']:.4f}, "
+              f"mean {calibration['mean_deviation']:.4f}")
+        
+        if calibration['max_deviation'] > self.max_deviation:
+            raise RuntimeError(
+                f"{self.backend} backend deviates from fp32 by {calibration['max_deviation']:.4f} "
+                f"(> max_deviation={self.max_deviation}); use backend='fp32' or raise max_deviation"
+            )
+        self._calibrated_pairs.update(picked)
+        self.calibration = calibration
+        return calibration
+    
+    # ============================================================
+    # Evaluation
+    # ============================================================
+    
     def evaluate_pair(
         self,
         gen_text: str,
@@ -64,13 +431,7 @@ class BERTScoreEvaluator(BaseEvaluator):
         **kwargs
     ) -> Dict[str, Any]:
         """Evaluate a single pair using BERTScore."""
-        P, R, F1 = bert_score_func(
-            [gen_text], [ref_text],
-            model_type=self.model,
-            device=self.device,
-            verbose=False,
-            rescale_with_baseline=self.rescale_with_baseline,
-        )
+        P, R, F1 = self._score([gen_text], [ref_text])
         
         return {
             'score': float(F1[0]),
@@ -104,18 +465,11 @@ class BERTScoreEvaluator(BaseEvaluator):
         
         # Compute BERTScore in batch
         print(f"Computing BERTScore for {len(gen_texts)} pairs...")
-        P, R, F1 = bert_score_func(
-            gen_texts, ref_texts,
-            model_type=self.model,
-            device=self.device,
-            verbose=show_progress,
-            rescale_with_baseline=self.rescale_with_baseline,
-        )
-        
-        # Convert to numpy
-        P = P.numpy()
-        R = R.numpy()
-        F1 = F1.numpy()
+        start = time.perf_counter()
+        P, R, F1 = self._score(gen_texts, ref_texts, verbose=show_progress)
+        elapsed = time.perf_counter() - start
+        pairs_per_sec = len(gen_texts) / elapsed if elapsed > 0 else float('inf')
+        print(f"Scored {len(gen_texts)} pairs in {elapsed:.2f}s ({pairs_per_sec:.1f} pairs/sec)")
         
         # Build results
         results = []
@@ -139,7 +493,17 @@ class BERTScoreEvaluator(BaseEvaluator):
             'mean_recall': float(np.mean(R)),
             'mean_f1': float(np.mean(F1)),
             'model': self.model,
+            'backend': self.backend,
+            'seconds': elapsed,
+            'pairs_per_sec': pairs_per_sec,
         })
+        if self.calibration is not None:
+            stats.update({f'calibration_{k}': v for k, v in self.calibration.items()})
+        if self.cache is not None:
+            stats.update({
+                'cache_hits': self.cache.hits,
+                'cache_misses': self.cache.misses,
+            })
         
         return EvaluationResult(
             pairs=results,
@@ -0,0 +1,197 @@
+"""
+On-disk cache of per-token BERT embeddings for BERTScore.
+
+Reference AD texts are scored again and again (every matcher setting, model
+variant and nightly run), and their contextual embeddings never change for a
+given model and layer. This cache stores them content-addressed, so
+BERTScoreEvaluator only runs the model on texts it has not seen before.
+
+Layout (one directory per model and layer):
+    <cache_dir>/<model>_L<layer>/<ab>/<sha1>.npy      - (tokens, dim) float32 embeddings
+    <cache_dir>/<model>_L<layer>/<ab>/<sha1>.ids.npy  - (tokens,) int32 token ids
+
+Token ids are kept so IDF weights can be derived for any IDF dictionary
+without re-tokenizing. Entries are opened memory-mapped and read-only. Each
+hit refreshes the entry's modification time, and when the cache grows past
+max_bytes the least recently used entries are deleted.
+"""
+
+import os
+import re
+import hashlib
+import tempfile
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+# Fraction of max_bytes kept after trimming (avoids trimming on every write)
+_TRIM_TARGET = 0.9
+
+
+class TokenEmbeddingCache:
+    """
+    Content-addressed, size-capped store of per-token embeddings.
+    
+    get_many()/put_many() work on texts; keys are the SHA-1 of the text
+    within the directory of one (model, layer). Writes go to a temporary file
+    that is renamed into place, so concurrent evaluators never read partial
+    entries.
+    """
+    
+    def __init__(self, cache_dir: str, model: str, num_layers: int, max_bytes: Optional[int] = None):
+        """
+        Initialize TokenEmbeddingCache.
+        
+        Args:
+            cache_dir: Root directory of the cache (created on first write)
+            model: Model the embeddings were computed with
+            num_layers: Layer the embeddings were taken from
+            max_bytes: Size cap in bytes (None = unlimited)
+        """
+        model_dir = re.sub(r'[^A-Za-z0-9_.-]+', '_', model)
+        self.cache_dir = os.path.join(os.path.expanduser(cache_dir), f"{model_dir}_L{num_layers}")
+        self.model = model
+        self.num_layers = num_layers
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(text: str) -> str:
+        """Cache key for a text."""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npy")
+    
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, embedding path) of every entry, ids file size included."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for item in os.scandir(sub.path):
+                if not item.name.endswith('.npy') or item.name.endswith('.ids.npy'):
+                    continue
+                try:
+                    stat = item.stat()
+                    ids_size = os.path.getsize(item.path[:-4] + '.ids.npy')
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size + ids_size, item.path))
+        return entries
+    
+    def size_bytes(self) -> int:
+        """Total size of the cache on disk."""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+    
+    def get(self, text: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Look up one text.
+        
+        Args:
+            text: Text to look up
+            
+        Returns:
+            (embeddings, token_ids) as read-only memory maps, or None if missing
+        """
+        path = self._path(self.key(text))
+        try:
+            embedding = np.load(path, mmap_mode='r')
+            ids = np.load(path[:-4] + '.ids.npy', mmap_mode='r')
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return embedding, ids
+    
+    def get_many(self, texts: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Look up many texts.
+        
+        Args:
+            texts: Texts to look up
+            
+        Returns:
+            Mapping of text to (embeddings, token_ids) for the texts found
+        """
+        found = {}
+        for text in dict.fromkeys(texts):
+            entry = self.get(text)
+            if entry is not None:
+                found[text] = entry
+        return found
+    
+    def _write(self, path: str, array: np.ndarray) -> int:
+        """Atomically write one array; returns bytes written."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return size
+    
+    def put_many(self, entries: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """
+        Store embeddings, then trim the cache if it exceeds max_bytes.
+        
+        Args:
+            entries: Mapping of text to ((tokens, dim) embeddings, (tokens,) token ids)
+        """
+        if not entries:
+            return
+        written = 0
+        for text, (embedding, ids) in entries.items():
+            path = self._path(self.key(text))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # The ids file goes first: an embedding file is only visible once complete
+            written += self._write(path[:-4] + '.ids.npy', np.asarray(ids, dtype=np.int32))
+            written += self._write(path, np.asarray(embedding, dtype=np.float32))
+        
+        if self._size is not None:
+            self._size += written
+        if self.max_bytes is not None and self.size_bytes() > self.max_bytes:
+            self.trim()
+    
+    def trim(self, target_bytes: Optional[int] = None) -> int:
+        """
+        Delete least recently used entries until the cache fits.
+        
+        Args:
+            target_bytes: Size to trim to (default: 90% of max_bytes)
+            
+        Returns:
+            Number of entries removed
+        """
+        if target_bytes is None:
+            if self.max_bytes is None:
+                return 0
+            target_bytes = int(self.max_bytes * _TRIM_TARGET)
+        
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target_bytes:
+                break
+            for p in (path, path[:-4] + '.ids.npy'):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        
+        self._size = total
+        return removed
@@ -5,10 +5,13 @@ CIDEr uses TF-IDF weighted n-gram similarity.
 """
 
 import math
-from typing import Dict, Any, Optional, List
+import numpy as np
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from collections import defaultdict
+from dataclasses import dataclass
 
 from .base import BaseEvaluator, EvaluationResult
+from .cider_index import CorpusDFIndex
 from ..utils import MatchedPair
 
 # Optional imports
@@ -20,6 +23,12 @@ try:
 except ImportError:
     NLTK_AVAILABLE = False
 
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 
 def ensure_nltk_data():
     """Download required NLTK data if not available."""
@@ -36,11 +45,26 @@ def ensure_nltk_data():
         nltk.download('punkt_tab', quiet=True)
 
 
+@dataclass
+class NgramStats:
+    """N-gram counts of one tokenized text."""
+    tokens: List[str]
+    counts: Dict[int, Dict[tuple, int]]  # n -> n-gram -> count
+    totals: Dict[int, int]  # n -> number of n-grams
+    
+    @property
+    def length(self) -> int:
+        return len(self.tokens)
+
+
 class CIDErScorer:
     """
     CIDEr scorer implementation.
     
     Computes CIDEr score based on TF-IDF weighted n-gram matching.
+    Each distinct text is tokenized once; its n-gram counts, totals and
+    length are cached and reused for document frequency, TF-IDF and the
+    length penalty.
     """
     
     def __init__(self, n: int = 4, sigma: float = 6.0):
@@ -55,21 +79,41 @@ class CIDErScorer:
         self.sigma = sigma
         self.document_frequency = defaultdict(float)
         self.ref_len = None
+        self._stats: Dict[str, NgramStats] = {}
+        self._tfidf: Dict[str, dict] = {}  # valid until document frequency changes
     
     def _get_ngrams(self, text: str, n: int) -> list:
         """Get n-grams from text."""
-        tokens = word_tokenize(text.lower())
+        tokens = self._text_stats(text).tokens
         return list(ngrams(tokens, n)) if len(tokens) >= n else []
     
+    def _text_stats(self, text: str) -> NgramStats:
+        """Tokenize text once and count its n-grams for all n in one pass."""
+        stats = self._stats.get(text)
+        if stats is None:
+            tokens = word_tokenize(text.lower())
+            counts = {n: defaultdict(int) for n in range(1, self.n + 1)}
+            for i in range(len(tokens)):
+                for n in range(1, min(self.n, len(tokens) - i) + 1):
+                    counts[n][tuple(tokens[i:i + n])] += 1
+            totals = {n: sum(c.values()) for n, c in counts.items()}
+            stats = NgramStats(tokens=tokens, counts=counts, totals=totals)
+            self._stats[text] = stats
+        return stats
+    
+    def precompute(self, texts: List[str]) -> None:
+        """
+        Tokenize and count n-grams for texts ahead of scoring.
+        
+        Args:
+            texts: Texts to prepare (already cached texts are skipped)
+        """
+        for text in texts:
+            self._text_stats(text)
+    
     def _count_ngrams(self, text: str) -> dict:
         """Count n-grams for all n from 1 to self.n."""
-        counts = {}
-        for n in range(1, self.n + 1):
-            ngram_list = self._get_ngrams(text, n)
-            counts[n] = defaultdict(int)
-            for ng in ngram_list:
-                counts[n][ng] += 1
-        return counts
+        return self._text_stats(text).counts
     
     def compute_doc_freq(self, references: List[str]) -> None:
         """
@@ -79,24 +123,36 @@ class CIDErScorer:
             references: List of reference texts
         """
         self.ref_len = len(references)
+        self._tfidf.clear()
         
         for ref in references:
-            seen = set()
+            counts = self._text_stats(ref).counts
             for n in range(1, self.n + 1):
-                ngram_list = self._get_ngrams(ref, n)
-                for ng in ngram_list:
-                    if ng not in seen:
-                        self.document_frequency[ng] += 1
-                        seen.add(ng)
-    
-    def _compute_tfidf(self, counts: dict, ref_len: int) -> dict:
-        """Compute TF-IDF vector for n-gram counts."""
+                for ng in counts[n]:
+                    self.document_frequency[ng] += 1
+    
+    def use_df_index(self, index: CorpusDFIndex) -> None:
+        """
+        Use corpus document frequencies instead of compute_doc_freq().
+        
+        Args:
+            index: Corpus index built with at least this scorer's n-gram size
+        """
+        if index.n < self.n:
+            raise ValueError(f"DF index covers n-grams up to {index.n}, scorer needs {self.n}")
+        self.document_frequency = index
+        self.ref_len = index.num_docs
+        self._tfidf.clear()
+    
+    def _compute_tfidf(self, counts: dict, ref_len: int, totals: Optional[Dict[int, int]] = None) -> dict:
+        """Compute TF-IDF vector for n-gram counts (totals: n-gram count per n, if known)."""
         vec = defaultdict(float)
         norm = 0.0
         
         for n in range(1, self.n + 1):
+            total = max(totals[n] if totals is not None else sum(counts[n].values()), 1)
             for ng, count in counts[n].items():
-                tf = count / max(sum(counts[n].values()), 1)
+                tf = count / total
                 df = self.document_frequency.get(ng, 0)
                 idf = math.log((ref_len + 1.0) / (df + 1.0))
                 vec[ng] = tf * idf
@@ -109,6 +165,15 @@ class CIDErScorer:
         
         return vec
     
+    def _text_tfidf(self, text: str) -> dict:
+        """TF-IDF vector of a text under the current document frequency (cached)."""
+        vec = self._tfidf.get(text)
+        if vec is None:
+            stats = self._text_stats(text)
+            vec = self._compute_tfidf(stats.counts, self.ref_len or 1, stats.totals)
+            self._tfidf[text] = vec
+        return vec
+    
     def _cosine_similarity(self, vec1: dict, vec2: dict) -> float:
         """Compute cosine similarity between two vectors."""
         score = 0.0
@@ -128,24 +193,124 @@ class CIDErScorer:
         Returns:
             CIDEr score (0-10 scale)
         """
-        ref_counts = self._count_ngrams(reference)
-        hyp_counts = self._count_ngrams(hypothesis)
-        
-        ref_vec = self._compute_tfidf(ref_counts, self.ref_len or 1)
-        hyp_vec = self._compute_tfidf(hyp_counts, self.ref_len or 1)
+        ref_vec = self._text_tfidf(reference)
+        hyp_vec = self._text_tfidf(hypothesis)
         
         score = self._cosine_similarity(ref_vec, hyp_vec)
         
         # Length penalty
-        ref_len = len(word_tokenize(reference.lower()))
-        hyp_len = len(word_tokenize(hypothesis.lower()))
-        
         if self.sigma > 0:
-            length_diff = hyp_len - ref_len
+            length_diff = self._text_stats(hypothesis).length - self._text_stats(reference).length
             penalty = math.exp(-(length_diff ** 2) / (2 * self.sigma ** 2))
             score *= penalty
         
         return score * 10.0
+    
+    def _tfidf_matrix(self, texts: List[str]) -> Tuple['sparse.csr_matrix', np.ndarray]:
+        """
+        Build L2-normalized TF-IDF rows for texts.
+        
+        N-grams are mapped to integer column ids; row k matches
+        _text_tfidf(texts[k]) under the current document frequency.
+        
+        Returns:
+            (CSR matrix of shape (len(texts), n_ngrams), token lengths)
+        """
+        vocab: Dict[tuple, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        tf: List[float] = []
+        lengths = np.empty(len(texts), dtype=float)
+        
+        for k, text in enumerate(texts):
+            stats = self._text_stats(text)
+            for n in range(1, self.n + 1):
+                total = max(stats.totals[n], 1)
+                for ng, count in stats.counts[n].items():
+                    indices.append(vocab.setdefault(ng, len(vocab)))
+                    tf.append(count / total)
+            indptr.append(len(indices))
+            lengths[k] = stats.length
+        
+        ref_len = self.ref_len or 1
+        if isinstance(self.document_frequency, CorpusDFIndex):
+            df = self.document_frequency.lookup(list(vocab))
+        else:
+            df = np.fromiter((self.document_frequency.get(ng, 0) for ng in vocab), dtype=float, count=len(vocab))
+        idf = np.log((ref_len + 1.0) / (df + 1.0))
+        
+        indices_arr = np.asarray(indices, dtype=np.int64)
+        indptr_arr = np.asarray(indptr, dtype=np.int64)
+        data = np.asarray(tf, dtype=float) * idf[indices_arr]
+        
+        # Row norms
+        row_sizes = np.diff(indptr_arr)
+        row_ids = np.repeat(np.arange(len(texts)), row_sizes)
+        norms = np.sqrt(np.bincount(row_ids, weights=data ** 2, minlength=len(texts)))
+        scale = np.divide(1.0, norms, out=np.ones_like(norms), where=norms > 0)
+        data *= scale[row_ids]
+        
+        matrix = sparse.csr_matrix((data, indices_arr, indptr_arr), shape=(len(texts), len(vocab)))
+        return matrix, lengths
+    
+    def compute_scores(
+        self,
+        references: List[str],
+        hypotheses: List[str],
+        chunk_size: int = 200_000,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> np.ndarray:
+        """
+        Compute CIDEr scores for many (reference, hypothesis) pairs at once.
+        
+        TF-IDF vectors of every distinct text are rows of one sparse matrix;
+        each pair's cosine and length penalty are computed in bulk. Scores
+        match compute_score() up to floating-point rounding. Without scipy,
+        falls back to compute_score() per pair.
+        
+        Args:
+            references: Reference text of each pair
+            hypotheses: Hypothesis text of each pair
+            chunk_size: Pairs per sparse row-product (bounds memory)
+            progress: Called with the number of pairs scored after each chunk
+            
+        Returns:
+            Array of CIDEr scores (0-10 scale)
+        """
+        if len(references) != len(hypotheses):
+            raise ValueError("references and hypotheses must have the same length")
+        if not SCIPY_AVAILABLE:
+            scores = np.empty(len(references), dtype=float)
+            for k, (ref, hyp) in enumerate(zip(references, hypotheses)):
+                scores[k] = self.compute_score(ref, hyp)
+                if progress is not None:
+                    progress(1)
+            return scores
+        
+        texts = list(dict.fromkeys(list(references) + list(hypotheses)))
+        row_of = {text: k for k, text in enumerate(texts)}
+        matrix, lengths = self._tfidf_matrix(texts)
+        ref_rows = np.fromiter((row_of[t] for t in references), dtype=np.int64, count=len(references))
+        hyp_rows = np.fromiter((row_of[t] for t in hypotheses), dtype=np.int64, count=len(hypotheses))
+        
+        scores = np.zeros(len(references), dtype=float)
+        for lo in range(0, len(references), chunk_size):
+            hi = min(lo + chunk_size, len(references))
+            products = matrix[ref_rows[lo:hi]].multiply(matrix[hyp_rows[lo:hi]])
+            scores[lo:hi] = np.asarray(products.sum(axis=1)).ravel()
+            if progress is not None:
+                progress(hi - lo)
+        
+        # Length penalty
+        if self.sigma > 0:
+            length_diff = lengths[hyp_rows] - lengths[ref_rows]
+            scores *= np.exp(-(length_diff ** 2) / (2 * self.sigma ** 2))
+        
+        return scores * 10.0
+
+
+# Pairs per bulk scoring chunk in evaluate_batch (one progress update each)
+_PROGRESS_CHUNK = 20_000
 
 
 class CIDErEvaluator(BaseEvaluator):
@@ -159,6 +324,8 @@ class CIDErEvaluator(BaseEvaluator):
         self,
         n_gram: int = 4,
         sigma: float = 6.0,
+        df_mode: str = "film",
+        df_index: Optional[str] = None,
         config: Any = None,
     ):
         """
@@ -167,6 +334,9 @@ class CIDErEvaluator(BaseEvaluator):
         Args:
             n_gram: Maximum n-gram size
             sigma: Length penalty sigma
+            df_mode: Document frequency source: 'film' (matched references of
+                the evaluated film) or 'corpus' (index at df_index)
+            df_index: Corpus DF index directory (see cider_index.build_df_index)
             config: Optional CIDErConfig object
         """
         super().__init__(config)
@@ -179,6 +349,13 @@ class CIDErEvaluator(BaseEvaluator):
         self.n_gram = n_gram
         self.sigma = sigma
         self._scorer = None
+        
+        if df_mode not in ('film', 'corpus'):
+            raise ValueError(f"Unknown df_mode: {df_mode}. Available: ['film', 'corpus']")
+        if df_mode == 'corpus' and not df_index:
+            raise ValueError("df_mode='corpus' requires df_index (build one with eval_metric.evaluators.cider_index)")
+        self.df_mode = df_mode
+        self.df_index = CorpusDFIndex(df_index) if df_mode == 'corpus' else None
     
     @property
     def metric_name(self) -> str:
@@ -194,7 +371,10 @@ class CIDErEvaluator(BaseEvaluator):
         if self._scorer is None:
             # Create scorer with single reference
             self._scorer = CIDErScorer(n=self.n_gram, sigma=self.sigma)
-            self._scorer.compute_doc_freq([ref_text])
+            if self.df_index is not None:
+                self._scorer.use_df_index(self.df_index)
+            else:
+                self._scorer.compute_doc_freq([ref_text])
         
         score = self._scorer.compute_score(ref_text, gen_text)
         return {'score': float(score)}
@@ -218,27 +398,31 @@ class CIDErEvaluator(BaseEvaluator):
                 metric_name=self.metric_name,
             )
         
-        # Compute document frequency from all references
+        # Document frequency from all references of this film, or the corpus index
         all_refs = [p.combined_ref_text for p in pairs_to_eval]
+        all_gens = [p.combined_gen_text for p in pairs_to_eval]
         scorer = CIDErScorer(n=self.n_gram, sigma=self.sigma)
-        scorer.compute_doc_freq(all_refs)
+        scorer.precompute(all_refs + all_gens)
+        if self.df_index is not None:
+            scorer.use_df_index(self.df_index)
+        else:
+            scorer.compute_doc_freq(all_refs)
         
-        # Evaluate pairs
-        results = []
-        scores = []
+        # Score all pairs in bulk
+        with tqdm(total=len(pairs_to_eval), desc=f"Evaluating {self.metric_name}", disable=not show_progress) as progress:
+            scores = scorer.compute_scores(
+                all_refs, all_gens, chunk_size=_PROGRESS_CHUNK, progress=progress.update
+            ).tolist()
         
-        iterator = tqdm(pairs_to_eval, desc=f"Evaluating {self.metric_name}") if show_progress else pairs_to_eval
-        
-        for pair in iterator:
-            score = scorer.compute_score(pair.combined_ref_text, pair.combined_gen_text)
-            
+        results = []
+        for pair, score in zip(pairs_to_eval, scores):
             pair_result = pair.to_dict()
             pair_result['score'] = float(score)
             results.append(pair_result)
-            scores.append(score)
         
         stats = self._calculate_statistics(scores, matched_pairs)
         stats['n_gram'] = self.n_gram
+        stats['df_mode'] = self.df_mode
         
         return EvaluationResult(
             pairs=results,
@@ -0,0 +1,229 @@
+"""
+Corpus document-frequency index for CIDEr.
+
+Scans a whole reference AD corpus (e.g. every MAD or CMD-AD CSV) once and
+stores the document frequency of each n-gram, so CIDEr scores of different
+films share one IDF and the corpus is never re-tokenized. Each reference AD
+line is one document.
+
+The index is a directory:
+    meta.json   - max n-gram size, document count, source files
+    keys.npy    - sorted 64-bit hashes of the n-grams (uint64)
+    counts.npy  - document frequency of each key (uint32)
+
+Arrays are opened memory-mapped and read-only, so loading is instant and
+processes scoring with the same index share its pages.
+
+Usage:
+    python -m eval_metric.evaluators.cider_index data/MAD/*.csv -o indexes/mad_df
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..utils import load_reference_ad
+
+
+# Joins n-gram tokens before hashing (never produced by the tokenizer)
+_TOKEN_SEP = '\x1f'
+
+
+def ngram_key(ngram: tuple) -> int:
+    """64-bit hash of an n-gram tuple (collision odds ~1e-7 at 10^6 n-grams)."""
+    digest = hashlib.blake2b(_TOKEN_SEP.join(ngram).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class CorpusDFIndex:
+    """
+    Read-only, memory-mapped n-gram document frequencies.
+    
+    Supports get(ngram, default) so it can replace CIDErScorer's
+    document_frequency dict, and lookup() for many n-grams at once.
+    Pickling stores only the path; unpickled copies re-open the memory map.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open an index built by build_df_index.
+        
+        Args:
+            path: Index directory
+        """
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.n = int(self.meta['n'])
+        self.num_docs = int(self.meta['num_docs'])
+        self.keys = np.load(os.path.join(path, 'keys.npy'), mmap_mode='r')
+        self.counts = np.load(os.path.join(path, 'counts.npy'), mmap_mode='r')
+    
+    def __getstate__(self):
+        return {'path': self.path}
+    
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def __repr__(self) -> str:
+        return f"CorpusDFIndex({self.path!r}, {len(self)} n-grams, {self.num_docs} documents)"
+    
+    def lookup(self, ngrams: List[tuple]) -> np.ndarray:
+        """
+        Document frequencies of many n-grams.
+        
+        Args:
+            ngrams: N-gram tuples
+            
+        Returns:
+            Float array of document frequencies (0 for unseen n-grams)
+        """
+        if not ngrams or not len(self.keys):
+            return np.zeros(len(ngrams), dtype=float)
+        
+        query = np.fromiter((ngram_key(ng) for ng in ngrams), dtype=np.uint64, count=len(ngrams))
+        pos = np.searchsorted(self.keys, query)
+        pos_clipped = np.minimum(pos, len(self.keys) - 1)
+        found = self.keys[pos_clipped] == query
+        return np.where(found, self.counts[pos_clipped], 0).astype(float)
+    
+    def get(self, ngram: tuple, default: float = 0) -> float:
+        """Document frequency of one n-gram."""
+        if not len(self.keys):
+            return default
+        key = np.uint64(ngram_key(ngram))
+        pos = int(np.searchsorted(self.keys, key))
+        if pos < len(self.keys) and self.keys[pos] == key:
+            return float(self.counts[pos])
+        return default
+
+
+def build_df_index(
+    csv_paths: List[str],
+    output_dir: str,
+    n: int = 4,
+    filter_ad_only: bool = True,
+    show_progress: bool = True,
+    force: bool = False
+) -> CorpusDFIndex:
+    """
+    Scan reference AD CSVs and write a document-frequency index.
+    
+    Texts are tokenized exactly as CIDErScorer does, so index lookups match
+    the n-grams it scores.
+    
+    Args:
+        csv_paths: Reference AD CSV files (see load_reference_ad)
+        output_dir: Index directory to create (an existing index is replaced)
+        n: Maximum n-gram size
+        filter_ad_only: Only count rows with speech_type 'ad' when present
+        show_progress: Print per-file progress
+        force: Replace output_dir even if it is not an index
+        
+    Returns:
+        The opened index
+        
+    Raises:
+        FileExistsError: If output_dir exists, is not empty and holds no
+            meta.json, and force is not set
+    """
+    from .cider import CIDErScorer
+    
+    # Only ever replace a previous index (or an empty directory), so a mistyped
+    # output path cannot wipe unrelated data
+    if os.path.lexists(output_dir) and not force:
+        is_index = os.path.isfile(os.path.join(output_dir, 'meta.json'))
+        is_empty = os.path.isdir(output_dir) and not os.listdir(output_dir)
+        if not (is_index or is_empty):
+            raise FileExistsError(
+                f"{output_dir} exists and is not a CIDEr DF index; "
+                f"choose another output or pass force=True (--force) to replace it"
+            )
+    
+    scorer = CIDErScorer(n=n)
+    df: Dict[int, int] = {}
+    num_docs = 0
+    
+    for k, csv_path in enumerate(csv_paths):
+        texts = load_reference_ad(csv_path, filter_ad_only=filter_ad_only).texts()
+        for text in texts:
+            counts = scorer._text_stats(text).counts
+            for size in range(1, n + 1):
+                for ng in counts[size]:
+                    key = ngram_key(ng)
+                    df[key] = df.get(key, 0) + 1
+        num_docs += len(texts)
+        scorer._stats.clear()  # only document frequencies are kept
+        
+        if show_progress:
+            print(f"  [{k + 1}/{len(csv_paths)}] {csv_path}: {len(texts)} lines, {len(df)} n-grams")
+    
+    keys = np.fromiter(df.keys(), dtype=np.uint64, count=len(df))
+    counts = np.fromiter(df.values(), dtype=np.uint32, count=len(df))
+    order = np.argsort(keys)
+    
+    meta = {
+        'n': n,
+        'num_docs': num_docs,
+        'num_ngrams': len(df),
+        'filter_ad_only': filter_ad_only,
+        'sources': [os.path.abspath(p) for p in csv_paths],
+        'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    
+    # Write into a sibling temp directory, then swap it into place
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.cider_df_')
+    try:
+        np.save(os.path.join(tmp_dir, 'keys.npy'), keys[order])
+        np.save(os.path.join(tmp_dir, 'counts.npy'), counts[order])
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        if os.path.isdir(output_dir) and not os.path.islink(output_dir):
+            shutil.rmtree(output_dir)
+        elif os.path.lexists(output_dir):
+            os.remove(output_dir)
+        os.replace(tmp_dir, output_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    
+    return CorpusDFIndex(output_dir)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Build a corpus CIDEr document-frequency index")
+    parser.add_argument('csv_paths', nargs='+', help='Reference AD CSV files')
+    parser.add_argument('--output', '-o', type=str, required=True,
+                        help='Index directory to write')
+    parser.add_argument('--n-gram', type=int, default=4,
+                        help='Maximum n-gram size (default: 4)')
+    parser.add_argument('--all-rows', action='store_true',
+                        help="Count every row, not only speech_type 'ad'")
+    parser.add_argument('--force', action='store_true',
+                        help='Replace the output directory even if it is not an index')
+    args = parser.parse_args(argv)
+    
+    from .cider import ensure_nltk_data
+    ensure_nltk_data()
+    
+    print(f"Building CIDEr DF index from {len(args.csv_paths)} file(s)...")
+    index = build_df_index(
+        args.csv_paths, args.output, n=args.n_gram, filter_ad_only=not args.all_rows, force=args.force
+    )
+    print(f"Saved {index}")
+
+
+if __name__ == '__main__':
+    main()
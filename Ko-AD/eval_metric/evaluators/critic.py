@@ -5,11 +5,17 @@ CRITIC (Co-Referencing In Text for Identifying Characters) evaluates
 character identification accuracy between generated and reference AD.
 """
 
+import os
 import json
-from typing import Dict, Any, Optional, List
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 import numpy as np
 
 from .base import BaseEvaluator, EvaluationResult
+from .critic_cache import CRITICCache, package_version
 from ..utils import MatchedPair
 
 # Optional imports
@@ -20,6 +26,236 @@ except ImportError:
     FCOREF_AVAILABLE = False
 
 
+# ============================================================
+# Coreference Micro-Batching
+# ============================================================
+
+class CorefBatcher:
+    """
+    Queue of coreference requests served in batches by one worker thread.
+    
+    submit() returns a Future immediately. The worker takes the first
+    waiting text, collects more for up to max_wait seconds (or until
+    max_batch texts), and sends them to the model in a single
+    predict(texts=[...]) call. Concurrent callers (e.g. the web editor or
+    incremental evaluation scoring pairs one at a time) therefore share
+    forward passes, and each Future receives the result for its own text.
+    """
+    
+    def __init__(self, model: Any, max_batch: int = 32, max_wait: float = 0.01):
+        """
+        Initialize CorefBatcher.
+        
+        Args:
+            model: Coreference model with predict(texts=[...]) (e.g. FCoref)
+            max_batch: Maximum texts per predict call
+            max_wait: Seconds to wait for more requests after the first
+        """
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.texts = 0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="coref-batcher", daemon=True)
+        self._thread.start()
+    
+    def submit(self, text: str) -> Future:
+        """Queue one text; the Future resolves to its coreference result."""
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+    
+    def predict(self, texts: List[str]) -> List[Any]:
+        """
+        Coreference results for texts, in input order.
+        
+        All texts are queued at once, so they are batched together (and with
+        any concurrent requests).
+        """
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+    
+    def _collect(self) -> List[Tuple[str, Future]]:
+        """Block for the first request, then gather more until full or timed out."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self) -> None:
+        while True:
+            batch = [(t, f) for t, f in self._collect() if f.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                preds = self.model.predict(texts=[text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.texts += len(batch)
+            for (_, future), pred in zip(batch, preds):
+                future.set_result(pred)
+
+
+# ============================================================
+# Windowed Coreference
+# ============================================================
+
+class MergedCoref:
+    """
+    Coreference result over a long text, assembled from window predictions.
+    
+    Offers the parts of FCoref's result used by CRITICEvaluator: the text
+    and get_clusters() with character spans into it.
+    """
+    
+    def __init__(self, text: str, clusters: List[List[Tuple[int, int]]]):
+        self.text = text
+        self.clusters = clusters
+    
+    def get_clusters(self, as_strings: bool = True) -> list:
+        if as_strings:
+            return [[self.text[s:e] for s, e in cluster] for cluster in self.clusters]
+        return [list(cluster) for cluster in self.clusters]
+
+
+def window_bounds(lengths: List[int], window_chars: int, overlap: int) -> List[Tuple[int, int]]:
+    """
+    Split pair texts into overlapping windows on pair boundaries.
+    
+    Args:
+        lengths: Character length of each pair text
+        window_chars: Target characters per window (every window adds at least
+            one pair not in the previous window, even past this size)
+        overlap: Pairs shared by consecutive windows
+        
+    Returns:
+        (start, end) pair ranges, end exclusive, covering every pair
+    """
+    bounds = []
+    start, prev_end = 0, 0
+    while start < len(lengths):
+        end = prev_end + 1
+        size = sum(lengths[start:end]) + (end - start - 1)
+        while end < len(lengths) and size + 1 + lengths[end] <= window_chars:
+            size += 1 + lengths[end]
+            end += 1
+        bounds.append((start, end))
+        if end == len(lengths):
+            break
+        start, prev_end = max(start + 1, end - overlap), end
+    return bounds
+
+
+def merge_window_clusters(window_clusters: List[List[List[Tuple[int, int]]]]) -> List[List[Tuple[int, int]]]:
+    """
+    Merge clusters predicted on overlapping windows.
+    
+    Spans are in global character offsets. Clusters from different windows
+    that share a mention (in a window overlap or the character-list prefix
+    every window starts with) are joined.
+    
+    Args:
+        window_clusters: Clusters of each window, as lists of (start, end) spans
+        
+    Returns:
+        Merged clusters, each sorted by position, ordered by first mention
+    """
+    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    
+    def find(span):
+        root = span
+        while parent[root] != root:
+            root = parent[root]
+        while parent[span] != root:
+            parent[span], span = root, parent[span]
+        return root
+    
+    for clusters in window_clusters:
+        for cluster in clusters:
+            for span in cluster:
+                parent.setdefault(span, span)
+            root = find(cluster[0])
+            for span in cluster[1:]:
+                other = find(span)
+                if other != root:
+                    parent[other] = root
+    
+    merged: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    for span in parent:
+        merged.setdefault(find(span), []).append(span)
+    return sorted((sorted(c) for c in merged.values()), key=lambda c: c[0])
+
+
+def pair_offsets(texts: List[str], prefix_len: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Character range of each pair in prefix + ' '.join(texts).
+    
+    Args:
+        texts: Pair texts in order
+        prefix_len: Characters before the first text (character list and space)
+        
+    Returns:
+        (starts, ends) arrays; pair k occupies [starts[k], ends[k])
+    """
+    lengths = np.array([len(t) for t in texts], dtype=np.int64)
+    starts = prefix_len + np.concatenate([[0], np.cumsum(lengths[:-1] + 1)]).astype(np.int64)[:len(texts)]
+    return starts, starts + lengths
+
+
+def mention_rows(spans: List[Tuple[int, int]], starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Pair row of each mention span, or -1.
+    
+    A span maps to a row only if it is non-empty and lies entirely inside
+    that pair's text; spans in the prefix, on separators or across pairs get -1.
+    
+    Args:
+        spans: (start, end) character spans
+        starts: Pair start offsets (sorted)
+        ends: Pair end offsets
+        
+    Returns:
+        Integer array of rows
+    """
+    if not spans or not len(starts):
+        return np.full(len(spans), -1, dtype=np.int64)
+    s, e = np.asarray(spans, dtype=np.int64).T
+    rows = np.searchsorted(starts, s, side='right') - 1
+    valid = (rows >= 0) & (e > s) & (e <= ends[np.maximum(rows, 0)])
+    return np.where(valid, rows, -1)
+
+
+# Coreference model of a worker process (see _init_coref_worker)
+_WORKER_MODEL = None
+
+
+def _init_coref_worker(device: str) -> None:
+    global _WORKER_MODEL
+    _WORKER_MODEL = FCoref(device=device, enable_progress_bar=False)
+
+
+def _predict_clusters(texts: List[str]) -> List[List[List[Tuple[int, int]]]]:
+    """Predict one batch of windows in a worker; returns their character-span clusters."""
+    preds = _WORKER_MODEL.predict(texts=texts)
+    return [[[tuple(span) for span in c] for c in p.get_clusters(as_strings=False)] for p in preds]
+
+
+# ============================================================
+# CRITIC Evaluator
+# ============================================================
+
 class CRITICEvaluator(BaseEvaluator):
     """
     CRITIC evaluator for character identification.
@@ -33,6 +269,13 @@ class CRITICEvaluator(BaseEvaluator):
         characters: Optional[List[str]] = None,
         characters_file: Optional[str] = None,
         device: str = "cpu",
+        max_batch: int = 32,
+        max_wait_ms: float = 10.0,
+        coref_mode: str = "full",
+        window_chars: int = 4000,
+        window_overlap: int = 2,
+        n_jobs: Optional[int] = 1,
+        cache_dir: Optional[str] = None,
         config: Any = None,
     ):
         """
@@ -42,6 +285,14 @@ class CRITICEvaluator(BaseEvaluator):
             characters: List of character names
             characters_file: Path to JSON file with character list
             device: Device for FCoref model ('cpu' or 'cuda:0')
+            max_batch: Maximum texts per coreference call for pair-level requests
+            max_wait_ms: Milliseconds a pair-level request waits for others to batch with
+            coref_mode: 'full' (one prediction over all pairs) or 'windowed'
+                (overlapping windows on pair boundaries, clusters merged)
+            window_chars: Target characters per window in windowed mode
+            window_overlap: Pairs shared by consecutive windows
+            n_jobs: Worker processes for windowed mode on CPU (None = all cores)
+            cache_dir: Directory for cached reference coreference (None = no cache)
             config: Optional CRITICConfig object
         """
         super().__init__(config)
@@ -51,6 +302,18 @@ class CRITICEvaluator(BaseEvaluator):
         
         self.device = device
         self.coref_model = None
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._batcher: Optional[CorefBatcher] = None
+        self._batcher_lock = threading.Lock()
+        
+        if coref_mode not in ('full', 'windowed'):
+            raise ValueError(f"Unknown coref_mode: {coref_mode}. Available: ['full', 'windowed']")
+        self.coref_mode = coref_mode
+        self.window_chars = window_chars
+        self.window_overlap = window_overlap
+        self.n_jobs = n_jobs
+        self.ref_cache = CRITICCache(cache_dir) if cache_dir else None
         
         # Load character list
         if characters_file:
@@ -79,16 +342,105 @@ class CRITICEvaluator(BaseEvaluator):
                 print("Falling back to CPU...")
                 self.coref_model = FCoref(device='cpu', enable_progress_bar=False)
     
+    @property
+    def batcher(self) -> CorefBatcher:
+        """Micro-batching queue in front of the coreference model (created on first use)."""
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._init_coref_model()
+                self._batcher = CorefBatcher(self.coref_model, self.max_batch, self.max_wait_ms / 1000.0)
+        return self._batcher
+    
+    @property
+    def roles_str(self) -> str:
+        """Character list sentence prepended to every coreference input."""
+        roles_str = ""
+        if len(self.characters) > 1:
+            roles_str = ', '.join(self.characters[:-1]) + ' and '
+        if len(self.characters) > 0:
+            roles_str += self.characters[-1] + '.'
+        return roles_str
+    
+    @property
+    def coref_settings(self) -> Dict[str, Any]:
+        """Model version and mode that determine coreference output (part of cache keys)."""
+        settings = {
+            'model': 'FCoref',
+            'fastcoref': package_version('fastcoref'),
+            'transformers': package_version('transformers'),
+            'coref_mode': self.coref_mode,
+        }
+        if self.coref_mode == 'windowed':
+            settings.update({'window_chars': self.window_chars, 'window_overlap': self.window_overlap})
+        return settings
+    
+    def _predict_joined(self, texts: List[str], roles_str: str) -> Any:
+        """
+        Coreference over f"{roles_str} {' '.join(texts)}".
+        
+        In windowed mode the pairs are split into overlapping windows (each
+        prefixed with roles_str), predicted in batches - across worker
+        processes on CPU - and their clusters are mapped to offsets in the
+        joined text and merged.
+        
+        Args:
+            texts: Pair texts in order
+            roles_str: Character list sentence
+            
+        Returns:
+            Coreference result with .text and get_clusters()
+        """
+        full_text = f"{roles_str} {' '.join(texts)}"
+        if self.coref_mode == 'full':
+            return self.coref_model.predict(texts=[full_text])[0]
+        
+        prefix_len = len(roles_str) + 1
+        lengths = [len(t) for t in texts]
+        starts, _ = pair_offsets(texts, prefix_len)
+        bounds = window_bounds(lengths, self.window_chars, self.window_overlap)
+        windows = [f"{roles_str} {' '.join(texts[a:b])}" for a, b in bounds]
+        
+        n_jobs = self.n_jobs or os.cpu_count() or 1
+        n_jobs = min(n_jobs, len(windows))
+        print(f"  {len(windows)} windows over {len(texts)} pairs ({n_jobs} worker(s))")
+        if n_jobs > 1 and not str(self.device).startswith('cuda'):
+            chunks = [windows[k::n_jobs] for k in range(n_jobs)]
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_coref_worker,
+                                     initargs=(self.device,)) as executor:
+                chunk_clusters = list(executor.map(_predict_clusters, chunks))
+            local = [None] * len(windows)
+            for k, clusters in enumerate(chunk_clusters):
+                local[k::n_jobs] = clusters
+        else:
+            preds = self.coref_model.predict(texts=windows)
+            local = [[[tuple(span) for span in c] for c in p.get_clusters(as_strings=False)] for p in preds]
+        
+        # Window offsets past the prefix shift to where the window's first pair starts
+        window_clusters = []
+        for (a, _), clusters in zip(bounds, local):
+            shift = int(starts[a]) - prefix_len
+            window_clusters.append([
+                [(s, e) if s < prefix_len else (s + shift, e + shift) for s, e in cluster]
+                for cluster in clusters
+            ])
+        return MergedCoref(full_text, merge_window_clusters(window_clusters))
+    
     def _build_synonym(
         self,
         coref_data,
-        source_idx: List[int],
+        pair_starts: np.ndarray,
+        pair_ends: np.ndarray,
         role_names: List[str],
         drop_pronouns: bool = True
     ) -> tuple:
-        """Extract clusters containing character names."""
+        """
+        Extract clusters containing character names, per pair row.
+        
+        Mentions are assigned to pair rows through the pair offset table
+        (see pair_offsets/mention_rows).
+        """
         coref_text = coref_data.text
-        total_rows = int(np.max(source_idx) + 1)
+        total_rows = len(pair_starts)
         synonym_rows = {idx: [] for idx in range(total_rows)}
         synonym_rows_cid = {idx: [] for idx in range(total_rows)}
         synonym_rows_origin = {idx: [] for idx in range(total_rows)}
@@ -104,7 +456,7 @@ class CRITICEvaluator(BaseEvaluator):
                     continue
                 
                 cluster_name = list(match_role_set)[0]
-                cluster_source_idx = [source_idx[x[0]:x[1]] for x in cluster]
+                cluster_rows = mention_rows([(x[0], x[1]) for x in cluster], pair_starts, pair_ends)
                 
                 if len(cluster_name.split()) > 1:
                     cluster_str.extend([
@@ -118,14 +470,12 @@ class CRITICEvaluator(BaseEvaluator):
                     synonym_set = [i for i in synonym_set if i.lower() not in 
                                    ['she', 'he', 'her', 'his', 'they', 'him']]
                 
-                for item, text in zip(cluster_source_idx, cluster_str_origin):
-                    if np.mean(item) != np.max(item):
-                        continue
-                    if item[0] != -1:
-                        if cluster_name not in synonym_rows_cid[int(item[0])]:
-                            synonym_rows[int(item[0])].append(synonym_set)
-                            synonym_rows_cid[int(item[0])].append(cluster_name)
-                            synonym_rows_origin[int(item[0])].append(text)
+                for row, text in zip(cluster_rows.tolist(), cluster_str_origin):
+                    if row != -1:
+                        if cluster_name not in synonym_rows_cid[row]:
+                            synonym_rows[row].append(synonym_set)
+                            synonym_rows_cid[row].append(cluster_name)
+                            synonym_rows_origin[row].append(text)
         
         return synonym_rows, synonym_rows_origin, synonym_rows_cid
     
@@ -147,21 +497,30 @@ class CRITICEvaluator(BaseEvaluator):
         """
         Evaluate a single pair using CRITIC.
         
-        Note: For efficiency, use evaluate_batch() instead.
+        Both texts go through the shared micro-batching queue, so concurrent
+        calls are predicted together. For whole films, use evaluate_batch().
         """
-        # This is a simplified version - full CRITIC requires batch processing
-        self._init_coref_model()
-        
-        roles_str = ""
-        if len(self.characters) > 1:
-            roles_str = ', '.join(self.characters[:-1]) + ' and '
-        if len(self.characters) > 0:
-            roles_str += self.characters[-1] + '.'
-        
-        # Predict coreference
-        ref_pred = self.coref_model.predict(texts=[f"{roles_str} {ref_text}"])[0]
-        gen_pred = self.coref_model.predict(texts=[f"{roles_str} {gen_text}"])[0]
+        return self.evaluate_pairs([(gen_text, ref_text)])[0]
+    
+    def evaluate_pairs(self, pairs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Evaluate (gen_text, ref_text) pairs independently, batching coreference.
         
+        Args:
+            pairs: (generated, reference) text pairs
+            
+        Returns:
+            One result dict per pair, in input order
+        """
+        roles_str = self.roles_str
+        texts = []
+        for gen_text, ref_text in pairs:
+            texts.extend([f"{roles_str} {ref_text}", f"{roles_str} {gen_text}"])
+        preds = self.batcher.predict(texts)
+        return [self._pair_result(preds[2 * k], preds[2 * k + 1]) for k in range(len(pairs))]
+    
+    def _pair_result(self, ref_pred: Any, gen_pred: Any) -> Dict[str, Any]:
+        """Character sets and IoU from the coreference results of one pair."""
         # Extract character mentions (simplified)
         ref_chars = set()
         gen_chars = set()
@@ -208,50 +567,41 @@ class CRITICEvaluator(BaseEvaluator):
             )
         
         # Prepare character list string
-        roles_str = ""
-        if len(self.characters) > 1:
-            roles_str = ', '.join(self.characters[:-1]) + ' and '
-        if len(self.characters) > 0:
-            roles_str += self.characters[-1] + '.'
+        roles_str = self.roles_str
         
         # Prepare texts
         ref_texts = [p.combined_ref_text for p in pairs_to_eval]
         gen_texts = [p.combined_gen_text for p in pairs_to_eval]
         
-        # Build source indices for batch processing
-        ref_text_combined = ' '.join(ref_texts)
-        gen_text_combined = ' '.join(gen_texts)
-        
-        ref_source_idx_list = [[i]*len(x) for i, x in enumerate(ref_texts)]
-        gen_source_idx_list = [[i]*len(x) for i, x in enumerate(gen_texts)]
+        # Character range of each pair in the joined texts
+        ref_starts, ref_ends = pair_offsets(ref_texts, len(roles_str) + 1)
+        gen_starts, gen_ends = pair_offsets(gen_texts, len(roles_str) + 1)
         
-        ref_source_idx = []
-        for i, item in enumerate(ref_source_idx_list):
-            if i != 0:
-                item = [-1] + item
-            ref_source_idx.extend(item)
+        # Run coreference (the reference side is reused from the cache when possible)
+        ref_cached, ref_key = None, None
+        if self.ref_cache is not None:
+            ref_key = self.ref_cache.coref_key(ref_texts, roles_str, self.coref_settings)
+            ref_cached = self.ref_cache.get('coref', ref_key)
         
-        gen_source_idx = []
-        for i, item in enumerate(gen_source_idx_list):
-            if i != 0:
-                item = [-1] + item
-            gen_source_idx.extend(item)
-        
-        # Add prefix for character list
-        ref_source_idx = [-1] * (len(roles_str) + 1) + ref_source_idx
-        gen_source_idx = [-1] * (len(roles_str) + 1) + gen_source_idx
-        
-        # Run coreference
-        print("Running coreference analysis on reference texts...")
-        ref_coref = self.coref_model.predict(texts=[f"{roles_str} {ref_text_combined}"])[0]
+        if ref_cached is not None:
+            print("Using cached coreference for reference texts...")
+            ref_cids = {int(row): chars for row, chars in ref_cached['characters'].items()}
+        else:
+            print("Running coreference analysis on reference texts...")
+            ref_coref = self._predict_joined(ref_texts, roles_str)
+            ref_synonyms, ref_origins, ref_cids = self._build_synonym(ref_coref, ref_starts, ref_ends, self.characters)
+            if self.ref_cache is not None:
+                self.ref_cache.put('coref', ref_key, {
+                    'clusters': [[list(span) for span in c] for c in ref_coref.get_clusters(as_strings=False)],
+                    'characters': {str(row): chars for row, chars in ref_cids.items() if chars},
+                })
         
         print("Running coreference analysis on generated texts...")
-        gen_coref = self.coref_model.predict(texts=[f"{roles_str} {gen_text_combined}"])[0]
+        gen_coref = self._predict_joined(gen_texts, roles_str)
         
         # Build synonym sets
         print("Building synonym sets...")
-        ref_synonyms, ref_origins, ref_cids = self._build_synonym(ref_coref, ref_source_idx, self.characters)
-        gen_synonyms, gen_origins, gen_cids = self._build_synonym(gen_coref, gen_source_idx, self.characters)
+        gen_synonyms, gen_origins, gen_cids = self._build_synonym(gen_coref, gen_starts, gen_ends, self.characters)
         
         # Compute IoU for each pair
         print("Computing character IoU for each pair...")
@@ -0,0 +1,144 @@
+"""
+Persistent cache for the reference side of CRITIC.
+
+The reference AD of a film is the same for every system evaluated against
+it, so its character list and coreference only need to be computed once.
+
+Layout:
+    <cache_dir>/characters/<key>.json  - character list extracted from a reference CSV
+    <cache_dir>/coref/<key>.json       - reference coreference clusters and per-pair character sets
+
+Character lists are keyed by the SHA-1 of the reference file and the
+extraction settings (including the spaCy version). Coreference entries are
+keyed by the reference pair texts themselves, the character list and the
+coreference model version and mode, since the pair texts also depend on how
+the generated AD was matched.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from importlib import metadata
+from typing import Any, Dict, List, Optional
+
+from ..utils import extract_characters_from_csv
+
+
+# Bump when the stored format or the extraction/coreference logic changes
+CACHE_VERSION = 1
+
+
+def file_hash(path: str) -> str:
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def package_version(name: str) -> str:
+    """Installed version of a package, or 'none' if it is not installed."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'none'
+
+
+def _key(*parts: Any) -> str:
+    return hashlib.sha1(json.dumps([CACHE_VERSION, *parts], ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class CRITICCache:
+    """
+    JSON store for reference character lists and coreference results.
+    
+    Entries are written to a temporary file and renamed into place, so
+    concurrent evaluations never read partial entries.
+    """
+    
+    def __init__(self, cache_dir: str):
+        """
+        Initialize CRITICCache.
+        
+        Args:
+            cache_dir: Root directory of the cache (created on first write)
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+    
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, kind, f"{key}.json")
+    
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """Stored value, or None if missing or unreadable."""
+        try:
+            with open(self._path(kind, key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, kind: str, key: str, value: Any) -> None:
+        """Store a JSON-serializable value."""
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    @staticmethod
+    def characters_key(csv_path: str, min_count: int, use_spacy: bool) -> str:
+        """Key of the character list extracted from a reference CSV."""
+        return _key('characters', file_hash(csv_path), min_count, use_spacy,
+                    [package_version('spacy'), package_version('en_core_web_sm')] if use_spacy else None)
+    
+    @staticmethod
+    def coref_key(ref_texts: List[str], roles_str: str, settings: Dict[str, Any]) -> str:
+        """
+        Key of the reference coreference for one set of pair texts.
+        
+        Args:
+            ref_texts: Reference text of each pair, in order
+            roles_str: Character list sentence prepended to the texts
+            settings: Coreference model version and mode
+        """
+        texts_digest = hashlib.sha1('\x1e'.join(ref_texts).encode('utf-8')).hexdigest()
+        return _key('coref', texts_digest, len(ref_texts), roles_str, settings)
+
+
+def cached_characters_from_csv(
+    csv_path: str,
+    cache_dir: Optional[str] = None,
+    min_count: int = 2,
+    use_spacy: bool = True
+) -> List[str]:
+    """
+    extract_characters_from_csv, reusing a cached result for the same file.
+    
+    Args:
+        csv_path: Path to reference AD CSV file
+        cache_dir: CRITIC cache directory (None = no caching)
+        min_count: Minimum occurrences to include
+        use_spacy: Use spaCy NER if available
+        
+    Returns:
+        List of character names
+    """
+    if cache_dir is None:
+        return extract_characters_from_csv(csv_path, min_count=min_count, use_spacy=use_spacy)
+    
+    cache = CRITICCache(cache_dir)
+    key = cache.characters_key(csv_path, min_count, use_spacy)
+    characters = cache.get('characters', key)
+    if characters is None:
+        characters = extract_characters_from_csv(csv_path, min_count=min_count, use_spacy=use_spacy)
+        cache.put('characters', key, characters)
+    else:
+        print("  Using cached character list")
+    return characters
@@ -2,20 +2,34 @@
 METEOR evaluator for Audio Description quality assessment.
 
 METEOR considers synonyms, stemming, and word order for text comparison.
+
+Scores come from NLTK's meteor_score, given a memoizing stemmer and WordNet
+reader: every word is stemmed and looked up in WordNet once per process
+instead of once per pair, and each text is tokenized once. Large batches
+are split across worker processes.
 """
 
-from typing import Dict, Any, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
 
-from .base import BaseEvaluator
+from .base import BaseEvaluator, EvaluationResult
+from ..utils import MatchedPair
 
 # Optional imports
 try:
     import nltk
+    from nltk.corpus import wordnet
+    from nltk.stem.api import StemmerI
+    from nltk.stem.porter import PorterStemmer
     from nltk.translate.meteor_score import meteor_score
     from nltk.tokenize import word_tokenize
     NLTK_AVAILABLE = True
 except ImportError:
     NLTK_AVAILABLE = False
+    StemmerI = object
 
 
 def ensure_nltk_data():
@@ -35,6 +49,162 @@ def ensure_nltk_data():
             nltk.download(item, quiet=True)
 
 
+# ============================================================
+# Memoized Stemming and WordNet
+# ============================================================
+
+class CachedStemmer(StemmerI):
+    """Porter stemmer that remembers the stem of every word it has seen."""
+    
+    def __init__(self):
+        self._stemmer = PorterStemmer()
+        self._stems: Dict[str, str] = {}
+    
+    def stem(self, token: str) -> str:
+        stem = self._stems.get(token)
+        if stem is None:
+            stem = self._stems[token] = self._stemmer.stem(token)
+        return stem
+
+
+class _Lemma:
+    """Stand-in for a WordNet lemma; meteor_score only calls name()."""
+    
+    __slots__ = ('_name',)
+    
+    def __init__(self, name: str):
+        self._name = name
+    
+    def name(self) -> str:
+        return self._name
+
+
+class _SynonymSet:
+    """Stand-in for a WordNet synset holding a word's precomputed synonyms."""
+    
+    __slots__ = ('_lemmas',)
+    
+    def __init__(self, names: List[str]):
+        self._lemmas = [_Lemma(name) for name in names]
+    
+    def lemmas(self) -> List[_Lemma]:
+        return self._lemmas
+
+
+class CachedWordNet:
+    """
+    WordNet reader that remembers the synonyms of every word it has seen.
+    
+    meteor_score only calls wordnet.synsets(word) and reads the name() of
+    each synset's lemmas, keeping names without '_'. This wrapper builds
+    that synonym set once per word and returns it as a single stand-in
+    synset, so passing it as meteor_score's wordnet argument yields the
+    same synonym sets (and scores) without walking every synset's lemmas
+    for each pair.
+    """
+    
+    def __init__(self, reader: Any = None):
+        self._reader = reader if reader is not None else wordnet
+        self._synsets: Dict[str, List[_SynonymSet]] = {}
+    
+    def ensure_loaded(self) -> None:
+        """Load the WordNet corpus now rather than on the first lookup."""
+        self._reader.ensure_loaded()
+    
+    def synonyms(self, word: str) -> List[str]:
+        """WordNet lemma names of word without '_', each once."""
+        names = (lemma.name() for synset in self._reader.synsets(word) for lemma in synset.lemmas())
+        return list(dict.fromkeys(name for name in names if name.find('_') < 0))
+    
+    def synsets(self, word: str) -> List[_SynonymSet]:
+        synsets = self._synsets.get(word)
+        if synsets is None:
+            synsets = self._synsets[word] = [_SynonymSet(self.synonyms(word))]
+        return synsets
+
+
+# Per-process caches shared by every evaluator (and rebuilt in each worker)
+_STEMMER: Optional[CachedStemmer] = None
+_WORDNET: Optional[CachedWordNet] = None
+
+
+def _get_lexicon() -> Tuple[CachedStemmer, CachedWordNet]:
+    """Return this process's cached stemmer and WordNet reader."""
+    global _STEMMER, _WORDNET
+    if _STEMMER is None:
+        _STEMMER = CachedStemmer()
+        _WORDNET = CachedWordNet()
+    return _STEMMER, _WORDNET
+
+
+# Pairs scored between progress bar updates when running in this process
+_PROGRESS_CHUNK = 64
+
+
+def meteor_score_pair(
+    gen_text: str,
+    ref_text: str,
+    tokens: Optional[Dict[str, List[str]]] = None,
+) -> float:
+    """
+    METEOR score of one pair using this process's cached stemmer and WordNet.
+    
+    NLTK's default alpha, beta and gamma are used, as the evaluator always has.
+    
+    Args:
+        gen_text: Generated AD text
+        ref_text: Reference AD text
+        tokens: Tokenization cache (text -> tokens), filled as texts are seen
+        
+    Returns:
+        METEOR score
+    """
+    stemmer, wordnet_cache = _get_lexicon()
+    tokens = tokens if tokens is not None else {}
+    for text in (gen_text, ref_text):
+        if text not in tokens:
+            tokens[text] = word_tokenize(text.lower())
+    # METEOR expects reference as list of tokens
+    return float(meteor_score([tokens[ref_text]], tokens[gen_text], stemmer=stemmer, wordnet=wordnet_cache))
+
+
+def meteor_scores(
+    pairs: List[Tuple[str, str]],
+    tokens: Optional[Dict[str, List[str]]] = None,
+) -> List[Tuple[Optional[float], Optional[str]]]:
+    """
+    METEOR scores of (gen_text, ref_text) pairs.
+    
+    A pair that fails does not stop the others: like
+    BaseEvaluator.evaluate_batch, it gets no score and its error message.
+    
+    Args:
+        pairs: (generated, reference) text pairs
+        tokens: Tokenization cache (text -> tokens), filled as texts are seen
+        
+    Returns:
+        (score, None) or (None, error message) per pair, in pair order
+    """
+    tokens = tokens if tokens is not None else {}
+    
+    results = []
+    for gen_text, ref_text in pairs:
+        try:
+            results.append((meteor_score_pair(gen_text, ref_text, tokens), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+def _meteor_chunk(pairs: List[Tuple[str, str]]) -> List[Tuple[Optional[float], Optional[str]]]:
+    """Score one chunk of pairs in a worker process."""
+    return meteor_scores(pairs)
+
+
+# ============================================================
+# METEOR Evaluator
+# ============================================================
+
 class METEOREvaluator(BaseEvaluator):
     """
     METEOR evaluator for text matching with synonym/stemming support.
@@ -47,6 +217,7 @@ class METEOREvaluator(BaseEvaluator):
         alpha: float = 0.9,
         beta: float = 3.0,
         gamma: float = 0.5,
+        n_jobs: int = 1,
         config: Any = None,
     ):
         """
@@ -56,6 +227,7 @@ class METEOREvaluator(BaseEvaluator):
             alpha: Weight parameter for precision
             beta: Weight parameter for recall
             gamma: Fragmentation penalty parameter
+            n_jobs: Worker processes for evaluate_batch (None = all cores)
             config: Optional METEORConfig object
         """
         super().__init__(config)
@@ -64,10 +236,13 @@ class METEOREvaluator(BaseEvaluator):
             raise ImportError("nltk is required. Install with: pip install nltk")
         
         ensure_nltk_data()
+        _get_lexicon()[1].ensure_loaded()
         
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
+        self.n_jobs = n_jobs
+        self._tokens: Dict[str, List[str]] = {}
     
     @property
     def metric_name(self) -> str:
@@ -80,11 +255,58 @@ class METEOREvaluator(BaseEvaluator):
         **kwargs
     ) -> Dict[str, Any]:
         """Evaluate a single pair using METEOR."""
-        # Tokenize
-        ref_tokens = word_tokenize(ref_text.lower())
-        gen_tokens = word_tokenize(gen_text.lower())
+        score = meteor_score_pair(gen_text, ref_text, self._tokens)
         
-        # METEOR expects reference as list of tokens
-        score = meteor_score([ref_tokens], gen_tokens)
+        return {'score': score}
+    
+    def evaluate_batch(
+        self,
+        matched_pairs: List[MatchedPair],
+        show_progress: bool = True
+    ) -> EvaluationResult:
+        """
+        Evaluate all matched pairs, in worker processes when n_jobs > 1.
+        
+        Pairs are split into contiguous chunks; scores are identical to
+        evaluating each pair with evaluate_pair. As in BaseEvaluator, a pair
+        that fails is recorded with score None and its error.
+        """
+        from tqdm import tqdm
+        
+        pairs_to_eval = [p for p in matched_pairs if p.matched]
+        texts = [(p.combined_gen_text, p.combined_ref_text) for p in pairs_to_eval]
+        
+        n_jobs = self.n_jobs or os.cpu_count() or 1
+        outcomes = []
+        with tqdm(total=len(texts), desc=f"Evaluating {self.metric_name}", disable=not show_progress) as progress:
+            if n_jobs > 1 and len(texts) > 1:
+                n_chunks = min(len(texts), n_jobs * 4)
+                bounds = np.linspace(0, len(texts), n_chunks + 1).astype(int)
+                chunks = [texts[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    for chunk in executor.map(_meteor_chunk, chunks):
+                        outcomes.extend(chunk)
+                        progress.update(len(chunk))
+            else:
+                for a in range(0, len(texts), _PROGRESS_CHUNK):
+                    chunk = meteor_scores(texts[a:a + _PROGRESS_CHUNK], self._tokens)
+                    outcomes.extend(chunk)
+                    progress.update(len(chunk))
+        
+        results = []
+        scores = []
+        for pair, (score, error) in zip(pairs_to_eval, outcomes):
+            pair_result = pair.to_dict()
+            pair_result['score'] = score
+            if error is not None:
+                print(f"Error evaluating pair: {error}")
+                pair_result['error'] = error
+            else:
+                scores.append(score)
+            results.append(pair_result)
         
-        return {'score': float(score)}
+        return EvaluationResult(
+            pairs=results,
+            statistics=self._calculate_statistics(scores, matched_pairs),
+            metric_name=self.metric_name,
+        )
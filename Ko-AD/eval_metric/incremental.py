@@ -0,0 +1,546 @@
+"""
+Incremental re-matching after small edits to the generated AD.
+
+An editor changing one generated line should not re-match the whole film.
+IncrementalMatcher keeps a MatchState (events, pairs, coverage and per-pair
+time spans) and applies an EventEdit by recomputing only what it can affect:
+
+- ClusterMatcher: only clusters containing removed events or touching new
+  events, plus every pair overlapping those, are re-clustered; the result is
+  identical to a full run.
+- OverlapMatcher: only pairs of removed and new generated events change;
+  the result is identical to a full run.
+- DPMatcher: the state keeps rows of the forward DP table (best score of
+  each prefix pair) and of the backward table (best score of each suffix
+  pair). An edit only changes the rows of the replaced events, so those rows
+  are refilled from the unchanged prefix and suffix rows on either side and
+  the best crossing column gives the optimal alignment, as a full run would
+  (alignments of equal score may differ). Prefix and suffix rows are filled
+  lazily, so a series of edits in one region stays cheap. Banded matchers are
+  re-matched in full (their alignment is already linear in the number of
+  events).
+
+Reference events never change, so every pair keeps its reference positions in
+state.ref_events and coverage is updated from per-pair counts.
+"""
+
+import bisect
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Tuple, Optional, Dict, Any
+
+from .utils import ADEvent, EventTable, MatchedPair, get_time_range
+from .matchers import BaseMatcher, ClusterMatcher, OverlapMatcher, DPMatcher
+
+
+@dataclass
+class EventEdit:
+    """
+    Replace the generated events that start within [start, end] with events.
+    
+    Insert: a range with no existing events. Delete: no new events.
+    Modify: both. New events with index < 0 get the next unused index.
+    """
+    start: float
+    end: float
+    events: List[ADEvent] = field(default_factory=list)
+
+
+@dataclass
+class MatchState:
+    """Matching result plus the bookkeeping needed to update it incrementally."""
+    gen_events: List[ADEvent]
+    ref_events: List[ADEvent]
+    pairs: List[MatchedPair]
+    coverage: Dict[str, Any]
+    span_lo: np.ndarray   # per pair: earliest start of its events
+    span_hi: np.ndarray   # per pair: latest end of its events
+    start_hi: np.ndarray  # per pair: latest start of its events
+    sort_key: np.ndarray  # per pair: (time, 0 = has generated / 1 = reference only)
+    gen_hits: np.ndarray  # per pair: generated events counted as matched
+    ref_hits: np.ndarray  # per reference event: matched pairs containing it
+    next_index: int
+    dp_tables: Optional[Tuple['DPTable', 'DPTable']] = None  # DPMatcher (full table): forward, backward
+
+
+class DPTable:
+    """
+    Rows of a full-table DPMatcher alignment, filled on demand.
+    
+    scores[i] and moves[i] are row i (i generated events consumed) of the
+    score and backtrace tables DPMatcher._dp_fill_table builds for the same
+    events. Built over both event lists reversed, row k holds the backward
+    scores of the last k generated events, with columns reversed. Row lists
+    are copied, not the rows, so states produced by edits share their rows.
+    """
+    
+    def __init__(
+        self,
+        matcher: DPMatcher,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent],
+        scores: Optional[List[np.ndarray]] = None,
+        moves: Optional[List[np.ndarray]] = None
+    ):
+        """
+        Initialize DPTable.
+        
+        Args:
+            matcher: DPMatcher whose similarities and gap penalties fill the rows
+            gen_events: Generated AD events (table rows)
+            ref_events: Reference AD events (table columns)
+            scores: Score rows already known for these events (rows 0..k)
+            moves: Backtrace rows matching scores
+        """
+        self.matcher = matcher
+        self.gen_events = gen_events
+        self.ref_events = ref_events
+        self.scores: List[np.ndarray] = list(scores or [])
+        self.moves: List[np.ndarray] = list(moves or [])
+    
+    def __len__(self) -> int:
+        return len(self.scores)
+    
+    def extend(self, last_row: int) -> Optional[np.ndarray]:
+        """
+        Fill rows up to last_row (inclusive) if they are not known yet.
+        
+        Returns:
+            Similarity matrix of the generated events of the new rows against
+            all reference events, or None if nothing was filled
+        """
+        first = len(self.scores)
+        if last_row < first:
+            return None
+        
+        if first == 0:
+            sim = self.matcher._build_similarity_matrix(self.gen_events[:last_row], self.ref_events)
+            dp, bt = self.matcher._dp_fill_table(sim)
+            self.scores.extend(dp)
+            self.moves.extend(bt)
+        else:
+            sim = self.matcher._build_similarity_matrix(self.gen_events[first - 1:last_row], self.ref_events)
+            dp, bt = self.matcher._dp_fill_table(sim, first_row=self.scores[-1])
+            self.scores.extend(dp[1:])
+            self.moves.extend(bt[1:])
+        return sim
+
+
+def _pair_arrays(pairs: List[MatchedPair]) -> Tuple[np.ndarray, ...]:
+    """Compute MatchState's per-pair arrays for a list of pairs."""
+    n = len(pairs)
+    span_lo = np.empty(n)
+    span_hi = np.empty(n)
+    start_hi = np.empty(n)
+    sort_key = np.empty((n, 2))
+    gen_hits = np.zeros(n, dtype=np.int64)
+    
+    for k, pair in enumerate(pairs):
+        events = pair.gen_events + pair.ref_events
+        starts = [e.start for e in events]
+        span_lo[k] = min(starts)
+        span_hi[k] = max(e.end for e in events)
+        start_hi[k] = max(starts)
+        gen_start = pair.gen_start
+        sort_key[k] = (gen_start, 0) if gen_start is not None else (pair.ref_start, 1)
+        if pair.matched:
+            gen_hits[k] = pair.num_gen_items
+    
+    return span_lo, span_hi, start_hi, sort_key, gen_hits
+
+
+class IncrementalMatcher:
+    """
+    Incremental wrapper around ClusterMatcher, OverlapMatcher or DPMatcher.
+    
+    Usage:
+        inc = IncrementalMatcher(get_matcher('cluster'))
+        state = inc.start(gen_events, ref_events)
+        state = inc.apply(state, EventEdit(start=61.0, end=63.0, events=[new_event]))
+        state.pairs, state.coverage
+        
+    apply() returns a new state and leaves the previous one usable (e.g. for undo).
+    """
+    
+    def __init__(self, matcher: BaseMatcher):
+        """
+        Initialize IncrementalMatcher.
+        
+        Args:
+            matcher: ClusterMatcher, OverlapMatcher or DPMatcher instance
+        """
+        # Exact types: DPMatcher subclasses (anchored, assignment) align differently
+        if type(matcher) not in (ClusterMatcher, OverlapMatcher, DPMatcher):
+            raise ValueError(f"Incremental matching is not supported for matcher: {matcher.name}")
+        self.matcher = matcher
+    
+    # ------------------------------------------------------------
+    # State construction
+    # ------------------------------------------------------------
+    
+    def _build_state(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent],
+        pairs: List[MatchedPair],
+        arrays: Tuple[np.ndarray, ...],
+        ref_hits: np.ndarray,
+        next_index: int,
+        dp_tables: Optional[Tuple[DPTable, DPTable]] = None
+    ) -> MatchState:
+        """Assemble a MatchState and its coverage statistics."""
+        span_lo, span_hi, start_hi, sort_key, gen_hits = arrays
+        gen_time_range = get_time_range(gen_events)
+        gen_total = len(gen_events)
+        gen_matched = int(gen_hits.sum())
+        ref_total = len(ref_events)
+        ref_matched = int(np.count_nonzero(ref_hits))
+        
+        coverage = {
+            'gen_time_start': gen_time_range[0],
+            'gen_time_end': gen_time_range[1],
+            'gen_total': gen_total,
+            'gen_matched': gen_matched,
+            'gen_unmatched': gen_total - gen_matched,
+            'gen_coverage_pct': (gen_matched / gen_total * 100) if gen_total > 0 else 0.0,
+            'ref_in_range': ref_total,
+            'ref_matched': ref_matched,
+            'ref_unmatched': ref_total - ref_matched,
+            'ref_coverage_pct': (ref_matched / ref_total * 100) if ref_total > 0 else 0.0,
+        }
+        
+        return MatchState(
+            gen_events=gen_events,
+            ref_events=ref_events,
+            pairs=pairs,
+            coverage=coverage,
+            span_lo=span_lo,
+            span_hi=span_hi,
+            start_hi=start_hi,
+            sort_key=sort_key,
+            gen_hits=gen_hits,
+            ref_hits=ref_hits,
+            next_index=next_index,
+            dp_tables=dp_tables,
+        )
+    
+    def _full_state(self, gen_events: List[ADEvent], ref_events: List[ADEvent], next_index: int) -> MatchState:
+        """Match from scratch (keeping the DP table rows when DP is incremental)."""
+        dp_tables = None
+        if type(self.matcher) is DPMatcher and not self.matcher.banded and gen_events and ref_events:
+            # Same fill and backtrack as DPMatcher.match, keeping the table;
+            # backward rows are only filled once an edit needs them
+            forward = DPTable(self.matcher, gen_events, ref_events)
+            sim = forward.extend(len(gen_events))
+            alignment = self.matcher._dp_backtrack(sim, np.stack(forward.moves))
+            pairs = self.matcher._alignment_to_pairs(gen_events, ref_events, alignment)
+            dp_tables = (forward, DPTable(self.matcher, gen_events[::-1], ref_events[::-1]))
+        else:
+            pairs = self.matcher.match(gen_events, ref_events)
+        
+        ref_hits = np.zeros(len(ref_events), dtype=np.int64)
+        for pair in pairs:
+            if pair.matched:
+                np.add.at(ref_hits, pair.ref_positions, 1)
+        return self._build_state(gen_events, ref_events, pairs, _pair_arrays(pairs), ref_hits, next_index, dp_tables)
+    
+    def start(self, gen_events: List[ADEvent], ref_events: List[ADEvent]) -> MatchState:
+        """
+        Run a full match and return its state.
+        
+        Args:
+            gen_events: Generated AD events sorted by start time
+            ref_events: Reference AD events sorted by start time
+            
+        Returns:
+            MatchState for subsequent apply() calls
+        """
+        # Edits are located by object identity, so work on stable ADEvent objects
+        gen_events = gen_events.to_events() if isinstance(gen_events, EventTable) else list(gen_events)
+        ref_events = ref_events.to_events() if isinstance(ref_events, EventTable) else list(ref_events)
+        
+        next_index = max((e.index for e in gen_events), default=-1) + 1
+        return self._full_state(gen_events, ref_events, next_index)
+    
+    # ------------------------------------------------------------
+    # Edits
+    # ------------------------------------------------------------
+    
+    def apply(self, state: MatchState, edit: EventEdit) -> MatchState:
+        """
+        Apply one edit to the generated events and update the match.
+        
+        Args:
+            state: State from start() or a previous apply()
+            edit: The edit to apply
+            
+        Returns:
+            New MatchState with updated pairs and coverage
+        """
+        # Assign indices to new events
+        next_index = state.next_index
+        new_events = []
+        for e in sorted(edit.events, key=lambda e: e.start):
+            if e.index < 0:
+                e = ADEvent(start=e.start, end=e.end, text=e.text, index=next_index)
+                next_index += 1
+            else:
+                next_index = max(next_index, e.index + 1)
+            new_events.append(e)
+        
+        # New generated list: drop events starting in the range, insert new ones in start order
+        gen_starts = [e.start for e in state.gen_events]
+        lo = bisect.bisect_left(gen_starts, edit.start)
+        hi = bisect.bisect_right(gen_starts, edit.end)
+        removed = state.gen_events[lo:hi]
+        gen_events = state.gen_events[:lo] + state.gen_events[hi:]
+        for e in new_events:
+            bisect.insort_right(gen_events, e, key=lambda x: x.start)
+        
+        if not removed and not new_events:
+            return state
+        
+        if type(self.matcher) is DPMatcher:
+            result = self._apply_dp(state, gen_events)
+        elif type(self.matcher) is ClusterMatcher:
+            result = self._apply_cluster(state, gen_events, removed, new_events)
+        else:
+            result = self._apply_overlap(state, removed, new_events)
+        
+        if result is None:
+            # Cannot be localized: fall back to a full match
+            return self._full_state(gen_events, state.ref_events, next_index)
+        
+        pairs, arrays, ref_hits = result[:3]
+        dp_tables = result[3] if type(self.matcher) is DPMatcher else None
+        return self._build_state(gen_events, state.ref_events, pairs, arrays, ref_hits, next_index, dp_tables)
+    
+    def _replace_pairs(
+        self,
+        state: MatchState,
+        drop: np.ndarray,
+        new_pairs: List[MatchedPair],
+        insert_at: Optional[int] = None
+    ) -> Tuple[List[MatchedPair], Tuple[np.ndarray, ...], np.ndarray]:
+        """
+        Remove the pairs flagged in drop and add new_pairs.
+        
+        With insert_at, new_pairs are spliced at that position (drop must be a
+        contiguous run starting there); otherwise all pairs are re-sorted by
+        sort_key, as ClusterMatcher and OverlapMatcher order them.
+        """
+        ref_hits = state.ref_hits.copy()
+        for k in np.flatnonzero(drop):
+            pair = state.pairs[k]
+            if pair.matched:
+                np.subtract.at(ref_hits, pair.ref_positions, 1)
+        for pair in new_pairs:
+            if pair.matched:
+                np.add.at(ref_hits, pair.ref_positions, 1)
+        
+        keep = np.flatnonzero(~drop)
+        old_arrays = (state.span_lo, state.span_hi, state.start_hi, state.sort_key, state.gen_hits)
+        new_arrays = _pair_arrays(new_pairs)
+        
+        if insert_at is not None:
+            before, after = keep[keep < insert_at], keep[keep >= insert_at]
+            pairs = [state.pairs[k] for k in before] + new_pairs + [state.pairs[k] for k in after]
+            arrays = tuple(
+                np.concatenate([old[before], new, old[after]])
+                for old, new in zip(old_arrays, new_arrays)
+            )
+            return pairs, arrays, ref_hits
+        
+        pairs = [state.pairs[k] for k in keep] + new_pairs
+        arrays = tuple(np.concatenate([old[keep], new]) for old, new in zip(old_arrays, new_arrays))
+        sort_key = arrays[3]
+        order = np.lexsort((sort_key[:, 1], sort_key[:, 0]))
+        pairs = [pairs[k] for k in order]
+        arrays = tuple(a[order] for a in arrays)
+        return pairs, arrays, ref_hits
+    
+    def _owning_pairs(self, state: MatchState, removed: List[ADEvent]) -> np.ndarray:
+        """Flag the pairs that contain any of the removed generated events."""
+        owners = np.zeros(len(state.pairs), dtype=bool)
+        removed_ids = {id(e) for e in removed}
+        for e in removed:
+            # A pair's span covers each of its events, so only these can own e
+            candidates = np.flatnonzero((state.span_lo <= e.start) & (state.span_hi >= e.end))
+            for k in candidates:
+                if any(id(g) in removed_ids for g in state.pairs[k].gen_events):
+                    owners[k] = True
+        return owners
+    
+    def _apply_cluster(self, state, gen_events, removed, new_events):
+        """Re-cluster only the clusters that the edit can change."""
+        if self.matcher.min_overlap_sec <= 0:
+            return None
+        
+        # Clusters holding removed events may split; clusters touching new events may merge
+        affected = self._owning_pairs(state, removed)
+        for e in new_events:
+            affected |= (state.span_lo <= e.end) & (state.span_hi >= e.start)
+        
+        # Unmatched clusters are stored as one pair per event, so pull in every pair
+        # overlapping an affected one until the set stops growing
+        frontier = affected
+        while frontier.any():
+            grown = affected.copy()
+            for k in np.flatnonzero(frontier):
+                grown |= (state.span_lo <= state.span_hi[k]) & (state.span_hi >= state.span_lo[k])
+            frontier = grown & ~affected
+            affected = grown
+        
+        removed_ids = {id(e) for e in removed}
+        sub_gen = list(new_events)
+        ref_positions = []
+        for k in np.flatnonzero(affected):
+            pair = state.pairs[k]
+            sub_gen.extend(g for g in pair.gen_events if id(g) not in removed_ids)
+            ref_positions.extend(pair.ref_positions)
+        # Keep the new list's order so events with equal starts sort as in a full run
+        position = {id(e): i for i, e in enumerate(gen_events)}
+        sub_gen.sort(key=lambda e: position[id(e)])
+        ref_positions.sort()
+        sub_ref = [state.ref_events[j] for j in ref_positions]
+        
+        new_pairs = [
+            MatchedPair(
+                gen_source=sub_gen,
+                ref_source=state.ref_events,
+                gen_positions=p.gen_positions,
+                ref_positions=[ref_positions[j] for j in p.ref_positions],
+                matched=p.matched,
+                match_type=p.match_type,
+                score=p.score,
+            )
+            for p in self.matcher.match(sub_gen, sub_ref)
+        ]
+        return self._replace_pairs(state, affected, new_pairs)
+    
+    def _apply_overlap(self, state, removed, new_events):
+        """Drop the pairs of removed events and match the new events."""
+        drop = self._owning_pairs(state, removed)
+        new_pairs = self.matcher.match(new_events, state.ref_events)
+        return self._replace_pairs(state, drop, new_pairs)
+    
+    def _apply_dp(self, state, gen_events):
+        """
+        Refill the DP rows of the replaced events and splice the best path.
+        
+        Rows of the forward table up to the common prefix of the old and new
+        event lists, and rows of the backward table over the common suffix,
+        do not change. The replaced rows are refilled in both directions
+        (the new backward rows serve later edits), the optimal path crosses
+        the row after them at the column maximizing forward + backward
+        score, and it is traced back and forth from there until it rejoins
+        the previous alignment.
+        """
+        if state.dp_tables is None or not gen_events:
+            return None
+        old_forward, old_backward = state.dp_tables
+        
+        old_gen, ref_events = state.gen_events, state.ref_events
+        n_old, n_new, m = len(old_gen), len(gen_events), len(ref_events)
+        
+        # Rows that depend only on the common prefix / suffix of the two event lists
+        prefix = 0
+        while prefix < min(n_old, n_new) and old_gen[prefix] is gen_events[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < min(n_old, n_new) - prefix and old_gen[n_old - 1 - suffix] is gen_events[n_new - 1 - suffix]:
+            suffix += 1
+        shift = n_new - n_old
+        
+        old_forward.extend(prefix)
+        old_backward.extend(suffix)
+        forward = DPTable(self.matcher, gen_events, ref_events,
+                          old_forward.scores[:prefix + 1], old_forward.moves[:prefix + 1])
+        backward = DPTable(self.matcher, gen_events[::-1], ref_events[::-1],
+                           old_backward.scores[:suffix + 1], old_backward.moves[:suffix + 1])
+        cross = n_new - suffix
+        sim = forward.extend(cross)
+        backward.extend(n_new - prefix)
+        
+        # Similarities of the refilled rows, keyed by generated position
+        sims = {} if sim is None else {prefix + k: sim[k] for k in range(len(sim))}
+        
+        total = forward.scores[cross] + backward.scores[suffix][::-1]
+        d = int(np.argmax(total))
+        
+        # Cells of the old path: path_i/path_j after each alignment entry; row i spans
+        # path indices row_first[i]..row_first[i + 1] - 1
+        path_i = np.zeros(len(state.pairs) + 1, dtype=np.int64)
+        path_j = np.zeros(len(state.pairs) + 1, dtype=np.int64)
+        path_i[1:] = np.cumsum([len(p.gen_events) for p in state.pairs])
+        path_j[1:] = np.cumsum([len(p.ref_events) for p in state.pairs])
+        row_first = np.searchsorted(path_i, np.arange(n_old + 2), side='left')
+        
+        def old_path_index(i_old: int, j: int) -> Optional[int]:
+            first, last = row_first[i_old], row_first[i_old + 1] - 1
+            if path_j[first] <= j <= path_j[last]:
+                return int(first + j - path_j[first])
+            return None
+        
+        # Back from the crossing until the path rejoins the old one in the prefix rows
+        head = []
+        i, j = cross, d
+        while True:
+            start_idx = old_path_index(i, j) if i <= prefix else None
+            if start_idx is not None:
+                break
+            move = forward.moves[i][j]
+            if i > 0 and j > 0 and move == 0:
+                head.append((i - 1, j - 1))
+                i, j = i - 1, j - 1
+            elif i > 0 and (j == 0 or move == 1):
+                head.append((i - 1, None))
+                i -= 1
+            else:
+                head.append((None, j - 1))
+                j -= 1
+        head.reverse()
+        
+        # Forward from the crossing (backward table moves, mirrored) until it rejoins in the suffix rows
+        tail = []
+        i, j = cross, d
+        while True:
+            end_idx = old_path_index(i - shift, j) if i >= cross else None
+            if end_idx is not None:
+                break
+            move = backward.moves[n_new - i][m - j]
+            if i < n_new and j < m and move == 0:
+                tail.append((i, j))
+                i, j = i + 1, j + 1
+            elif i < n_new and (j == m or move == 1):
+                tail.append((i, None))
+                i += 1
+            else:
+                tail.append((None, j))
+                j += 1
+        
+        # Scores as a full run reports them: similarities of matches, gap penalties otherwise
+        alignment = head + tail
+        outside = [(g, r) for g, r in alignment if g is not None and r is not None and g not in sims]
+        if outside:
+            g_lo = min(g for g, _ in outside)
+            r_lo = min(r for _, r in outside)
+            box = self.matcher._build_similarity_matrix(
+                gen_events[g_lo:max(g for g, _ in outside) + 1],
+                ref_events[r_lo:max(r for _, r in outside) + 1],
+            )
+        scored = []
+        for g, r in alignment:
+            if g is None:
+                scored.append((g, r, self.matcher.gap_penalty_ref))
+            elif r is None:
+                scored.append((g, r, self.matcher.gap_penalty_gen))
+            elif g in sims:
+                scored.append((g, r, sims[g][r]))
+            else:
+                scored.append((g, r, box[g - g_lo, r - r_lo]))
+        
+        new_pairs = self.matcher._alignment_to_pairs(gen_events, ref_events, scored)
+        drop = np.zeros(len(state.pairs), dtype=bool)
+        drop[start_idx:end_idx] = True
+        return self._replace_pairs(state, drop, new_pairs, insert_at=start_idx) + ((forward, backward),)
@@ -1,21 +1,39 @@
 """
 Matching algorithms for aligning generated AD with reference AD.
 
-This module provides three matching strategies:
+This module provides five matching strategies:
 1. ClusterMatcher: Time-overlap based clustering (N:M matching)
 2. DPMatcher: Dynamic Programming based alignment (1:1 matching with gaps)
-3. OverlapMatcher: Simple time-overlap matching (1:N matching)
+3. AnchoredDPMatcher: DPMatcher split at anchor pairs, blocks aligned in parallel
+4. OverlapMatcher: Simple time-overlap matching (1:N matching)
+5. AssignmentMatcher: Time-gated maximum-weight assignment (1:1 matching, order-free)
 
 All matchers return a list of MatchedPair objects.
 """
 
+import bisect
+import heapq
 import math
+import os
+import time
 import numpy as np
 from abc import ABC, abstractmethod
 from typing import List, Tuple, Optional, Callable, Dict, Any
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
-from .utils import ADEvent, MatchedPair, combine_texts
+from .utils import ADEvent, EventTable, MatchedPair
+from .embeddings import EmbeddingSimilarity, DEFAULT_EMBEDDING_MODEL
+
+# Optional imports
+try:
+    from scipy import sparse
+    from scipy.optimize import linear_sum_assignment
+    from scipy.sparse.csgraph import connected_components, min_weight_full_bipartite_matching
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
 
 
 # ============================================================
@@ -102,108 +120,123 @@ class ClusterMatcher(BaseMatcher):
     def name(self) -> str:
         return "cluster"
     
+    def _build_clusters(self, starts: np.ndarray, ends: np.ndarray) -> UnionFind:
+        """
+        Union overlapping events with a sort-and-sweep over start times.
+        
+        Events are visited in start order while an "active" heap keeps only
+        those whose end can still overlap the current start by at least
+        min_overlap_sec. Every active event overlaps every other active event,
+        so they already share one cluster and the current event only needs a
+        single union. Produces the same partition as checking all pairs with
+        ADEvent.overlaps_with, in O(n log n).
+        
+        Args:
+            starts: Start times of the events to cluster
+            ends: End times, aligned with starts
+            
+        Returns:
+            UnionFind over positions in starts/ends
+        """
+        n = len(starts)
+        uf = UnionFind(n)
+        min_overlap = self.min_overlap_sec
+        
+        # overlaps_with clamps negative overlaps to zero, so a non-positive
+        # threshold relates every pair of events
+        if min_overlap <= 0:
+            for i in range(1, n):
+                uf.union(0, i)
+            return uf
+        
+        starts = starts.tolist()
+        ends = ends.tolist()
+        order = sorted(range(n), key=lambda i: starts[i])
+        active: List[Tuple[float, int]] = []  # heap of (end, position)
+        
+        for j in order:
+            start_j = starts[j]
+            end_j = ends[j]
+            
+            # Overlap with an earlier-starting event is min(end_i, end_j) - start_j,
+            # which only shrinks as start_j grows, so expired events never return
+            while active and active[0][0] - start_j < min_overlap:
+                heapq.heappop(active)
+            
+            # Events shorter than min_overlap cannot overlap anything
+            if end_j - start_j < min_overlap:
+                continue
+            
+            if active:
+                uf.union(active[0][1], j)
+            heapq.heappush(active, (end_j, j))
+        
+        return uf
+    
     def match(
         self,
         gen_events: List[ADEvent],
         ref_events: List[ADEvent]
     ) -> List[MatchedPair]:
         """Match using cluster-based grouping."""
-        # Create unified event list
-        events = []
-        
-        # Add generated events
-        for event in gen_events:
-            events.append({
-                'event': event,
-                'source': 'generated',
-            })
-        
-        # Add reference events
-        for event in ref_events:
-            events.append({
-                'event': event,
-                'source': 'reference',
-            })
-        
-        n = len(events)
+        n_gen = len(gen_events)
+        n = n_gen + len(ref_events)
         if n == 0:
             return []
         
-        # Build clusters using Union-Find
-        uf = UnionFind(n)
+        # Build clusters using Union-Find over one unified event list
+        # (positions below n_gen are generated, the rest reference)
+        g_start, g_end = _event_arrays(gen_events)
+        r_start, r_end = _event_arrays(ref_events)
+        uf = self._build_clusters(np.concatenate([g_start, r_start]), np.concatenate([g_end, r_end]))
         
-        for i in range(n):
-            for j in range(i + 1, n):
-                e1 = events[i]['event']
-                e2 = events[j]['event']
-                if e1.overlaps_with(e2, self.min_overlap_sec):
-                    uf.union(i, j)
-        
-        # Group events by cluster
-        clusters: Dict[int, List[dict]] = {}
+        # Group positions by cluster
+        clusters: Dict[int, List[int]] = {}
         for i in range(n):
             root = uf.find(i)
             if root not in clusters:
                 clusters[root] = []
-            clusters[root].append(events[i])
+            clusters[root].append(i)
         
         # Create matched pairs from clusters
         matched_pairs = []
         
-        for cluster_events in clusters.values():
-            gen_in_cluster = [e['event'] for e in cluster_events if e['source'] == 'generated']
-            ref_in_cluster = [e['event'] for e in cluster_events if e['source'] == 'reference']
+        for members in clusters.values():
+            gen_in_cluster = [i for i in members if i < n_gen]
+            ref_in_cluster = [i - n_gen for i in members if i >= n_gen]
             
             if gen_in_cluster and ref_in_cluster:
                 # Matched cluster
-                gen_sorted = sorted(gen_in_cluster, key=lambda e: e.start)
-                ref_sorted = sorted(ref_in_cluster, key=lambda e: e.start)
+                gen_sorted = sorted(gen_in_cluster, key=lambda i: g_start[i])
+                ref_sorted = sorted(ref_in_cluster, key=lambda i: r_start[i])
                 
                 matched_pairs.append(MatchedPair(
-                    gen_events=gen_sorted,
-                    ref_events=ref_sorted,
-                    gen_indices=[e.index for e in gen_sorted],
-                    ref_indices=[e.index for e in ref_sorted],
-                    combined_gen_text=combine_texts(gen_sorted),
-                    combined_ref_text=combine_texts(ref_sorted),
-                    gen_start=min(e.start for e in gen_sorted),
-                    gen_end=max(e.end for e in gen_sorted),
-                    ref_start=min(e.start for e in ref_sorted),
-                    ref_end=max(e.end for e in ref_sorted),
+                    gen_source=gen_events,
+                    ref_source=ref_events,
+                    gen_positions=gen_sorted,
+                    ref_positions=ref_sorted,
                     matched=True,
                     match_type='cluster',
                 ))
             elif gen_in_cluster:
                 # Generated-only cluster (no matching reference)
-                for event in gen_in_cluster:
+                for i in gen_in_cluster:
                     matched_pairs.append(MatchedPair(
-                        gen_events=[event],
-                        ref_events=[],
-                        gen_indices=[event.index],
-                        ref_indices=[],
-                        combined_gen_text=event.text,
-                        combined_ref_text='',
-                        gen_start=event.start,
-                        gen_end=event.end,
-                        ref_start=None,
-                        ref_end=None,
+                        gen_source=gen_events,
+                        ref_source=ref_events,
+                        gen_positions=[i],
+                        ref_positions=[],
                         matched=False,
                         match_type='generated_only',
                     ))
             elif ref_in_cluster:
                 # Reference-only cluster (no matching generated)
-                for event in ref_in_cluster:
+                for j in ref_in_cluster:
                     matched_pairs.append(MatchedPair(
-                        gen_events=[],
-                        ref_events=[event],
-                        gen_indices=[],
-                        ref_indices=[event.index],
-                        combined_gen_text='',
-                        combined_ref_text=event.text,
-                        gen_start=None,
-                        gen_end=None,
-                        ref_start=event.start,
-                        ref_end=event.end,
+                        gen_source=gen_events,
+                        ref_source=ref_events,
+                        gen_positions=[],
+                        ref_positions=[j],
                         matched=False,
                         match_type='reference_only',
                     ))
@@ -221,6 +254,72 @@ class ClusterMatcher(BaseMatcher):
         return matched_pairs
 
 
+# ============================================================
+# Interval Index for Overlap Matcher
+# ============================================================
+
+def _event_arrays(events: List[ADEvent]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (start, end) arrays for a list of events or an EventTable."""
+    if isinstance(events, EventTable):
+        return events.start, events.end
+    starts = np.fromiter((e.start for e in events), dtype=float, count=len(events))
+    ends = np.fromiter((e.end for e in events), dtype=float, count=len(events))
+    return starts, ends
+
+
+def _event_texts(events: List[ADEvent]) -> List[str]:
+    """Return the texts of a list of events or an EventTable."""
+    if isinstance(events, EventTable):
+        return events.texts()
+    return [e.text for e in events]
+
+
+class IntervalIndex:
+    """
+    Static index over event intervals backed by sorted NumPy arrays.
+    
+    Events are ordered by start time alongside a running maximum of their end
+    times. For a query interval, binary search bounds the events that start
+    before the query ends and whose running end maximum reaches past the query
+    start; only that slice is filtered element-wise.
+    """
+    
+    def __init__(self, events: List[ADEvent]):
+        """
+        Build the index.
+        
+        Args:
+            events: Events to index (positions refer to this list)
+        """
+        starts, ends = _event_arrays(events)
+        self.order = np.argsort(starts, kind='stable')
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        self.max_end = np.maximum.accumulate(self.ends) if len(events) else self.ends
+    
+    def __len__(self) -> int:
+        return len(self.order)
+    
+    def query(self, start: float, end: float) -> np.ndarray:
+        """
+        Find events that overlap (start, end) by a positive amount.
+        
+        Args:
+            start: Query start time
+            end: Query end time
+            
+        Returns:
+            Positions of overlapping events in the original list, ascending
+        """
+        lo = np.searchsorted(self.max_end, start, side='right')
+        hi = np.searchsorted(self.starts, end, side='left')
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64)
+        
+        hits = lo + np.flatnonzero(self.ends[lo:hi] > start)
+        return np.sort(self.order[hits])
+
+
 # ============================================================
 # Overlap Matcher (1:N Matching)
 # ============================================================
@@ -254,46 +353,46 @@ class OverlapMatcher(BaseMatcher):
         """Match using simple time overlap."""
         matched_pairs = []
         
-        for gen_event in gen_events:
-            # Find overlapping reference events
-            overlapping = []
-            for ref_event in ref_events:
-                overlap = gen_event.overlap_duration(ref_event)
-                if overlap >= self.min_overlap_sec:
-                    overlapping.append((ref_event, overlap))
+        # A positive threshold needs a positive overlap, so only events the
+        # index reports can qualify; otherwise every reference qualifies
+        index = IntervalIndex(ref_events) if self.min_overlap_sec > 0 else None
+        
+        g_start, g_end = _event_arrays(gen_events)
+        r_start, r_end = _event_arrays(ref_events)
+        
+        for g_pos in range(len(gen_events)):
+            # Find overlapping reference positions
+            if index is not None:
+                candidates = index.query(g_start[g_pos], g_end[g_pos])
+            else:
+                candidates = np.arange(len(ref_events))
+            
+            overlap = np.maximum(
+                0.0,
+                np.minimum(g_end[g_pos], r_end[candidates]) - np.maximum(g_start[g_pos], r_start[candidates])
+            )
+            keep = overlap >= self.min_overlap_sec
             
-            if overlapping:
+            if keep.any():
                 # Sort by overlap duration
-                overlapping.sort(key=lambda x: -x[1])
-                ref_sorted = [r for r, _ in overlapping]
+                order = np.argsort(-overlap[keep], kind='stable')
+                overlapping = candidates[keep][order].tolist()
                 
                 matched_pairs.append(MatchedPair(
-                    gen_events=[gen_event],
-                    ref_events=ref_sorted,
-                    gen_indices=[gen_event.index],
-                    ref_indices=[r.index for r in ref_sorted],
-                    combined_gen_text=gen_event.text,
-                    combined_ref_text=combine_texts(ref_sorted),
-                    gen_start=gen_event.start,
-                    gen_end=gen_event.end,
-                    ref_start=min(r.start for r in ref_sorted),
-                    ref_end=max(r.end for r in ref_sorted),
+                    gen_source=gen_events,
+                    ref_source=ref_events,
+                    gen_positions=[g_pos],
+                    ref_positions=overlapping,
                     matched=True,
                     match_type='overlap',
                 ))
             else:
                 # No match found
                 matched_pairs.append(MatchedPair(
-                    gen_events=[gen_event],
-                    ref_events=[],
-                    gen_indices=[gen_event.index],
-                    ref_indices=[],
-                    combined_gen_text=gen_event.text,
-                    combined_ref_text='',
-                    gen_start=gen_event.start,
-                    gen_end=gen_event.end,
-                    ref_start=None,
-                    ref_end=None,
+                    gen_source=gen_events,
+                    ref_source=ref_events,
+                    gen_positions=[g_pos],
+                    ref_positions=[],
                     matched=False,
                     match_type='no_overlap',
                 ))
@@ -301,6 +400,106 @@ class OverlapMatcher(BaseMatcher):
         return matched_pairs
 
 
+# ============================================================
+# Vectorized Similarity Helpers
+# ============================================================
+
+# Largest dense token-incidence size (cells) before switching to scipy.sparse
+_DENSE_INCIDENCE_LIMIT = 1_000_000
+
+
+def _token_sets(texts: List[str]) -> List[set]:
+    """Lowercase and split each text once into a set of tokens."""
+    return [set(t.lower().split()) for t in texts]
+
+
+def token_jaccard_matrix(a_texts: List[str], b_texts: List[str]) -> np.ndarray:
+    """
+    Compute the token-overlap Jaccard similarity for every pair of texts.
+    
+    Equivalent to DPMatcher._token_overlap_similarity applied to each cell,
+    but each text is tokenized once and intersections come from a product of
+    sparse token-incidence matrices.
+    
+    Args:
+        a_texts: Texts for the rows
+        b_texts: Texts for the columns
+        
+    Returns:
+        Matrix of shape (len(a_texts), len(b_texts))
+    """
+    n, m = len(a_texts), len(b_texts)
+    if n == 0 or m == 0:
+        return np.zeros((n, m), dtype=float)
+    
+    a_sets = _token_sets(a_texts)
+    b_sets = _token_sets(b_texts)
+    
+    vocab: Dict[str, int] = {}
+    
+    def incidence(token_sets: List[set]) -> Tuple[np.ndarray, np.ndarray]:
+        rows, cols = [], []
+        for row, tokens in enumerate(token_sets):
+            for tok in tokens:
+                rows.append(row)
+                cols.append(vocab.setdefault(tok, len(vocab)))
+        return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+    
+    a_rows, a_cols = incidence(a_sets)
+    b_rows, b_cols = incidence(b_sets)
+    v = len(vocab)
+    
+    # Sparse products only pay off once the dense incidence matrices get large
+    if SCIPY_AVAILABLE and (n + m) * v > _DENSE_INCIDENCE_LIMIT:
+        A = sparse.csr_matrix((np.ones(len(a_rows)), (a_rows, a_cols)), shape=(n, v))
+        B = sparse.csr_matrix((np.ones(len(b_rows)), (b_rows, b_cols)), shape=(m, v))
+        inter = (A @ B.T).toarray()
+    else:
+        A = np.zeros((n, v), dtype=float)
+        B = np.zeros((m, v), dtype=float)
+        A[a_rows, a_cols] = 1.0
+        B[b_rows, b_cols] = 1.0
+        inter = A @ B.T
+    
+    a_size = np.array([len(t) for t in a_sets], dtype=float)
+    b_size = np.array([len(t) for t in b_sets], dtype=float)
+    union = a_size[:, None] + b_size[None, :] - inter
+    
+    valid = (a_size[:, None] > 0) & (b_size[None, :] > 0)
+    jaccard = np.zeros((n, m), dtype=float)
+    np.divide(inter, union, out=jaccard, where=valid)
+    return jaccard
+
+
+def soft_time_matrix(
+    gen_events: List[ADEvent],
+    ref_events: List[ADEvent],
+    time_scale: float
+) -> np.ndarray:
+    """Soft start-time similarity exp(-|dt| / time_scale) for every pair."""
+    g_start, _ = _event_arrays(gen_events)
+    r_start, _ = _event_arrays(ref_events)
+    return np.exp(-np.abs(g_start[:, None] - r_start[None, :]) / time_scale)
+
+
+def temporal_iou_matrix(
+    gen_events: List[ADEvent],
+    ref_events: List[ADEvent]
+) -> np.ndarray:
+    """Temporal Intersection over Union for every pair."""
+    g_start, g_end = _event_arrays(gen_events)
+    r_start, r_end = _event_arrays(ref_events)
+    
+    inter_start = np.maximum(g_start[:, None], r_start[None, :])
+    inter_end = np.minimum(g_end[:, None], r_end[None, :])
+    intersection = np.maximum(0.0, inter_end - inter_start)
+    union = (g_end - g_start)[:, None] + (r_end - r_start)[None, :] - intersection
+    
+    iou = np.zeros_like(intersection)
+    np.divide(intersection, union, out=iou, where=union > 0)
+    return iou
+
+
 # ============================================================
 # DP Matcher (1:1 Matching with Gaps)
 # ============================================================
@@ -322,6 +521,13 @@ class DPMatcher(BaseMatcher):
         time_scale: float = 10.0,
         time_soft: bool = True,
         text_sim_func: Optional[Callable[[str, str], float]] = None,
+        batch_text_sim_func: Optional[Callable[[List[str], List[str]], np.ndarray]] = None,
+        band_sec: Optional[float] = None,
+        band_radius: Optional[int] = None,
+        dp_fill: str = "wavefront",
+        text_sim: str = "token",
+        embedding_model: Optional[str] = None,
+        embedding_cache_dir: Optional[str] = None,
     ):
         """
         Initialize DPMatcher.
@@ -334,6 +540,23 @@ class DPMatcher(BaseMatcher):
             time_scale: Scale for soft time similarity
             time_soft: If True, use soft time similarity; else use temporal IoU
             text_sim_func: Function for text similarity (default: token overlap)
+            batch_text_sim_func: Function taking (gen_texts, ref_texts) and returning
+                the full text similarity matrix. Takes precedence over text_sim_func
+                when building the similarity matrix.
+            band_sec: If set, only pair events whose start times differ by at most
+                this many seconds (banded alignment)
+            band_radius: If set, only pair each generated event with reference
+                events within this many positions of its nearest reference start
+                (Sakoe-Chiba band; combined with band_sec as a union)
+            dp_fill: How to fill the full DP table: 'wavefront' (vectorized
+                per anti-diagonal) or 'loop' (cell by cell). Both give
+                identical alignments.
+            text_sim: Built-in text similarity used when no function is given:
+                'token' (token-overlap Jaccard) or 'embedding' (cosine of
+                sentence embeddings, see eval_metric.embeddings)
+            embedding_model: Sentence embedding model for text_sim='embedding'
+                (default: multilingual MiniLM)
+            embedding_cache_dir: Directory for cached embeddings (None = memory only)
         """
         self.w_time = w_time
         self.w_text = w_text
@@ -342,6 +565,31 @@ class DPMatcher(BaseMatcher):
         self.time_scale = time_scale
         self.time_soft = time_soft
         self.text_sim_func = text_sim_func or self._token_overlap_similarity
+        
+        if text_sim not in ('token', 'embedding'):
+            raise ValueError(f"Unknown text_sim: {text_sim}. Available: ['token', 'embedding']")
+        self.text_sim = text_sim
+        
+        if batch_text_sim_func is None and text_sim_func is None:
+            if text_sim == 'embedding':
+                batch_text_sim_func = EmbeddingSimilarity(
+                    model_name=embedding_model or DEFAULT_EMBEDDING_MODEL,
+                    cache_dir=embedding_cache_dir,
+                )
+            else:
+                batch_text_sim_func = token_jaccard_matrix
+        self.batch_text_sim_func = batch_text_sim_func
+        self.band_sec = band_sec
+        self.band_radius = band_radius
+        
+        if dp_fill not in ('wavefront', 'loop'):
+            raise ValueError(f"Unknown dp_fill: {dp_fill}. Available: ['wavefront', 'loop']")
+        self.dp_fill = dp_fill
+    
+    @property
+    def banded(self) -> bool:
+        """Whether alignment is restricted to a band around the time diagonal."""
+        return self.band_sec is not None or self.band_radius is not None
     
     @property
     def name(self) -> str:
@@ -393,20 +641,54 @@ class DPMatcher(BaseMatcher):
         ref_events: List[ADEvent]
     ) -> np.ndarray:
         """Build similarity matrix between events."""
-        n, m = len(gen_events), len(ref_events)
-        S = np.zeros((n, m), dtype=float)
+        s_text = self._text_similarity_matrix(gen_events, ref_events)
+        s_time = self._time_similarity_matrix(gen_events, ref_events)
+        return self.w_time * s_time + self.w_text * s_text
+    
+    def _text_similarity_matrix(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> np.ndarray:
+        """Text similarity for every (gen, ref) pair."""
+        gen_texts = _event_texts(gen_events)
+        ref_texts = _event_texts(ref_events)
         
-        for i, g in enumerate(gen_events):
-            for j, r in enumerate(ref_events):
-                S[i, j] = self._combined_similarity(g, r)
+        if self.batch_text_sim_func is not None:
+            return np.asarray(
+                self.batch_text_sim_func(gen_texts, ref_texts), dtype=float
+            ).reshape(len(gen_texts), len(ref_texts))
         
+        # Per-cell fallback for custom pairwise functions
+        S = np.zeros((len(gen_texts), len(ref_texts)), dtype=float)
+        for i, g in enumerate(gen_texts):
+            for j, r in enumerate(ref_texts):
+                S[i, j] = self.text_sim_func(g, r)
         return S
     
+    def _time_similarity_matrix(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> np.ndarray:
+        """Time similarity for every (gen, ref) pair."""
+        if self.time_soft:
+            return soft_time_matrix(gen_events, ref_events, self.time_scale)
+        return temporal_iou_matrix(gen_events, ref_events)
+    
     def _dp_align(
         self,
         sim_matrix: np.ndarray
     ) -> List[Tuple[Optional[int], Optional[int], float]]:
         """Run DP alignment and return alignment list."""
+        if self.dp_fill == 'wavefront':
+            bt = self._dp_fill_wavefront(sim_matrix)
+        else:
+            bt = self._dp_fill_loop(sim_matrix)
+        return self._dp_backtrack(sim_matrix, bt)
+    
+    def _dp_fill_loop(self, sim_matrix: np.ndarray) -> np.ndarray:
+        """Fill the DP table cell by cell and return the backtrace table."""
         n, m = sim_matrix.shape
         
         # DP table
@@ -440,7 +722,120 @@ class DPMatcher(BaseMatcher):
                     bt[i, j] = 2
                 dp[i, j] = best
         
-        # Backtracking
+        return bt
+    
+    def _dp_fill_wavefront(self, sim_matrix: np.ndarray) -> np.ndarray:
+        """Fill the DP table one anti-diagonal at a time and return the backtrace table."""
+        return self._dp_fill_table(sim_matrix)[1]
+    
+    def _dp_fill_table(
+        self,
+        sim_matrix: np.ndarray,
+        first_row: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fill the DP table one anti-diagonal at a time.
+        
+        Every cell on diagonal d = i + j depends only on diagonals d-1 and d-2,
+        so each diagonal is computed with a few NumPy operations. In row-major
+        storage the cells of a diagonal are evenly spaced m apart, which lets
+        all operands be taken as strided slices of the flattened tables.
+        Scores and tie-breaks (diagonal, then up, then left) match
+        _dp_fill_loop exactly.
+        
+        With first_row, the table continues an earlier one: row 0 holds the
+        scores of that table's last row, and rows 1..n are bit-for-bit the
+        rows a single fill over all generated events would produce.
+        
+        A table with few rows and many columns is filled row by row instead
+        (diagonal and up moves vectorized, reference gaps chained in order),
+        since the per-diagonal overhead would dominate; the result is the same.
+        
+        Returns:
+            (dp, bt): score table and backtrace table (0=diagonal, 1=up, 2=left)
+        """
+        n, m = sim_matrix.shape
+        w = m + 1
+        
+        dp = np.full((n + 1, m + 1), -1e9, dtype=float)
+        bt = np.zeros((n + 1, m + 1), dtype=np.int8)  # 0=diagonal, 1=up, 2=left
+        
+        # Similarities padded to the DP table shape so both share one layout
+        sim = np.zeros((n + 1, m + 1), dtype=float)
+        sim[1:, 1:] = sim_matrix
+        
+        if first_row is not None:
+            dp[0] = first_row
+        else:
+            dp[0, 0] = 0.0
+            for j in range(1, m + 1):
+                dp[0, j] = dp[0, j - 1] + self.gap_penalty_ref
+        bt[0, 1:] = 2
+        for i in range(1, n + 1):
+            dp[i, 0] = dp[i - 1, 0] + self.gap_penalty_gen
+            bt[i, 0] = 1
+        
+        if n * 8 <= m:
+            gap_ref = self.gap_penalty_ref
+            for i in range(1, n + 1):
+                match_score = dp[i - 1, :-1] + sim_matrix[i - 1]
+                skip_gen_score = dp[i - 1, 1:] + self.gap_penalty_gen
+                take_up = skip_gen_score > match_score
+                best = np.where(take_up, skip_gen_score, match_score).tolist()
+                move = take_up.astype(np.int8)
+                left = float(dp[i, 0])
+                for j in range(m):
+                    skip_ref_score = left + gap_ref
+                    if skip_ref_score > best[j]:
+                        best[j] = skip_ref_score
+                        move[j] = 2
+                    left = best[j]
+                dp[i, 1:] = best
+                bt[i, 1:] = move
+            return dp, bt
+        
+        dp_flat = dp.reshape(-1)
+        bt_flat = bt.reshape(-1)
+        sim_flat = sim.reshape(-1)
+        
+        for d in range(2, n + m + 1):
+            i_lo = max(1, d - m)
+            i_hi = min(n, d - 1)
+            if i_lo > i_hi:
+                continue
+            
+            # Flat index of (i, d - i) is i * m + d
+            cells = slice(i_lo * m + d, i_hi * m + d + 1, m)
+            diag = slice(cells.start - w - 1, cells.stop - w - 1, m)
+            up = slice(cells.start - w, cells.stop - w, m)
+            left = slice(cells.start - 1, cells.stop - 1, m)
+            
+            match_score = dp_flat[diag] + sim_flat[cells]
+            skip_gen_score = dp_flat[up] + self.gap_penalty_gen
+            skip_ref_score = dp_flat[left] + self.gap_penalty_ref
+            
+            best = match_score
+            move = np.zeros(best.shape, dtype=np.int8)
+            take_up = skip_gen_score > best
+            best = np.where(take_up, skip_gen_score, best)
+            move[take_up] = 1
+            take_left = skip_ref_score > best
+            best = np.where(take_left, skip_ref_score, best)
+            move[take_left] = 2
+            
+            dp_flat[cells] = best
+            bt_flat[cells] = move
+        
+        return dp, bt
+    
+    def _dp_backtrack(
+        self,
+        sim_matrix: np.ndarray,
+        bt: np.ndarray
+    ) -> List[Tuple[Optional[int], Optional[int], float]]:
+        """Follow the backtrace table from (n, m) and return alignment list."""
+        n, m = sim_matrix.shape
+        
         alignment = []
         i, j = n, m
         while i > 0 or j > 0:
@@ -460,6 +855,185 @@ class DPMatcher(BaseMatcher):
         alignment.reverse()
         return alignment
     
+    def _band_limits(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent],
+        band_sec: Optional[float] = None,
+        band_radius: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the reference range [lo[i], hi[i]) each generated event may match.
+        
+        Both bounds are made non-decreasing so that the band forms a staircase
+        in the DP table, widening the ranges rather than narrowing them.
+        band_sec and band_radius default to the matcher's own settings.
+        """
+        if band_sec is None and band_radius is None:
+            band_sec, band_radius = self.band_sec, self.band_radius
+        
+        n, m = len(gen_events), len(ref_events)
+        g_start, _ = _event_arrays(gen_events)
+        r_start, _ = _event_arrays(ref_events)
+        r_sorted = np.all(r_start[:-1] <= r_start[1:])
+        if not r_sorted:
+            raise ValueError("Banded DP alignment requires reference events sorted by start time")
+        
+        lo = np.full(n, m, dtype=np.int64)
+        hi = np.zeros(n, dtype=np.int64)
+        
+        if band_sec is not None:
+            lo = np.minimum(lo, np.searchsorted(r_start, g_start - band_sec, side='left'))
+            hi = np.maximum(hi, np.searchsorted(r_start, g_start + band_sec, side='right'))
+        
+        if band_radius is not None:
+            center = np.searchsorted(r_start, g_start, side='left')
+            lo = np.minimum(lo, np.maximum(center - band_radius, 0))
+            hi = np.maximum(hi, np.minimum(center + band_radius + 1, m))
+        
+        hi = np.maximum(hi, lo)
+        lo = np.minimum.accumulate(lo[::-1])[::-1]
+        hi = np.maximum.accumulate(hi)
+        return lo, hi
+    
+    def _build_banded_similarity(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent],
+        lo: np.ndarray,
+        hi: np.ndarray,
+        block_size: int = 256,
+        sim_func: Optional[Callable[[List[ADEvent], List[ADEvent]], np.ndarray]] = None
+    ) -> List[np.ndarray]:
+        """
+        Build similarity rows restricted to the band.
+        
+        Row i holds the similarity of gen_events[i] to ref_events[lo[i]:hi[i]].
+        Rows are computed in blocks so only a block_size x span submatrix is
+        ever materialized. sim_func defaults to the combined similarity.
+        """
+        sim_func = sim_func or self._build_similarity_matrix
+        rows: List[np.ndarray] = []
+        n = len(gen_events)
+        
+        for b_start in range(0, n, block_size):
+            b_end = min(b_start + block_size, n)
+            c_lo, c_hi = int(lo[b_start]), int(hi[b_end - 1])
+            block = sim_func(
+                gen_events[b_start:b_end], ref_events[c_lo:c_hi]
+            )
+            for i in range(b_start, b_end):
+                rows.append(block[i - b_start, lo[i] - c_lo:hi[i] - c_lo].copy())
+        
+        return rows
+    
+    def _dp_align_banded(
+        self,
+        sim_rows: List[np.ndarray],
+        lo: np.ndarray,
+        hi: np.ndarray,
+        m: int
+    ) -> List[Tuple[Optional[int], Optional[int], float]]:
+        """
+        Run DP alignment restricted to a band and return alignment list.
+        
+        DP row i (1..n) covers columns [L[i], H[i]] where matches are allowed
+        for columns lo[i-1]+1..hi[i-1]. Each row's right edge is extended to
+        cover the next row's diagonal predecessors and left edge, so the band
+        stays connected through gap moves. Only two score rows are kept; the
+        backtrace is stored as int8 in a flat banded layout. Moves and
+        tie-breaks follow _dp_align, so when every cell on the full-table path
+        lies inside the band the alignment is identical.
+        """
+        n = len(sim_rows)
+        gap_gen = self.gap_penalty_gen
+        gap_ref = self.gap_penalty_ref
+        neg_inf = float('-inf')
+        
+        # Column range per DP row
+        L = np.empty(n + 1, dtype=np.int64)
+        H = np.empty(n + 1, dtype=np.int64)
+        L[0] = 0
+        L[1:] = lo
+        H[0] = 0
+        H[1:] = hi
+        H[n] = m
+        for i in range(n - 1, -1, -1):
+            # Row i must hold the diagonal predecessors of row i+1's match
+            # columns and at least one column shared with row i+1
+            H[i] = max(H[i], hi[i] - 1, L[i + 1])
+        
+        widths = H - L + 1
+        offsets = np.zeros(n + 2, dtype=np.int64)
+        np.cumsum(widths, out=offsets[1:])
+        bt = np.zeros(int(offsets[-1]), dtype=np.int8)  # 0=diagonal, 1=up, 2=left
+        
+        # Row 0: only reference gaps
+        prev = [j * gap_ref for j in range(int(H[0]) + 1)]
+        prev_lo, prev_hi = 0, int(H[0])
+        bt[1:offsets[1]] = 2
+        
+        for i in range(1, n + 1):
+            row_lo, row_hi = int(L[i]), int(H[i])
+            sim = sim_rows[i - 1].tolist()
+            m_lo, m_hi = int(lo[i - 1]) + 1, int(hi[i - 1])
+            base = int(offsets[i])
+            cur = [neg_inf] * (row_hi - row_lo + 1)
+            
+            for j in range(row_lo, row_hi + 1):
+                move = 0
+                best = neg_inf
+                if m_lo <= j <= m_hi and prev_lo <= j - 1 <= prev_hi:
+                    best = prev[j - 1 - prev_lo] + sim[j - m_lo]
+                if prev_lo <= j <= prev_hi:
+                    skip_gen_score = prev[j - prev_lo] + gap_gen
+                    if skip_gen_score > best:
+                        best = skip_gen_score
+                        move = 1
+                if j > row_lo:
+                    skip_ref_score = cur[j - 1 - row_lo] + gap_ref
+                    if skip_ref_score > best:
+                        best = skip_ref_score
+                        move = 2
+                cur[j - row_lo] = best
+                bt[base + j - row_lo] = move
+            
+            prev, prev_lo, prev_hi = cur, row_lo, row_hi
+        
+        # Backtracking
+        alignment = []
+        i, j = n, m
+        while i > 0 or j > 0:
+            move = bt[offsets[i] + j - L[i]]
+            if i > 0 and j > 0 and move == 0:
+                score = sim_rows[i - 1][j - 1 - lo[i - 1]]
+                alignment.append((i - 1, j - 1, score))
+                i -= 1
+                j -= 1
+            elif i > 0 and (j == 0 or move == 1):
+                alignment.append((i - 1, None, self.gap_penalty_gen))
+                i -= 1
+            else:
+                alignment.append((None, j - 1, self.gap_penalty_ref))
+                j -= 1
+        
+        alignment.reverse()
+        return alignment
+    
+    def _align(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> List[Tuple[Optional[int], Optional[int], float]]:
+        """Build similarities and run the configured DP alignment."""
+        if self.banded:
+            lo, hi = self._band_limits(gen_events, ref_events)
+            sim_rows = self._build_banded_similarity(gen_events, ref_events, lo, hi)
+            return self._dp_align_banded(sim_rows, lo, hi, len(ref_events))
+        
+        sim_matrix = self._build_similarity_matrix(gen_events, ref_events)
+        return self._dp_align(sim_matrix)
+    
     def match(
         self,
         gen_events: List[ADEvent],
@@ -469,72 +1043,593 @@ class DPMatcher(BaseMatcher):
         if not gen_events or not ref_events:
             return []
         
-        # Build similarity matrix
-        sim_matrix = self._build_similarity_matrix(gen_events, ref_events)
-        
-        # Run DP alignment
-        alignment = self._dp_align(sim_matrix)
+        # Build similarities and run DP alignment
+        alignment = self._align(gen_events, ref_events)
         
-        # Convert to MatchedPair objects
+        return self._alignment_to_pairs(gen_events, ref_events, alignment)
+    
+    def _alignment_to_pairs(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent],
+        alignment: List[Tuple[Optional[int], Optional[int], float]]
+    ) -> List[MatchedPair]:
+        """Convert an alignment list to MatchedPair objects."""
         matched_pairs = []
         
         for g_idx, r_idx, score in alignment:
             if g_idx is not None and r_idx is not None:
                 # Matched pair
-                g = gen_events[g_idx]
-                r = ref_events[r_idx]
-                
-                matched_pairs.append(MatchedPair(
-                    gen_events=[g],
-                    ref_events=[r],
-                    gen_indices=[g.index],
-                    ref_indices=[r.index],
-                    combined_gen_text=g.text,
-                    combined_ref_text=r.text,
-                    gen_start=g.start,
-                    gen_end=g.end,
-                    ref_start=r.start,
-                    ref_end=r.end,
-                    matched=True,
-                    match_type='dp_match',
-                    score=score,
-                ))
+                matched, match_type = True, 'dp_match'
             elif g_idx is not None:
                 # Unmatched generated
-                g = gen_events[g_idx]
-                matched_pairs.append(MatchedPair(
-                    gen_events=[g],
-                    ref_events=[],
-                    gen_indices=[g.index],
-                    ref_indices=[],
-                    combined_gen_text=g.text,
-                    combined_ref_text='',
-                    gen_start=g.start,
-                    gen_end=g.end,
-                    ref_start=None,
-                    ref_end=None,
-                    matched=False,
-                    match_type='dp_gen_gap',
-                    score=score,
-                ))
+                matched, match_type = False, 'dp_gen_gap'
             else:
                 # Unmatched reference
-                r = ref_events[r_idx]
-                matched_pairs.append(MatchedPair(
-                    gen_events=[],
-                    ref_events=[r],
-                    gen_indices=[],
-                    ref_indices=[r.index],
-                    combined_gen_text='',
-                    combined_ref_text=r.text,
-                    gen_start=None,
-                    gen_end=None,
-                    ref_start=r.start,
-                    ref_end=r.end,
-                    matched=False,
-                    match_type='dp_ref_gap',
-                    score=score,
+                matched, match_type = False, 'dp_ref_gap'
+            
+            matched_pairs.append(MatchedPair(
+                gen_source=gen_events,
+                ref_source=ref_events,
+                gen_positions=[] if g_idx is None else [g_idx],
+                ref_positions=[] if r_idx is None else [r_idx],
+                matched=matched,
+                match_type=match_type,
+                score=score,
+            ))
+        
+        return matched_pairs
+
+
+# ============================================================
+# Anchored DP Matcher (Divide-and-Conquer 1:1 Matching)
+# ============================================================
+
+def _align_block(
+    matcher: 'DPMatcher',
+    gen_events: List[ADEvent],
+    ref_events: List[ADEvent]
+) -> List[Tuple[Optional[int], Optional[int], float]]:
+    """Align one block between anchors (module-level so worker processes can run it)."""
+    if not gen_events:
+        return [(None, j, matcher.gap_penalty_ref) for j in range(len(ref_events))]
+    if not ref_events:
+        return [(i, None, matcher.gap_penalty_gen) for i in range(len(gen_events))]
+    return DPMatcher._align(matcher, gen_events, ref_events)
+
+
+class AnchoredDPMatcher(DPMatcher):
+    """
+    Divide-and-conquer variant of DPMatcher for very long programs.
+    
+    First finds high-confidence anchor pairs (strong text similarity,
+    near-identical timing, unambiguous within their neighbourhood), keeps the
+    longest order-preserving chain of them, then aligns the independent blocks
+    between consecutive anchors with the regular DP in a process pool. The
+    result is stitched back into a single 1:1 alignment.
+    
+    Anchors are forced matches, so the total alignment score can be lower than
+    that of a single global DP; compare_with_global() reports the difference.
+    """
+    
+    def __init__(
+        self,
+        anchor_min_text_sim: float = 0.6,
+        anchor_max_time_diff: float = 1.0,
+        anchor_window_sec: float = 30.0,
+        anchor_margin: float = 0.2,
+        n_jobs: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Initialize AnchoredDPMatcher.
+        
+        Args:
+            anchor_min_text_sim: Minimum text similarity for an anchor
+            anchor_max_time_diff: Maximum start and end time difference (seconds)
+                for an anchor
+            anchor_window_sec: Neighbourhood (seconds) searched for competing
+                candidates when checking that an anchor is unambiguous
+            anchor_margin: Required text similarity lead over every competing
+                candidate in the anchor's row and column
+            n_jobs: Worker processes for block alignment (None = all cores,
+                1 = run in this process)
+            **kwargs: DPMatcher arguments (weights, gap penalties, band, ...)
+        """
+        super().__init__(**kwargs)
+        self.anchor_min_text_sim = anchor_min_text_sim
+        self.anchor_max_time_diff = anchor_max_time_diff
+        self.anchor_window_sec = anchor_window_sec
+        self.anchor_margin = anchor_margin
+        self.n_jobs = n_jobs
+        self.last_stats: Dict[str, Any] = {}
+    
+    @property
+    def name(self) -> str:
+        return "dp_anchored"
+    
+    def _find_anchors(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Find an order-preserving chain of high-confidence anchor pairs.
+        
+        Returns:
+            List of (gen_position, ref_position, text_similarity) with both
+            positions strictly increasing
+        """
+        n, m = len(gen_events), len(ref_events)
+        lo, hi = self._band_limits(gen_events, ref_events, band_sec=self.anchor_window_sec)
+        text_rows = self._build_banded_similarity(
+            gen_events, ref_events, lo, hi, sim_func=self._text_similarity_matrix
+        )
+        
+        # Best and runner-up text similarity per reference column
+        values = np.concatenate(text_rows) if text_rows else np.empty(0)
+        rows = np.repeat(np.arange(n), hi - lo)
+        cols = np.concatenate([np.arange(lo[i], hi[i]) for i in range(n)]) if n else np.empty(0, dtype=np.int64)
+        order = np.lexsort((rows, -values, cols))
+        cols_sorted = cols[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = cols_sorted[1:] != cols_sorted[:-1]
+        
+        col_best_row = np.full(m, -1, dtype=np.int64)
+        col_best_row[cols_sorted[first]] = rows[order][first]
+        col_second = np.full(m, -np.inf)
+        second = np.flatnonzero(first[:-1] & ~first[1:]) + 1
+        col_second[cols_sorted[second]] = values[order][second]
+        
+        candidates = []
+        for i, row in enumerate(text_rows):
+            if len(row) == 0:
+                continue
+            k = int(np.argmax(row))
+            best = row[k]
+            j = int(lo[i]) + k
+            if best < self.anchor_min_text_sim:
+                continue
+            
+            # Unambiguous in both its row and its column
+            row_second = np.max(np.delete(row, k)) if len(row) > 1 else -np.inf
+            if row_second > best - self.anchor_margin:
+                continue
+            if col_best_row[j] != i or col_second[j] > best - self.anchor_margin:
+                continue
+            
+            g, r = gen_events[i], ref_events[j]
+            if (abs(g.start - r.start) > self.anchor_max_time_diff
+                    or abs(g.end - r.end) > self.anchor_max_time_diff):
+                continue
+            candidates.append((i, j, float(best)))
+        
+        return self._longest_chain(candidates)
+    
+    @staticmethod
+    def _longest_chain(candidates: List[Tuple[int, int, float]]) -> List[Tuple[int, int, float]]:
+        """Longest subsequence of (i, j, ...) candidates (sorted by i) with strictly increasing j."""
+        tails: List[int] = []      # smallest tail j for chains of each length
+        tail_idx: List[int] = []   # candidate index of that tail
+        parent = [-1] * len(candidates)
+        
+        for idx, (_, j, _) in enumerate(candidates):
+            pos = bisect.bisect_left(tails, j)
+            if pos > 0:
+                parent[idx] = tail_idx[pos - 1]
+            if pos == len(tails):
+                tails.append(j)
+                tail_idx.append(idx)
+            else:
+                tails[pos] = j
+                tail_idx[pos] = idx
+        
+        chain = []
+        idx = tail_idx[-1] if tail_idx else -1
+        while idx != -1:
+            chain.append(candidates[idx])
+            idx = parent[idx]
+        chain.reverse()
+        return chain
+    
+    def _align_anchored(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> List[Tuple[Optional[int], Optional[int], float]]:
+        """Align blocks between anchors in parallel and stitch the results."""
+        anchors = self._find_anchors(gen_events, ref_events)
+        anchor_scores = [
+            self.w_time * self._time_similarity_matrix([gen_events[i]], [ref_events[j]])[0, 0]
+            + self.w_text * s_text
+            for i, j, s_text in anchors
+        ]
+        
+        # Blocks between consecutive anchors (plus before the first and after the last)
+        bounds = [(-1, -1)] + [(i, j) for i, j, _ in anchors] + [(len(gen_events), len(ref_events))]
+        gen_blocks, ref_blocks, offsets = [], [], []
+        for (i0, j0), (i1, j1) in zip(bounds[:-1], bounds[1:]):
+            gen_blocks.append(gen_events[i0 + 1:i1])
+            ref_blocks.append(ref_events[j0 + 1:j1])
+            offsets.append((i0 + 1, j0 + 1))
+        
+        n_jobs = self.n_jobs or os.cpu_count() or 1
+        dp_blocks = sum(1 for g, r in zip(gen_blocks, ref_blocks) if g and r)
+        if n_jobs > 1 and dp_blocks > 1:
+            chunksize = max(1, len(gen_blocks) // (n_jobs * 4))
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                block_alignments = list(executor.map(
+                    _align_block, repeat(self), gen_blocks, ref_blocks, chunksize=chunksize
+                ))
+        else:
+            block_alignments = [
+                _align_block(self, g, r) for g, r in zip(gen_blocks, ref_blocks)
+            ]
+        
+        alignment = []
+        for k, (block, (gi0, rj0)) in enumerate(zip(block_alignments, offsets)):
+            for g_idx, r_idx, score in block:
+                alignment.append((
+                    None if g_idx is None else g_idx + gi0,
+                    None if r_idx is None else r_idx + rj0,
+                    score,
                 ))
+            if k < len(anchors):
+                i, j, _ = anchors[k]
+                alignment.append((i, j, anchor_scores[k]))
+        
+        self.last_stats = {
+            'anchors': len(anchors),
+            'blocks': len(gen_blocks),
+            'largest_block_cells': max(len(g) * len(r) for g, r in zip(gen_blocks, ref_blocks)),
+            'n_jobs': n_jobs,
+        }
+        return alignment
+    
+    def match(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> List[MatchedPair]:
+        """Match using anchored, block-parallel DP alignment."""
+        if not gen_events or not ref_events:
+            return []
+        
+        alignment = self._align_anchored(gen_events, ref_events)
+        return self._alignment_to_pairs(gen_events, ref_events, alignment)
+    
+    def compare_with_global(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> Dict[str, Any]:
+        """
+        Run both the anchored and a single global DP alignment and report differences.
+        
+        Args:
+            gen_events: List of generated AD events
+            ref_events: List of reference AD events
+            
+        Returns:
+            Dictionary with anchor/block counts, wall times, total alignment
+            scores and agreement between the matched (gen, ref) pairs
+        """
+        t0 = time.perf_counter()
+        anchored = self._align_anchored(gen_events, ref_events)
+        anchored_sec = time.perf_counter() - t0
+        
+        t0 = time.perf_counter()
+        global_alignment = DPMatcher._align(self, gen_events, ref_events)
+        global_sec = time.perf_counter() - t0
+        
+        def matches(alignment):
+            return {(g, r) for g, r, _ in alignment if g is not None and r is not None}
+        
+        anchored_matches = matches(anchored)
+        global_matches = matches(global_alignment)
+        common = anchored_matches & global_matches
+        union = anchored_matches | global_matches
+        
+        anchored_score = float(sum(score for _, _, score in anchored))
+        global_score = float(sum(score for _, _, score in global_alignment))
+        
+        return {
+            **self.last_stats,
+            'anchored_sec': anchored_sec,
+            'global_sec': global_sec,
+            'speedup': global_sec / anchored_sec if anchored_sec > 0 else None,
+            'anchored_matches': len(anchored_matches),
+            'global_matches': len(global_matches),
+            'common_matches': len(common),
+            'match_agreement': len(common) / len(union) if union else 1.0,
+            'anchored_score': anchored_score,
+            'global_score': global_score,
+            'score_loss': global_score - anchored_score,
+        }
+
+
+# ============================================================
+# Assignment Matcher (Unordered 1:1 Matching)
+# ============================================================
+
+# Largest component (cells) solved with the dense Hungarian solver; larger
+# components use the sparse solver on the gated edges only
+_DENSE_ASSIGNMENT_LIMIT = 250_000
+
+# Total component cells below which components are solved in this process,
+# since starting and feeding worker processes would cost more than solving
+_PARALLEL_ASSIGNMENT_CELLS = 1_000_000
+
+
+def _solve_component(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray,
+    n: int,
+    m: int
+) -> List[Tuple[int, int]]:
+    """
+    Maximum-weight bipartite matching of one connected component.
+    
+    Module-level so worker processes can run it.
+    
+    Args:
+        rows: Local generated position of each edge
+        cols: Local reference position of each edge
+        weights: Positive gain of each edge over leaving both ends unmatched
+        n: Generated events in the component
+        m: Reference events in the component
+        
+    Returns:
+        List of matched (row, col) pairs
+    """
+    if n * m <= _DENSE_ASSIGNMENT_LIMIT:
+        W = np.zeros((n, m), dtype=float)
+        W[rows, cols] = weights
+        r_idx, c_idx = linear_sum_assignment(W, maximize=True)
+        keep = W[r_idx, c_idx] > 0
+        return list(zip(r_idx[keep].tolist(), c_idx[keep].tolist()))
+    
+    # Perfect matching on an augmented graph: every generated event may take a
+    # dummy reference (stay unmatched) and vice versa, and dummies pair up
+    # along the transposed edges. A constant offset keeps every cost positive.
+    offset = float(weights.max()) + 1.0
+    gen_dummy = np.arange(n)
+    ref_dummy = np.arange(m)
+    aug_rows = np.concatenate([rows, gen_dummy, n + ref_dummy, n + cols])
+    aug_cols = np.concatenate([cols, m + gen_dummy, ref_dummy, m + rows])
+    costs = np.concatenate([offset - weights, np.full(n + m + len(rows), offset)])
+    graph = sparse.csr_matrix((costs, (aug_rows, aug_cols)), shape=(n + m, n + m))
+    
+    row_ind, col_ind = min_weight_full_bipartite_matching(graph)
+    real = (row_ind < n) & (col_ind < m)
+    return list(zip(row_ind[real].tolist(), col_ind[real].tolist()))
+
+
+class AssignmentMatcher(DPMatcher):
+    """
+    Maximum-weight 1:1 assignment between generated and reference events.
+    
+    Uses the same combined time/text similarity and gap penalties as DPMatcher,
+    but does not require matches to keep their temporal order. Candidate pairs
+    are gated to start times within window_sec of each other, the candidate
+    graph is split into connected components, and each component is solved
+    independently (in a process pool when n_jobs > 1 and the components are
+    large enough to pay for it; the pool is kept for later calls).
+    
+    The objective is the DP score without the order constraint: the sum of
+    matched similarities plus the gap penalties of every unmatched event.
+    """
+    
+    def __init__(
+        self,
+        window_sec: float = 10.0,
+        min_similarity: float = 0.0,
+        n_jobs: Optional[int] = 1,
+        **kwargs
+    ):
+        """
+        Initialize AssignmentMatcher.
+        
+        Args:
+            window_sec: Maximum start-time difference (seconds) for a candidate pair
+            min_similarity: Candidate pairs with a lower combined similarity are
+                dropped, which also splits the graph into smaller components
+            n_jobs: Worker processes for solving components (None = all cores,
+                1 = run in this process); small problems always run here
+            **kwargs: DPMatcher similarity arguments (weights, gap penalties,
+                time_scale, time_soft, text similarity functions)
+        """
+        if not SCIPY_AVAILABLE:
+            raise ImportError("AssignmentMatcher requires scipy. Install with: pip install scipy")
+        super().__init__(**kwargs)
+        self.window_sec = window_sec
+        self.min_similarity = min_similarity
+        self.n_jobs = n_jobs
+        self.last_stats: Dict[str, Any] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
+    
+    @property
+    def name(self) -> str:
+        return "assignment"
+    
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _candidate_edges(
+        self,
+        gen_events: EventTable,
+        ref_events: EventTable,
+        sim_matrix: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gated candidate pairs between start-sorted tables.
+        
+        Args:
+            gen_events: Start-sorted generated events
+            ref_events: Start-sorted reference events
+            sim_matrix: Precomputed combined similarity in the same order
+                (default: computed within the band)
+        
+        Returns:
+            (gen positions, ref positions, similarities) of every pair within
+            window_sec whose similarity is at least min_similarity and whose
+            gain over two gaps is positive
+        """
+        n = len(gen_events)
+        lo, hi = self._band_limits(gen_events, ref_events, band_sec=self.window_sec)
+        if sim_matrix is None:
+            sim_rows = self._build_banded_similarity(gen_events, ref_events, lo, hi)
+        else:
+            sim_rows = [sim_matrix[i, lo[i]:hi[i]] for i in range(n)]
+        
+        widths = hi - lo
+        row_starts = np.zeros(n, dtype=np.int64)
+        np.cumsum(widths[:-1], out=row_starts[1:])
+        rows = np.repeat(np.arange(n), widths)
+        cols = np.arange(int(widths.sum())) - np.repeat(row_starts - lo, widths)
+        sims = np.concatenate(sim_rows) if n else np.empty(0)
+        
+        # The band is widened to a staircase; apply the exact window here
+        gain = sims - self.gap_penalty_gen - self.gap_penalty_ref
+        keep = (
+            (np.abs(gen_events.start[rows] - ref_events.start[cols]) <= self.window_sec)
+            & (sims >= self.min_similarity)
+            & (gain > 0)
+        )
+        return rows[keep], cols[keep], sims[keep]
+    
+    def _assign(
+        self,
+        gen_events: EventTable,
+        ref_events: EventTable,
+        sim_matrix: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, int, float]]:
+        """Solve the gated assignment per connected component."""
+        n, m = len(gen_events), len(ref_events)
+        rows, cols, sims = self._candidate_edges(gen_events, ref_events, sim_matrix)
+        gains = sims - self.gap_penalty_gen - self.gap_penalty_ref
+        
+        # Components of the bipartite candidate graph (gen nodes 0..n-1, ref nodes n..n+m-1)
+        graph = sparse.csr_matrix((np.ones(len(rows)), (rows, n + cols)), shape=(n + m, n + m))
+        _, labels = connected_components(graph, directed=False)
+        
+        order = np.argsort(labels[rows], kind='stable')
+        rows, cols, sims, gains = rows[order], cols[order], sims[order], gains[order]
+        splits = np.flatnonzero(np.diff(labels[rows])) + 1
+        
+        problems = []
+        for r_c, c_c, g_c in zip(np.split(rows, splits), np.split(cols, splits), np.split(gains, splits)):
+            if len(r_c) == 0:
+                continue
+            gens, local_r = np.unique(r_c, return_inverse=True)
+            refs, local_c = np.unique(c_c, return_inverse=True)
+            problems.append((gens, refs, local_r, local_c, g_c))
+        
+        n_jobs = self.n_jobs or os.cpu_count() or 1
+        args = [(lr, lc, g, len(gens), len(refs)) for gens, refs, lr, lc, g in problems]
+        cells = sum(len(gens) * len(refs) for gens, refs, *_ in problems)
+        if n_jobs > 1 and len(problems) > 1 and cells >= _PARALLEL_ASSIGNMENT_CELLS:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=n_jobs)
+            chunksize = max(1, len(problems) // (n_jobs * 4))
+            solutions = list(self._executor.map(_solve_component, *zip(*args), chunksize=chunksize))
+        else:
+            n_jobs = 1
+            solutions = [_solve_component(*a) for a in args]
+        
+        # Similarity of each matched edge
+        edge_sim = dict(zip(zip(rows.tolist(), cols.tolist()), sims.tolist()))
+        matches = []
+        for (gens, refs, *_), solution in zip(problems, solutions):
+            for r, c in solution:
+                i, j = int(gens[r]), int(refs[c])
+                matches.append((i, j, edge_sim[(i, j)]))
+        
+        self.last_stats = {
+            'edges': len(rows),
+            'components': len(problems),
+            'largest_component': max((len(p[0]) + len(p[1]) for p in problems), default=0),
+            'n_jobs': n_jobs,
+        }
+        return matches
+    
+    def match(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> List[MatchedPair]:
+        """Match using gated maximum-weight assignment."""
+        return self._match_with_similarity(gen_events, ref_events)
+    
+    def _match_with_similarity(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent],
+        sim_matrix: Optional[np.ndarray] = None
+    ) -> List[MatchedPair]:
+        """
+        Match, optionally from a precomputed combined similarity matrix.
+        
+        Args:
+            gen_events: Generated AD events
+            ref_events: Reference AD events
+            sim_matrix: (gen, ref) combined similarity in input order, e.g.
+                from a sweep's shared components (default: computed)
+        """
+        if not gen_events or not ref_events:
+            return []
+        
+        gen_table = EventTable.from_events(gen_events)
+        ref_table = EventTable.from_events(ref_events)
+        gen_order = np.argsort(gen_table.start, kind='stable')
+        ref_order = np.argsort(ref_table.start, kind='stable')
+        if sim_matrix is not None:
+            sim_matrix = sim_matrix[np.ix_(gen_order, ref_order)]
+        matches = self._assign(gen_table.take(gen_order), ref_table.take(ref_order), sim_matrix)
+        
+        # Back to input positions, listed in time order with gaps in between
+        g_start, _ = _event_arrays(gen_events)
+        r_start, _ = _event_arrays(ref_events)
+        gen_matched = np.zeros(len(gen_events), dtype=bool)
+        ref_matched = np.zeros(len(ref_events), dtype=bool)
+        entries = []
+        for i, j, score in matches:
+            g_pos, r_pos = int(gen_order[i]), int(ref_order[j])
+            gen_matched[g_pos] = ref_matched[r_pos] = True
+            entries.append((g_start[g_pos], g_pos, r_pos, score))
+        for g_pos in np.flatnonzero(~gen_matched).tolist():
+            entries.append((g_start[g_pos], g_pos, None, self.gap_penalty_gen))
+        for r_pos in np.flatnonzero(~ref_matched).tolist():
+            entries.append((r_start[r_pos], None, r_pos, self.gap_penalty_ref))
+        entries.sort(key=lambda e: e[0])
+        
+        matched_pairs = []
+        for _, g_pos, r_pos, score in entries:
+            if g_pos is not None and r_pos is not None:
+                matched, match_type = True, 'assign_match'
+            elif g_pos is not None:
+                matched, match_type = False, 'assign_gen_gap'
+            else:
+                matched, match_type = False, 'assign_ref_gap'
+            
+            matched_pairs.append(MatchedPair(
+                gen_source=gen_events,
+                ref_source=ref_events,
+                gen_positions=[] if g_pos is None else [g_pos],
+                ref_positions=[] if r_pos is None else [r_pos],
+                matched=matched,
+                match_type=match_type,
+                score=score,
+            ))
         
         return matched_pairs
 
@@ -543,6 +1638,16 @@ class DPMatcher(BaseMatcher):
 # Matcher Factory
 # ============================================================
 
+# Registered matcher classes by method name
+MATCHERS: Dict[str, type] = {
+    'cluster': ClusterMatcher,
+    'dp': DPMatcher,
+    'dp_anchored': AnchoredDPMatcher,
+    'overlap': OverlapMatcher,
+    'assignment': AssignmentMatcher,
+}
+
+
 def get_matcher(
     method: str = "cluster",
     **kwargs
@@ -551,20 +1656,14 @@ def get_matcher(
     Get a matcher instance by name.
     
     Args:
-        method: Matcher method name ('cluster', 'dp', 'overlap')
+        method: Matcher method name ('cluster', 'dp', 'dp_anchored', 'overlap', 'assignment')
         **kwargs: Additional arguments passed to the matcher constructor
         
     Returns:
         BaseMatcher instance
     """
-    matchers = {
-        'cluster': ClusterMatcher,
-        'dp': DPMatcher,
-        'overlap': OverlapMatcher,
-    }
-    
     method_lower = method.lower()
-    if method_lower not in matchers:
-        raise ValueError(f"Unknown matcher: {method}. Available: {list(matchers.keys())}")
+    if method_lower not in MATCHERS:
+        raise ValueError(f"Unknown matcher: {method}. Available: {list(MATCHERS.keys())}")
     
-    return matchers[method_lower](**kwargs)
+    return MATCHERS[method_lower](**kwargs)
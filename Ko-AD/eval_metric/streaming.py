@@ -0,0 +1,529 @@
+"""
+Streaming matchers for unbounded or live AD streams.
+
+The matchers in matchers.py need complete event lists. The streaming
+matchers here consume time-ordered events from two iterators, keep only a
+sliding time window of pending events, and yield MatchedPair objects as soon
+as a cluster, overlap set or alignment block can no longer change:
+
+1. StreamingClusterMatcher: same clusters as ClusterMatcher
+2. StreamingOverlapMatcher: same pairs, in the same order, as OverlapMatcher
+3. StreamingDPMatcher: DPMatcher over blocks cut with bounded lookahead
+
+Each emitted pair only refers to its own events, so memory is bounded by the
+window rather than by the length of the stream.
+"""
+
+import heapq
+import numpy as np
+from abc import abstractmethod
+from collections import deque
+from typing import List, Tuple, Optional, Dict, Any, Iterable, Iterator
+
+import pandas as pd
+
+from .utils import ADEvent, MatchedPair, timestamp_to_seconds
+from .matchers import BaseMatcher, ClusterMatcher, OverlapMatcher, DPMatcher, _align_block
+
+
+# ============================================================
+# Stream Helpers
+# ============================================================
+
+def _check_sorted(events: Iterable[ADEvent], label: str) -> Iterator[ADEvent]:
+    """Pass events through, raising ValueError if start times ever decrease."""
+    last = -np.inf
+    for event in events:
+        if event.start < last:
+            raise ValueError(
+                f"{label} events must be sorted by start time "
+                f"(got {event.start} after {last})"
+            )
+        last = event.start
+        yield event
+
+
+def _merge_streams(
+    gen_events: Iterable[ADEvent],
+    ref_events: Iterable[ADEvent]
+) -> Iterator[Tuple[ADEvent, bool]]:
+    """
+    Merge two time-ordered event streams by start time.
+    
+    Yields:
+        (event, is_generated) tuples; on equal starts generated events come first
+    """
+    gen = ((e, True) for e in _check_sorted(gen_events, "Generated"))
+    ref = ((e, False) for e in _check_sorted(ref_events, "Reference"))
+    return heapq.merge(gen, ref, key=lambda item: item[0].start)
+
+
+def events_from_segments(segments: Iterable[Dict[str, Any]], start_index: int = 0) -> Iterator[ADEvent]:
+    """
+    Convert generated AD segments to ADEvent objects as they arrive.
+    
+    Accepts the same items as the "audio_descriptions" list read by
+    load_generated_ad, e.g. segments produced by get_AD_jack.py or
+    get_AD_gpt.py while they are still running.
+    
+    Args:
+        segments: Iterable of dicts with start_time, end_time and description
+        start_index: Index assigned to the first segment
+        
+    Yields:
+        ADEvent objects in input order
+    """
+    for idx, item in enumerate(segments, start=start_index):
+        yield ADEvent(
+            start=timestamp_to_seconds(item['start_time']),
+            end=timestamp_to_seconds(item['end_time']),
+            text=item.get('description', item.get('text', '')),
+            index=idx,
+        )
+
+
+def iter_reference_ad(
+    file_path: str,
+    chunksize: int = 10000,
+    filter_ad_only: bool = True
+) -> Iterator[ADEvent]:
+    """
+    Read reference AD from a CSV file in chunks.
+    
+    Unlike load_reference_ad the rows are not sorted, so the file must already
+    be in start-time order; the streaming matchers raise ValueError otherwise.
+    
+    Args:
+        file_path: Path to CSV file
+        chunksize: Rows read per chunk
+        filter_ad_only: If True and speech_type column exists, keep 'ad' rows only
+        
+    Yields:
+        ADEvent objects in file order
+    """
+    idx = 0
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        if filter_ad_only and 'speech_type' in chunk.columns:
+            chunk = chunk[chunk['speech_type'] == 'ad']
+        for start, end, text in zip(chunk['start'].tolist(), chunk['end'].tolist(), chunk['text'].tolist()):
+            yield ADEvent(start=float(start), end=float(end), text=str(text), index=idx)
+            idx += 1
+
+
+# ============================================================
+# Base Streaming Matcher
+# ============================================================
+
+class BaseStreamingMatcher(BaseMatcher):
+    """Abstract base class for matchers that consume event streams."""
+    
+    @abstractmethod
+    def match_stream(
+        self,
+        gen_events: Iterable[ADEvent],
+        ref_events: Iterable[ADEvent]
+    ) -> Iterator[MatchedPair]:
+        """
+        Match two time-ordered event streams.
+        
+        Args:
+            gen_events: Generated AD events, sorted by start time
+            ref_events: Reference AD events, sorted by start time
+            
+        Yields:
+            MatchedPair objects as soon as they are final
+        """
+        pass
+    
+    def match(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent]
+    ) -> List[MatchedPair]:
+        """Match complete event lists by streaming over them."""
+        return list(self.match_stream(gen_events, ref_events))
+
+
+# ============================================================
+# Streaming Cluster Matcher
+# ============================================================
+
+class StreamingClusterMatcher(BaseStreamingMatcher):
+    """
+    Streaming version of ClusterMatcher.
+    
+    Runs the same sweep as ClusterMatcher._build_clusters over the merged
+    streams. All events in the sweep's active heap overlap each other, so at
+    most one cluster is open at a time; it is final as soon as the heap
+    empties. Finished pairs are held back only until no open or future cluster
+    can sort before them, so pairs come out in ClusterMatcher's order; equal
+    start times are broken as there, by the cluster's first position in its
+    input stream.
+    
+    With min_overlap_sec <= 0 every event joins one cluster, so nothing can
+    be emitted before the streams end.
+    """
+    
+    def __init__(self, min_overlap_sec: float = 0.5):
+        """
+        Initialize StreamingClusterMatcher.
+        
+        Args:
+            min_overlap_sec: Minimum overlap in seconds to consider events as related
+        """
+        self.min_overlap_sec = min_overlap_sec
+    
+    @property
+    def name(self) -> str:
+        return "cluster_stream"
+    
+    @staticmethod
+    def _cluster_pairs(gen_in_cluster: List[ADEvent], ref_in_cluster: List[ADEvent]) -> List[MatchedPair]:
+        """Turn one finished cluster into pairs, as ClusterMatcher.match does."""
+        if gen_in_cluster and ref_in_cluster:
+            gen_sorted = sorted(gen_in_cluster, key=lambda e: e.start)
+            ref_sorted = sorted(ref_in_cluster, key=lambda e: e.start)
+            return [MatchedPair.from_events(gen_sorted, ref_sorted, True, 'cluster')]
+        if gen_in_cluster:
+            return [MatchedPair.from_events([e], [], False, 'generated_only') for e in gen_in_cluster]
+        return [MatchedPair.from_events([], [e], False, 'reference_only') for e in ref_in_cluster]
+    
+    def match_stream(
+        self,
+        gen_events: Iterable[ADEvent],
+        ref_events: Iterable[ADEvent]
+    ) -> Iterator[MatchedPair]:
+        """Match streams using cluster-based grouping."""
+        if self.min_overlap_sec <= 0:
+            yield from ClusterMatcher(self.min_overlap_sec).match(list(gen_events), list(ref_events))
+            return
+        
+        min_overlap = self.min_overlap_sec
+        active: List[float] = []  # heap of end times in the open cluster
+        open_gen: List[ADEvent] = []
+        open_ref: List[ADEvent] = []
+        open_first: Optional[Tuple[int, int]] = None  # first (gen, ref) stream positions
+        open_start: Optional[float] = None
+        positions = [0, 0]  # events seen so far in the (reference, generated) stream
+        
+        # Finished pairs waiting for their turn: (sort_key, sequence, pair)
+        ready: List[Tuple[Tuple[float, int, int], int, MatchedPair]] = []
+        seq = 0
+        
+        def finish(gen_in_cluster, ref_in_cluster, first):
+            # ClusterMatcher keeps clusters in order of their first position in
+            # its unified list (generated before reference), so equal start
+            # times are broken by the first generated position for pairs keyed
+            # on a generated start and the first reference position otherwise
+            nonlocal seq
+            for pair in self._cluster_pairs(gen_in_cluster, ref_in_cluster):
+                if pair.gen_start is not None:
+                    key = (pair.gen_start, 0, first[0])
+                else:
+                    key = (pair.ref_start, 1, first[1])
+                heapq.heappush(ready, (key, seq, pair))
+                seq += 1
+        
+        for event, is_gen in _merge_streams(gen_events, ref_events):
+            start_j, end_j = event.start, event.end
+            position = positions[is_gen]
+            positions[is_gen] += 1
+            
+            while active and active[0] - start_j < min_overlap:
+                heapq.heappop(active)
+            if not active and open_start is not None:
+                finish(open_gen, open_ref, open_first)
+                open_gen, open_ref, open_first, open_start = [], [], None, None
+            
+            if end_j - start_j < min_overlap:
+                # Too short to overlap anything: a cluster of its own
+                if is_gen:
+                    finish([event], [], (position, None))
+                else:
+                    finish([], [event], (None, position))
+            else:
+                if open_start is None:
+                    open_start = start_j
+                    open_first = (None, None)
+                if is_gen:
+                    open_gen.append(event)
+                    if open_first[0] is None:
+                        open_first = (position, open_first[1])
+                else:
+                    open_ref.append(event)
+                    if open_first[1] is None:
+                        open_first = (open_first[0], position)
+                heapq.heappush(active, end_j)
+            
+            # Nothing still open or yet to come can sort before this bound
+            bound = (start_j if open_start is None else open_start, 0)
+            while ready and ready[0][0] < bound:
+                yield heapq.heappop(ready)[2]
+        
+        if open_start is not None:
+            finish(open_gen, open_ref, open_first)
+        while ready:
+            yield heapq.heappop(ready)[2]
+
+
+# ============================================================
+# Streaming Overlap Matcher
+# ============================================================
+
+class StreamingOverlapMatcher(BaseStreamingMatcher):
+    """
+    Streaming version of OverlapMatcher.
+    
+    A generated event is final once the merged stream reaches its end time,
+    since later reference events cannot overlap it. Reference events are
+    dropped once they end before every pending and future generated event
+    starts. Pairs are emitted in generated-stream order, exactly as
+    OverlapMatcher produces them.
+    
+    With min_overlap_sec <= 0 every reference event qualifies for every
+    generated event, so nothing can be emitted before the streams end.
+    """
+    
+    def __init__(self, min_overlap_sec: float = 0.5):
+        """
+        Initialize StreamingOverlapMatcher.
+        
+        Args:
+            min_overlap_sec: Minimum overlap in seconds to consider a match
+        """
+        self.min_overlap_sec = min_overlap_sec
+    
+    @property
+    def name(self) -> str:
+        return "overlap_stream"
+    
+    def _gen_pair(self, gen_event: ADEvent, window: Dict[int, ADEvent]) -> MatchedPair:
+        """Build the pair for one generated event against the reference window."""
+        overlapping = []
+        for ref_event in window.values():
+            overlap = gen_event.overlap_duration(ref_event)
+            if overlap >= self.min_overlap_sec:
+                overlapping.append((ref_event, overlap))
+        
+        if not overlapping:
+            return MatchedPair.from_events([gen_event], [], False, 'no_overlap')
+        
+        # Sort by overlap duration
+        overlapping.sort(key=lambda x: -x[1])
+        return MatchedPair.from_events([gen_event], [r for r, _ in overlapping], True, 'overlap')
+    
+    def match_stream(
+        self,
+        gen_events: Iterable[ADEvent],
+        ref_events: Iterable[ADEvent]
+    ) -> Iterator[MatchedPair]:
+        """Match streams using simple time overlap."""
+        if self.min_overlap_sec <= 0:
+            yield from OverlapMatcher(self.min_overlap_sec).match(list(gen_events), list(ref_events))
+            return
+        
+        pending: deque = deque()  # generated events not yet final, in stream order
+        window: Dict[int, ADEvent] = {}  # reference events that may still overlap, in stream order
+        expiry: List[Tuple[float, int]] = []  # heap of (end, window key)
+        last_gen_start = -np.inf
+        seq = 0
+        
+        for event, is_gen in _merge_streams(gen_events, ref_events):
+            t = event.start
+            
+            # References starting at or after a generated event's end cannot overlap it
+            while pending and pending[0].end <= t:
+                yield self._gen_pair(pending.popleft(), window)
+            
+            if is_gen:
+                pending.append(event)
+                last_gen_start = t
+            else:
+                window[seq] = event
+                heapq.heappush(expiry, (event.end, seq))
+                seq += 1
+            
+            # Drop references that end before every remaining generated event starts,
+            # by end time so one long reference does not hold back the rest
+            horizon = pending[0].start if pending else last_gen_start
+            while expiry and expiry[0][0] <= horizon:
+                del window[heapq.heappop(expiry)[1]]
+        
+        while pending:
+            yield self._gen_pair(pending.popleft(), window)
+
+
+# ============================================================
+# Streaming DP Matcher (Bounded Lookahead)
+# ============================================================
+
+class StreamingDPMatcher(BaseStreamingMatcher):
+    """
+    Bounded-lookahead approximation of DPMatcher for streams.
+    
+    Events are buffered until they span window_sec + lookahead_sec. A cut time
+    is then chosen inside the lookahead region, in the middle of the widest
+    gap between consecutive event starts, and everything starting before it
+    is aligned with DPMatcher as one independent block and emitted.
+    
+    Error bound: the concatenated block alignments are optimal among
+    alignments with no match crossing a cut. The global DP alignment can be
+    turned into such an alignment by splitting each crossing match into two
+    gaps, so the total score is at most
+    
+        N * (w_time + w_text - gap_penalty_gen - gap_penalty_ref)
+        
+    below the global optimum, where N is the number of matches crossing a
+    cut. With a band (band_sec and/or band_radius), N is bounded per cut from
+    the band limits DPMatcher uses (see _crossing_bound) and reported in
+    last_stats; without one there is no bound. With band_sec alone, a cut
+    placed in a gap of at least 2 * band_sec between event starts is exact.
+    Increase lookahead_sec to give the cut more room to find such gaps.
+    """
+    
+    def __init__(
+        self,
+        window_sec: float = 300.0,
+        lookahead_sec: float = 60.0,
+        **kwargs
+    ):
+        """
+        Initialize StreamingDPMatcher.
+        
+        Args:
+            window_sec: Minimum span (seconds) of each aligned block
+            lookahead_sec: Span (seconds) searched for a cut beyond the window
+            **kwargs: DPMatcher arguments (weights, gap penalties, band_sec, ...)
+        """
+        self.window_sec = window_sec
+        self.lookahead_sec = lookahead_sec
+        self.dp = DPMatcher(**kwargs)
+        self.last_stats: Dict[str, Any] = {}
+    
+    @property
+    def name(self) -> str:
+        return "dp_stream"
+    
+    def _choose_cut(self, starts: np.ndarray, lo: float, hi: float) -> float:
+        """Midpoint of the widest gap between sorted starts that lies within [lo, hi]."""
+        inside = starts[(starts >= lo) & (starts <= hi)]
+        points = np.concatenate([[lo], inside, [hi]])
+        gaps = np.diff(points)
+        k = int(np.argmax(gaps))
+        return float((points[k] + points[k + 1]) / 2)
+    
+    def _align_buffer(self, gen_buf: List[ADEvent], ref_buf: List[ADEvent]) -> List[MatchedPair]:
+        """Align one block with the wrapped DPMatcher, keeping gaps for one-sided blocks."""
+        alignment = _align_block(self.dp, gen_buf, ref_buf)
+        return self.dp._alignment_to_pairs(gen_buf, ref_buf, alignment)
+    
+    def _crossing_bound(self, gen_buf: List[ADEvent], ref_buf: List[ADEvent], cut: float) -> int:
+        """
+        Upper bound on global matches crossing cut whose earlier event is buffered.
+        
+        For sorted streams DPMatcher._band_limits lets generated event g match
+        reference positions from min(first start >= g - band_sec, center - band_radius)
+        to max(last start <= g + band_sec, center + band_radius), where center
+        is the number of references starting before g (the staircase step is a
+        no-op because both bounds already increase with g). A monotone
+        alignment crosses a cut in one direction only, so the bound is the
+        larger of:
+        
+        - generated events before the cut whose band reaches a reference at or
+          after it (g >= cut - band_sec, or at most band_radius references
+          start in [g, cut)), and
+        - references before the cut that a later generated event's band
+          reaches (start >= cut - band_sec, or among the last band_radius).
+        
+        Events of earlier blocks are counted at the cut that ended their block.
+        """
+        band_sec, band_radius = self.dp.band_sec, self.dp.band_radius
+        g_start = np.array([e.start for e in gen_buf if e.start < cut], dtype=float)
+        r_start = np.array([e.start for e in ref_buf if e.start < cut], dtype=float)
+        
+        gen_reach = np.zeros(len(g_start), dtype=bool)
+        ref_reach = np.zeros(len(r_start), dtype=bool)
+        if band_sec is not None:
+            gen_reach |= g_start >= cut - band_sec
+            ref_reach |= r_start >= cut - band_sec
+        if band_radius is not None:
+            refs_between = len(r_start) - np.searchsorted(r_start, g_start, side='left')
+            gen_reach |= refs_between <= band_radius
+            ref_reach[max(len(r_start) - band_radius, 0):] = True
+        return int(max(np.count_nonzero(gen_reach), np.count_nonzero(ref_reach)))
+    
+    def match_stream(
+        self,
+        gen_events: Iterable[ADEvent],
+        ref_events: Iterable[ADEvent]
+    ) -> Iterator[MatchedPair]:
+        """Match streams using block-wise DP alignment."""
+        gen_buf: List[ADEvent] = []
+        ref_buf: List[ADEvent] = []
+        block_start: Optional[float] = None
+        cuts = 0
+        crossing_bound = 0
+        
+        for event, is_gen in _merge_streams(gen_events, ref_events):
+            if block_start is None:
+                block_start = event.start
+            (gen_buf if is_gen else ref_buf).append(event)
+            
+            window_end = block_start + self.window_sec
+            if event.start < window_end + self.lookahead_sec:
+                continue
+            
+            # Buffer spans the window plus lookahead: cut and emit the block before it
+            starts = np.fromiter((e.start for e in gen_buf + ref_buf), dtype=float)
+            starts.sort()
+            cut = self._choose_cut(starts, window_end, event.start)
+            
+            if self.dp.banded:
+                crossing_bound += self._crossing_bound(gen_buf, ref_buf, cut)
+            
+            gen_block = [e for e in gen_buf if e.start < cut]
+            ref_block = [e for e in ref_buf if e.start < cut]
+            gen_buf = [e for e in gen_buf if e.start >= cut]
+            ref_buf = [e for e in ref_buf if e.start >= cut]
+            block_start = cut
+            cuts += 1
+            
+            yield from self._align_buffer(gen_block, ref_block)
+        
+        if gen_buf or ref_buf:
+            yield from self._align_buffer(gen_buf, ref_buf)
+        
+        per_match = self.dp.w_time + self.dp.w_text - self.dp.gap_penalty_gen - self.dp.gap_penalty_ref
+        self.last_stats = {
+            'cuts': cuts,
+            'max_crossing_matches': crossing_bound if self.dp.banded else None,
+            'max_score_loss': crossing_bound * per_match if self.dp.banded else None,
+        }
+
+
+# ============================================================
+# Streaming Matcher Factory
+# ============================================================
+
+def get_streaming_matcher(method: str, **kwargs) -> BaseStreamingMatcher:
+    """
+    Get a streaming matcher instance by name.
+    
+    Args:
+        method: Matcher method name ('cluster', 'dp', 'overlap')
+        **kwargs: Additional arguments passed to the matcher constructor
+        
+    Returns:
+        Streaming matcher instance
+    """
+    matchers = {
+        'cluster': StreamingClusterMatcher,
+        'dp': StreamingDPMatcher,
+        'overlap': StreamingOverlapMatcher,
+    }
+    
+    method_lower = method.lower()
+    if method_lower not in matchers:
+        raise ValueError(f"Unknown streaming matcher: {method}. Available: {list(matchers.keys())}")
+    
+    return matchers[method_lower](**kwargs)
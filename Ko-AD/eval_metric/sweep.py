@@ -0,0 +1,280 @@
+"""
+Matcher hyper-parameter sweeps.
+
+Evaluates a grid of matcher settings against one pair of event lists. Events
+are loaded once and the DP similarity components (text similarity, start-time
+differences, temporal IoU) are computed once and recombined per setting, so a
+grid over weights, gap penalties and time scales only pays for the DP fill
+(or, for assignment, the component solves).
+
+Usage:
+    python -m eval_metric -g ad.json -r ad.csv --sweep grid.yaml --jobs 8
+
+Example grid (scalars are treated as one-element lists):
+    method: [cluster, overlap, dp]
+    min_overlap_sec: [0.25, 0.5, 1.0]
+    w_time: [0.2, 0.3, 0.5]
+    gap_penalty_gen: [-0.1, -0.2]
+"""
+
+import itertools
+import time
+import yaml
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Optional, Dict, Any
+
+from .utils import ADEvent, MatchedPair, calculate_coverage_stats
+from .matchers import DPMatcher, AssignmentMatcher, _event_arrays, get_matcher, temporal_iou_matrix
+
+
+# Settings that select the text similarity (one cached text matrix per combination)
+TEXT_SIM_PARAMS = ['text_sim', 'embedding_model', 'embedding_cache_dir']
+
+# Matcher settings each method depends on; other grid keys are dropped for it
+DP_PARAMS = ['w_time', 'w_text', 'gap_penalty_gen', 'gap_penalty_ref', 'time_scale', 'time_soft',
+             'band_sec', 'band_radius', 'dp_fill'] + TEXT_SIM_PARAMS
+SWEEP_PARAMS = {
+    'cluster': ['min_overlap_sec'],
+    'overlap': ['min_overlap_sec'],
+    'dp': DP_PARAMS,
+    'dp_anchored': DP_PARAMS + ['anchor_min_text_sim', 'anchor_max_time_diff', 'anchor_window_sec',
+                                'anchor_margin', 'n_jobs'],
+    'assignment': ['w_time', 'w_text', 'gap_penalty_gen', 'gap_penalty_ref', 'time_scale', 'time_soft',
+                   'window_sec'] + TEXT_SIM_PARAMS,
+}
+
+
+# ============================================================
+# Grid Expansion
+# ============================================================
+
+def expand_grid(grid: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into a list of matcher settings.
+    
+    Keys that do not apply to a setting's method are dropped and duplicate
+    settings removed, so crossing methods with method-specific parameters
+    does not repeat work.
+    
+    Args:
+        grid: Mapping of parameter name to a list of values (or a scalar)
+        base: Default values for parameters not in the grid (e.g. MatcherConfig)
+        
+    Returns:
+        List of settings, each with a 'method' key plus matcher kwargs
+    """
+    base = dict(base or {})
+    axes = {k: v if isinstance(v, (list, tuple)) else [v] for k, v in grid.items()}
+    axes.setdefault('method', [base.get('method', 'cluster')])
+    
+    keys = list(axes)
+    settings, seen = [], set()
+    for values in itertools.product(*(axes[k] for k in keys)):
+        combo = {**base, **dict(zip(keys, values))}
+        method = combo['method']
+        if method not in SWEEP_PARAMS:
+            raise ValueError(f"Unknown sweep method: {method}. Available: {list(SWEEP_PARAMS.keys())}")
+        
+        setting = {'method': method}
+        setting.update({k: combo[k] for k in SWEEP_PARAMS[method] if k in combo})
+        if method not in ('cluster', 'overlap') and not setting.get('time_soft', True):
+            setting.pop('time_scale', None)  # only used by soft time similarity
+        if method not in ('cluster', 'overlap') and setting.get('text_sim', 'token') != 'embedding':
+            setting.pop('embedding_model', None)  # only used by embedding similarity
+            setting.pop('embedding_cache_dir', None)
+        
+        key = tuple(sorted(setting.items()))
+        if key not in seen:
+            seen.add(key)
+            settings.append(setting)
+    
+    return settings
+
+
+def load_grid(grid_path: str) -> Dict[str, Any]:
+    """Load a sweep grid from a YAML file."""
+    with open(grid_path, 'r', encoding='utf-8') as f:
+        grid = yaml.safe_load(f)
+    if not isinstance(grid, dict):
+        raise ValueError(f"Sweep grid must be a mapping of parameter lists: {grid_path}")
+    return grid
+
+
+# ============================================================
+# Shared Similarity Components
+# ============================================================
+
+def _text_key(setting: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Which text similarity a setting uses: (text_sim, embedding model or None)."""
+    text_sim = setting.get('text_sim', 'token')
+    return text_sim, setting.get('embedding_model') if text_sim == 'embedding' else None
+
+
+class SimilarityCache:
+    """
+    DP similarity components shared by every setting in a sweep.
+    
+    Text similarity (once per text_sim/embedding model in the sweep), absolute
+    start-time differences and temporal IoU are computed once; soft time
+    similarity is derived per time_scale and kept. similarity() recombines
+    them exactly as DPMatcher._build_similarity_matrix does for the same
+    settings.
+    """
+    
+    def __init__(
+        self,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent],
+        settings: Optional[List[Dict[str, Any]]] = None
+    ):
+        """
+        Precompute the similarity components.
+        
+        Args:
+            gen_events: Generated AD events
+            ref_events: Reference AD events
+            settings: Sweep settings whose text similarities to compute
+                (default: token overlap only)
+        """
+        g_start, _ = _event_arrays(gen_events)
+        r_start, _ = _event_arrays(ref_events)
+        self.text: Dict[Tuple[str, Optional[str]], np.ndarray] = {}
+        for setting in settings or [{}]:
+            key = _text_key(setting)
+            if key not in self.text:
+                text_matcher = DPMatcher(**{k: setting[k] for k in TEXT_SIM_PARAMS if k in setting})
+                self.text[key] = text_matcher._text_similarity_matrix(gen_events, ref_events)
+        self.start_diff = np.abs(g_start[:, None] - r_start[None, :])
+        self.iou = temporal_iou_matrix(gen_events, ref_events)
+        self._soft_time: Dict[float, np.ndarray] = {}
+    
+    def soft_time(self, time_scale: float) -> np.ndarray:
+        """Soft start-time similarity for one time_scale."""
+        if time_scale not in self._soft_time:
+            self._soft_time[time_scale] = np.exp(-self.start_diff / time_scale)
+        return self._soft_time[time_scale]
+    
+    def similarity(self, matcher: DPMatcher, setting: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """Combined similarity matrix for a DPMatcher's weights, time and text settings."""
+        s_time = self.soft_time(matcher.time_scale) if matcher.time_soft else self.iou
+        return matcher.w_time * s_time + matcher.w_text * self.text[_text_key(setting or {})]
+
+
+# ============================================================
+# Sweep Execution
+# ============================================================
+
+# Per-process sweep inputs, set once by _init_worker
+_SWEEP_STATE: Optional[Tuple[List[ADEvent], List[ADEvent], Optional[SimilarityCache]]] = None
+
+
+def _init_worker(gen_events, ref_events, cache) -> None:
+    """Receive the shared sweep inputs once per worker process."""
+    global _SWEEP_STATE
+    _SWEEP_STATE = (gen_events, ref_events, cache)
+
+
+def _match_setting(
+    setting: Dict[str, Any],
+    gen_events: List[ADEvent],
+    ref_events: List[ADEvent],
+    cache: Optional[SimilarityCache]
+) -> List[MatchedPair]:
+    """Run one matcher setting, reusing cached similarities for DP and assignment."""
+    kwargs = {k: v for k, v in setting.items() if k != 'method'}
+    
+    if setting['method'] == 'assignment' and cache is not None:
+        # Settings already run in parallel; solve components in this process
+        matcher = AssignmentMatcher(n_jobs=1, **kwargs)
+        return matcher._match_with_similarity(gen_events, ref_events, cache.similarity(matcher, setting))
+    
+    if setting['method'] == 'dp' and cache is not None:
+        matcher = DPMatcher(**kwargs)
+        if not len(gen_events) or not len(ref_events):
+            return []
+        sim_matrix = cache.similarity(matcher, setting)
+        if matcher.banded:
+            lo, hi = matcher._band_limits(gen_events, ref_events)
+            sim_rows = [sim_matrix[i, lo[i]:hi[i]] for i in range(len(lo))]
+            alignment = matcher._dp_align_banded(sim_rows, lo, hi, len(ref_events))
+        else:
+            alignment = matcher._dp_align(sim_matrix)
+        return matcher._alignment_to_pairs(gen_events, ref_events, alignment)
+    
+    return get_matcher(setting['method'], **kwargs).match(gen_events, ref_events)
+
+
+def _run_setting(setting: Dict[str, Any]) -> Dict[str, Any]:
+    """Match one setting and summarize it as a result row."""
+    gen_events, ref_events, cache = _SWEEP_STATE
+    
+    t0 = time.perf_counter()
+    matched_pairs = _match_setting(setting, gen_events, ref_events, cache)
+    seconds = time.perf_counter() - t0
+    
+    coverage = calculate_coverage_stats(gen_events, ref_events, matched_pairs)
+    total_gen, total_ref = coverage['gen_total'], coverage['ref_in_range']
+    precision = coverage['gen_matched'] / total_gen if total_gen > 0 else 0.0
+    recall = coverage['ref_matched'] / total_ref if total_ref > 0 else 0.0
+    f1_score = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+    
+    return {
+        **setting,
+        'total_pairs': len(matched_pairs),
+        'matched_pairs': sum(1 for p in matched_pairs if p.matched),
+        'gen_matched': coverage['gen_matched'],
+        'gen_unmatched': coverage['gen_unmatched'],
+        'ref_matched': coverage['ref_matched'],
+        'ref_unmatched': coverage['ref_unmatched'],
+        'precision': precision,
+        'recall': recall,
+        'f1_score': f1_score,
+        'seconds': seconds,
+    }
+
+
+def run_sweep(
+    gen_events: List[ADEvent],
+    ref_events: List[ADEvent],
+    settings: List[Dict[str, Any]],
+    n_jobs: int = 1
+) -> pd.DataFrame:
+    """
+    Evaluate matcher settings against one pair of event lists.
+    
+    Args:
+        gen_events: Generated AD events
+        ref_events: Reference AD events
+        settings: Settings from expand_grid
+        n_jobs: Worker processes (1 = run in this process)
+        
+    Returns:
+        DataFrame with one row per setting: the setting, pair counts,
+        precision, recall, F1 and matching time
+    """
+    global _SWEEP_STATE
+    
+    similarity_settings = [s for s in settings if s['method'] in ('dp', 'assignment')]
+    needs_cache = similarity_settings and len(gen_events) and len(ref_events)
+    cache = SimilarityCache(gen_events, ref_events, similarity_settings) if needs_cache else None
+    
+    if n_jobs > 1 and len(settings) > 1:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(gen_events, ref_events, cache),
+        ) as executor:
+            rows = list(executor.map(_run_setting, settings))
+    else:
+        _init_worker(gen_events, ref_events, cache)
+        try:
+            rows = [_run_setting(s) for s in settings]
+        finally:
+            _SWEEP_STATE = None
+    
+    # Setting columns first, then results
+    df = pd.DataFrame(rows)
+    setting_cols = list(dict.fromkeys(k for s in settings for k in s))
+    return df[setting_cols + [c for c in df.columns if c not in setting_cols]]
@@ -0,0 +1,207 @@
+"""BERTScore batching, embedding cache and evaluator logic, run without a model."""
+
+import os
+import random
+
+import numpy as np
+import pytest
+
+from eval_metric.evaluators import bertscore as B
+from eval_metric.evaluators.bertscore_cache import TokenEmbeddingCache
+
+
+# ============================================================
+# Resident Scorers
+# ============================================================
+
+def test_scorers_are_loaded_once_per_settings(monkeypatch):
+    loaded = []
+    
+    class CountingScorer:
+        def __init__(self, **kwargs):
+            loaded.append(kwargs)
+    
+    monkeypatch.setattr(B, 'BERTSCORE_AVAILABLE', True)
+    monkeypatch.setattr(B, 'BERTScorer', CountingScorer, raising=False)
+    monkeypatch.setattr(B, '_SCORERS', {})
+    
+    first = B.get_bert_scorer("model-a", device="cpu")
+    assert B.get_bert_scorer("model-a", device="cpu") is first
+    assert B.get_bert_scorer("model-b", device="cpu") is not first
+    assert len(loaded) == 2
+    
+    B.clear_bert_scorers()
+    assert B.get_bert_scorer("model-a", device="cpu") is not first
+    assert len(loaded) == 3
+
+
+# ============================================================
+# Token Batches
+# ============================================================
+
+@pytest.mark.parametrize('seed', range(20))
+def test_token_batches_respect_budget_and_restore_order(seed):
+    rng = random.Random(seed)
+    lengths = np.array([rng.choice([0, 1, 3, 7, 20, 50, 300]) for _ in range(rng.randint(0, 80))])
+    token_budget = rng.choice([64, 128, 512])
+    max_batch = rng.choice([1, 4, 16])
+    
+    batches = B.token_batches(lengths, token_budget, max_batch)
+    assert sorted(np.concatenate(batches).tolist() if batches else []) == list(range(len(lengths)))
+    for batch in batches:
+        assert 1 <= len(batch) <= max_batch
+        if len(batch) > 1:
+            assert len(batch) * max(int(lengths[batch].max()), 1) <= token_budget
+    
+    # Scattering per-batch results back by index restores input order
+    restored = np.full(len(lengths), -1)
+    for batch in batches:
+        restored[batch] = lengths[batch] * 10
+    assert restored.tolist() == (lengths * 10).tolist()
+
+
+def test_token_batches_group_similar_lengths():
+    lengths = np.array([5, 100, 5, 100, 5, 100, 5, 5])
+    batches = B.token_batches(lengths, token_budget=200, max_batch=8)
+    # Longest first; equal lengths keep their input order
+    assert [b.tolist() for b in batches] == [[1, 3], [5, 0], [2, 4, 6, 7]]
+    for earlier, later in zip(batches[:-1], batches[1:]):
+        assert lengths[earlier].min() >= lengths[later].max()
+
+
+# ============================================================
+# Token Embedding Cache
+# ============================================================
+
+def _entry(rng, tokens, dim=4):
+    return rng.random((tokens, dim)).astype(np.float32), np.arange(tokens, dtype=np.int32) + 100
+
+
+def test_cache_hits_misses_and_mmap_read(tmp_path):
+    rng = np.random.default_rng(0)
+    entries = {f"text {k}": _entry(rng, k + 1) for k in range(5)}
+    TokenEmbeddingCache(str(tmp_path), "org/model", 9).put_many(entries)
+    
+    cache = TokenEmbeddingCache(str(tmp_path), "org/model", 9)
+    found = cache.get_many(list(entries) + ["missing", "text 0"])
+    assert set(found) == set(entries)
+    assert (cache.hits, cache.misses) == (5, 1)
+    for text, (embedding, ids) in entries.items():
+        got_embedding, got_ids = found[text]
+        assert isinstance(got_embedding, np.memmap) and not got_embedding.flags.writeable
+        np.testing.assert_array_equal(got_embedding, embedding)
+        np.testing.assert_array_equal(got_ids, ids)
+    
+    # Another layer of the same model is a separate cache
+    assert TokenEmbeddingCache(str(tmp_path), "org/model", 10).get("text 0") is None
+
+
+def test_cache_trims_least_recently_used_to_target(tmp_path):
+    rng = np.random.default_rng(1)
+    cache = TokenEmbeddingCache(str(tmp_path), "model", 1)
+    texts = [f"text {k}" for k in range(10)]
+    cache.put_many({t: _entry(rng, 8) for t in texts})
+    entry_bytes = cache.size_bytes() // len(texts)
+    
+    # Oldest first in list order, except text 0, which was just used
+    for k, text in enumerate(texts):
+        path = cache._path(cache.key(text))
+        os.utime(path, (1000 + k, 1000 + k))
+    os.utime(cache._path(cache.key(texts[0])), (5000, 5000))
+    
+    # Adding one more entry pushes the cache past the cap; it is trimmed to 90%
+    cache.max_bytes = entry_bytes * 10
+    cache.put_many({"new": _entry(rng, 8)})
+    assert cache.size_bytes() <= int(cache.max_bytes * 0.9)
+    assert cache.size_bytes() == sum(size for _, size, _ in cache._entries())
+    
+    kept = set(TokenEmbeddingCache(str(tmp_path), "model", 1).get_many(texts + ["new"]))
+    assert kept == {"text 0", "new"} | set(texts[3:])
+
+
+# ============================================================
+# Calibration Gate
+# ============================================================
+
+class _FakeTorch:
+    def __init__(self):
+        self.threads = []
+    
+    def set_num_threads(self, n):
+        self.threads.append(n)
+
+
+class _FakeScorer:
+    _model = 'fp32'
+
+
+@pytest.fixture
+def evaluator_factory(monkeypatch):
+    """Evaluators whose encoders and matching are replaced by text-derived scores."""
+    fake_torch = _FakeTorch()
+    monkeypatch.setattr(B, 'BERTSCORE_AVAILABLE', True)
+    monkeypatch.setattr(B, 'torch', fake_torch, raising=False)
+    monkeypatch.setattr(B.BERTScoreEvaluator, 'scorer', property(lambda self: _FakeScorer()))
+    monkeypatch.setattr(B.BERTScoreEvaluator, 'encoder', property(lambda self: self.backend))
+    
+    def create(offset=0.001, **kwargs):
+        evaluator = B.BERTScoreEvaluator(backend='int8', **kwargs)
+        evaluator.fake_torch = fake_torch
+        evaluator.encoded = []
+        
+        def encode(texts, encoder=None):
+            encoder = encoder if encoder is not None else evaluator.encoder
+            evaluator.encoded.append((encoder, list(texts)))
+            shift = 0.0 if encoder == 'fp32' else offset
+            return {t: (np.full((1, 1), len(t) + shift), np.zeros(1)) for t in texts}
+        
+        def match(gen_texts, ref_texts, embedded, verbose=False):
+            return np.array([[embedded[g][0][0, 0] / 100, embedded[r][0][0, 0] / 100, 0.5]
+                             for g, r in zip(gen_texts, ref_texts)])
+        
+        evaluator._encode = encode
+        evaluator._match = match
+        return evaluator
+    
+    return create
+
+
+def test_calibration_stays_provisional_until_size_reached(evaluator_factory):
+    evaluator = evaluator_factory(calibration_size=5)
+    gens = [f"gen {k}" for k in range(3)]
+    refs = [f"ref {k}" for k in range(3)]
+    
+    evaluator._score(gens, refs)
+    assert evaluator.calibration['pairs'] == 3 and evaluator.calibration['provisional']
+    
+    # Already compared pairs are not compared again
+    evaluator._score(gens, refs)
+    assert evaluator.calibration['pairs'] == 3
+    
+    evaluator._score(gens + ["gen 3", "gen 4", "gen 5"], refs + ["ref 3", "ref 4", "ref 5"])
+    assert evaluator.calibration['pairs'] == 5 and not evaluator.calibration['provisional']
+    assert evaluator.calibration['max_deviation'] == pytest.approx(0.00001)
+    
+    # Once final, scoring no longer runs the fp32 model
+    calls = len(evaluator.encoded)
+    evaluator._score(["gen 9"], ["ref 9"])
+    assert all(encoder == 'int8' for encoder, _ in evaluator.encoded[calls:])
+
+
+def test_calibration_rejects_large_deviation(evaluator_factory):
+    evaluator = evaluator_factory(offset=5.0, calibration_size=4, max_deviation=0.01)
+    with pytest.raises(RuntimeError, match="deviates from fp32"):
+        evaluator._score(["gen a", "gen b"], ["ref a", "ref b"])
+    assert evaluator.calibration is None
+    
+    # The failure is not recorded, so the next call calibrates again
+    with pytest.raises(RuntimeError):
+        evaluator._score(["gen a"], ["ref a"])
+
+
+def test_num_threads_set_once_at_creation(evaluator_factory):
+    evaluator = evaluator_factory(num_threads=3, calibration_size=1)
+    assert evaluator.fake_torch.threads == [3]
+    evaluator._score(["gen"], ["ref"])
+    evaluator._score(["gen"], ["ref"])
+    assert evaluator.fake_torch.threads == [3]
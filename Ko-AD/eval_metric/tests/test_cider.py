@@ -0,0 +1,54 @@
+"""Bulk CIDEr scoring against the per-pair scorer."""
+
+import random
+
+import pytest
+
+pytest.importorskip('nltk')
+
+from eval_metric.evaluators import cider as C
+
+
+WORDS = ["a", "man", "woman", "opens", "the", "door", "car", "looks", "at", "smiles", "runs", "away"]
+
+
+@pytest.fixture(autouse=True)
+def _whitespace_tokenizer(monkeypatch):
+    # No NLTK tokenizer data needed
+    monkeypatch.setattr(C, 'word_tokenize', str.split)
+
+
+def _texts(rng, k):
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))) for _ in range(k)]
+
+
+@pytest.mark.parametrize('sigma', [6.0, 0.0])
+@pytest.mark.parametrize('seed', range(10))
+def test_bulk_scores_match_pairwise(sigma, seed):
+    rng = random.Random(seed)
+    references = _texts(rng, 40)
+    hypotheses = _texts(rng, 40)
+    hypotheses[::5] = references[::5]  # identical pairs score highest
+    
+    scorer = C.CIDErScorer(n=4, sigma=sigma)
+    scorer.compute_doc_freq(references)
+    progress = []
+    bulk = scorer.compute_scores(references, hypotheses, chunk_size=7, progress=progress.append)
+    
+    expected = [scorer.compute_score(r, h) for r, h in zip(references, hypotheses)]
+    assert bulk.tolist() == pytest.approx(expected, abs=1e-9)
+    assert sum(progress) == len(references)
+
+
+def test_fallback_without_scipy_reports_progress(monkeypatch):
+    rng = random.Random(0)
+    references, hypotheses = _texts(rng, 10), _texts(rng, 10)
+    scorer = C.CIDErScorer()
+    scorer.compute_doc_freq(references)
+    expected = scorer.compute_scores(references, hypotheses)
+    
+    monkeypatch.setattr(C, 'SCIPY_AVAILABLE', False)
+    progress = []
+    fallback = scorer.compute_scores(references, hypotheses, progress=progress.append)
+    assert fallback.tolist() == pytest.approx(expected.tolist(), abs=1e-9)
+    assert progress == [1] * len(references)
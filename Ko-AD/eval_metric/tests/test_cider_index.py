@@ -0,0 +1,104 @@
+"""Corpus DF index against the scorer's in-memory document frequencies."""
+
+import os
+import pickle
+import random
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('nltk')
+
+from eval_metric.evaluators import cider as C
+from eval_metric.evaluators.cider_index import CorpusDFIndex, build_df_index
+
+
+WORDS = ["a", "man", "woman", "opens", "the", "door", "car", "looks", "at", "smiles", "runs", "away"]
+
+
+@pytest.fixture(autouse=True)
+def _whitespace_tokenizer(monkeypatch):
+    # No NLTK tokenizer data needed
+    monkeypatch.setattr(C, 'word_tokenize', str.split)
+
+
+def _write_csvs(tmp_path, rng, n_files=3, rows=30):
+    """Write reference CSVs; returns their paths and the texts of their 'ad' rows."""
+    paths, ad_texts = [], []
+    for k in range(n_files):
+        frame = pd.DataFrame({
+            'start': [float(t) for t in range(rows)],
+            'end': [t + 1.5 for t in range(rows)],
+            'text': [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 10))) for _ in range(rows)],
+            'speech_type': [rng.choice(['ad', 'ad', 'dialogue']) for _ in range(rows)],
+        })
+        path = tmp_path / f"film_{k}.csv"
+        frame.to_csv(path, index=False)
+        paths.append(str(path))
+        ad_texts += frame.loc[frame['speech_type'] == 'ad', 'text'].tolist()
+    return paths, ad_texts
+
+
+def test_build_then_load_round_trip(tmp_path):
+    paths, ad_texts = _write_csvs(tmp_path, random.Random(0))
+    output = str(tmp_path / "index")
+    built = build_df_index(paths, output, n=3, show_progress=False)
+    
+    loaded = CorpusDFIndex(output)
+    assert (loaded.n, loaded.num_docs, len(loaded)) == (3, len(ad_texts), len(built))
+    assert loaded.meta['sources'] == [os.path.abspath(p) for p in paths]
+    assert (loaded.keys == built.keys).all() and (loaded.counts == built.counts).all()
+    
+    copy = pickle.loads(pickle.dumps(loaded))
+    assert copy.path == output and len(copy) == len(loaded)
+    
+    # Rebuilding over an existing index replaces it
+    rebuilt = build_df_index(paths[:1], output, n=2, show_progress=False)
+    assert rebuilt.n == 2 and rebuilt.num_docs < loaded.num_docs
+
+
+@pytest.mark.parametrize('filter_ad_only', [True, False])
+def test_lookups_match_in_memory_doc_freq(tmp_path, filter_ad_only):
+    rng = random.Random(1)
+    paths, ad_texts = _write_csvs(tmp_path, rng)
+    index = build_df_index(paths, str(tmp_path / "index"), filter_ad_only=filter_ad_only, show_progress=False)
+    
+    texts = ad_texts if filter_ad_only else [t for p in paths for t in pd.read_csv(p)['text'].tolist()]
+    scorer = C.CIDErScorer(n=4)
+    scorer.compute_doc_freq(texts)
+    assert index.num_docs == scorer.ref_len
+    assert len(index) == len(scorer.document_frequency)
+    
+    ngrams = list(scorer.document_frequency) + [("never", "seen"), ("zebra",)]
+    expected = [scorer.document_frequency.get(ng, 0) for ng in ngrams]
+    assert index.lookup(ngrams).tolist() == expected
+    assert [index.get(ng) for ng in ngrams] == expected
+    
+    # Scores with the index equal scores with the same in-memory frequencies
+    hypotheses = [" ".join(rng.choice(WORDS) for _ in range(6)) for _ in range(20)]
+    indexed = C.CIDErScorer(n=4)
+    indexed.use_df_index(index)
+    references = texts[:20]
+    assert indexed.compute_scores(references, hypotheses).tolist() == pytest.approx(
+        scorer.compute_scores(references, hypotheses).tolist(), abs=1e-12
+    )
+
+
+def test_refuses_to_replace_non_index_directory(tmp_path):
+    paths, _ = _write_csvs(tmp_path, random.Random(2), n_files=1)
+    output = tmp_path / "data"
+    output.mkdir()
+    (output / "notes.txt").write_text("keep me")
+    
+    with pytest.raises(FileExistsError):
+        build_df_index(paths, str(output), show_progress=False)
+    assert (output / "notes.txt").read_text() == "keep me"
+    
+    index = build_df_index(paths, str(output), show_progress=False, force=True)
+    assert not (output / "notes.txt").exists()
+    assert index.num_docs > 0
+    
+    # An empty directory is fine without force
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    assert build_df_index(paths, str(empty), show_progress=False).num_docs == index.num_docs
@@ -0,0 +1,254 @@
+"""CRITIC batching, windowing and mention mapping with a stand-in coreference model."""
+
+import random
+import re
+import threading
+
+import numpy as np
+import pytest
+
+from eval_metric.utils import ADEvent
+from eval_metric.matchers import DPMatcher
+from eval_metric.evaluators import critic as C
+
+
+class _NameCoref:
+    """Coreference stand-in: one cluster per character name, over all its occurrences."""
+    
+    def __init__(self, names):
+        self.names = names
+        self.calls = []
+    
+    def predict(self, texts):
+        self.calls.append(list(texts))
+        preds = []
+        for text in texts:
+            clusters = []
+            for name in self.names:
+                spans = [m.span() for m in re.finditer(rf'\b{re.escape(name)}\b', text)]
+                if len(spans) > 1:
+                    clusters.append(spans)
+            preds.append(C.MergedCoref(text, sorted(clusters, key=lambda c: c[0])))
+        return preds
+
+
+# ============================================================
+# Coreference Micro-Batching
+# ============================================================
+
+def test_batcher_returns_results_in_order_and_batches_requests():
+    model = _NameCoref(["Anna"])
+    batcher = C.CorefBatcher(model, max_batch=4, max_wait=0.05)
+    texts = [f"Anna. Anna waves {k}." for k in range(10)]
+    preds = batcher.predict(texts)
+    
+    assert [p.text for p in preds] == texts
+    assert batcher.texts == 10 and 3 <= batcher.batches <= 4
+    assert all(len(call) <= 4 for call in model.calls)
+
+
+def test_batcher_serves_concurrent_callers():
+    model = _NameCoref(["Anna"])
+    batcher = C.CorefBatcher(model, max_batch=32, max_wait=0.2)
+    results = {}
+    
+    def call(k):
+        results[k] = batcher.predict([f"text {k}"])[0].text
+    
+    threads = [threading.Thread(target=call, args=(k,)) for k in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == {k: f"text {k}" for k in range(8)}
+    assert batcher.batches < 8
+
+
+def test_batcher_passes_model_errors_to_callers():
+    class Failing:
+        def predict(self, texts):
+            raise RuntimeError("model failed")
+    
+    batcher = C.CorefBatcher(Failing(), max_wait=0.0)
+    with pytest.raises(RuntimeError, match="model failed"):
+        batcher.predict(["a", "b"])
+
+
+# ============================================================
+# Windowed Coreference
+# ============================================================
+
+def _window_size(lengths, start, end):
+    return sum(lengths[start:end]) + (end - start - 1)
+
+
+@pytest.mark.parametrize('overlap', [0, 1, 2, 5])
+@pytest.mark.parametrize('seed', range(20))
+def test_window_bounds_cover_pairs_on_boundaries(overlap, seed):
+    rng = random.Random(seed)
+    lengths = [rng.choice([0, 5, 20, 60, 150]) for _ in range(rng.randint(1, 40))]
+    window_chars = rng.choice([50, 100, 400])
+    bounds = C.window_bounds(lengths, window_chars, overlap)
+    
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(lengths)
+    prev_start, prev_end = -1, 0
+    for start, end in bounds:
+        # Each window starts past the previous one, shares up to `overlap`
+        # pairs with it and adds at least one new pair
+        assert start == (0 if prev_start < 0 else max(prev_start + 1, prev_end - overlap))
+        assert end > prev_end
+        # Windows grow to the size limit, except to add their first new pair
+        assert end == prev_end + 1 or _window_size(lengths, start, end) <= window_chars
+        if end < len(lengths):
+            assert _window_size(lengths, start, end + 1) > window_chars
+        prev_start, prev_end = start, end
+
+
+def _naive_merge(window_clusters):
+    clusters = [set(c) for clusters in window_clusters for c in clusters]
+    merged = True
+    while merged:
+        merged = False
+        for a in range(len(clusters)):
+            for b in range(a + 1, len(clusters)):
+                if clusters[a] & clusters[b]:
+                    clusters[a] |= clusters.pop(b)
+                    merged = True
+                    break
+            if merged:
+                break
+    return sorted((sorted(c) for c in clusters), key=lambda c: c[0])
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_merge_window_clusters_joins_shared_mentions(seed):
+    rng = random.Random(seed)
+    spans = [(s, s + rng.randint(1, 4)) for s in rng.sample(range(0, 200, 5), 30)]
+    window_clusters = [
+        [rng.sample(spans, rng.randint(1, 3)) for _ in range(rng.randint(0, 4))]
+        for _ in range(rng.randint(1, 5))
+    ]
+    assert C.merge_window_clusters(window_clusters) == _naive_merge(window_clusters)
+
+
+NAMES = ["Anna", "Ben", "Clara"]
+WORDS = ["walks", "to", "the", "door", "and", "smiles", "at", "car", "looks", "she", "he"]
+
+
+def _pair_texts(rng, n):
+    texts = []
+    for _ in range(n):
+        words = [rng.choice(WORDS + NAMES) for _ in range(rng.randint(0, 12))]
+        texts.append(" ".join(words))
+    return texts
+
+
+@pytest.fixture
+def make_evaluator(monkeypatch):
+    """CRITICEvaluator with the name-matching stand-in as its coreference model."""
+    monkeypatch.setattr(C, 'FCOREF_AVAILABLE', True)
+    
+    def create(**kwargs):
+        evaluator = C.CRITICEvaluator(characters=NAMES, n_jobs=1, **kwargs)
+        evaluator.coref_model = _NameCoref(NAMES)
+        return evaluator
+    
+    return create
+
+
+@pytest.mark.parametrize('window_overlap', [0, 2])
+@pytest.mark.parametrize('seed', range(10))
+def test_windowed_prediction_matches_full_text(make_evaluator, window_overlap, seed):
+    rng = random.Random(seed)
+    texts = _pair_texts(rng, rng.randint(1, 30))
+    full = make_evaluator(coref_mode='full')
+    windowed = make_evaluator(coref_mode='windowed', window_chars=80, window_overlap=window_overlap)
+    
+    expected = full._predict_joined(texts, full.roles_str)
+    merged = windowed._predict_joined(texts, windowed.roles_str)
+    assert merged.text == expected.text
+    assert merged.get_clusters(as_strings=False) == expected.get_clusters(as_strings=False)
+    assert merged.get_clusters() == expected.get_clusters()
+
+
+# ============================================================
+# Mention Rows
+# ============================================================
+
+def _baseline_rows(texts, prefix_len, spans):
+    """The original per-character source index and its np.mean != np.max rejection."""
+    source_idx = [-1] * prefix_len
+    for k, text in enumerate(texts):
+        source_idx.extend(([-1] if k else []) + [k] * len(text))
+    rows = []
+    for s, e in spans:
+        item = source_idx[s:e]
+        if np.mean(item) != np.max(item) or item[0] == -1:
+            rows.append(-1)
+        else:
+            rows.append(int(item[0]))
+    return rows
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_mention_rows_match_source_index(seed):
+    rng = random.Random(seed)
+    texts = _pair_texts(rng, rng.randint(1, 15))
+    prefix_len = rng.choice([1, 12])
+    joined = " " * prefix_len + " ".join(texts)
+    
+    # Every non-empty span within the joined text: inside a pair, in the
+    # prefix, on a separator or across pairs
+    spans = [(s, e) for s in range(len(joined)) for e in range(s + 1, min(s + 12, len(joined)) + 1)]
+    starts, ends = C.pair_offsets(texts, prefix_len)
+    for k, text in enumerate(texts):
+        assert joined[starts[k]:ends[k]] == text
+    assert C.mention_rows(spans, starts, ends).tolist() == _baseline_rows(texts, prefix_len, spans)
+
+
+def test_mention_rows_reject_empty_and_handle_no_pairs():
+    starts, ends = C.pair_offsets(["ab", "cd"], 3)
+    assert starts.tolist() == [3, 6] and ends.tolist() == [5, 8]
+    assert C.mention_rows([(3, 3), (3, 5), (5, 6), (4, 7)], starts, ends).tolist() == [-1, 0, -1, -1]
+    assert C.mention_rows([], starts, ends).tolist() == []
+    empty_starts, empty_ends = C.pair_offsets([], 3)
+    assert C.mention_rows([(0, 2)], empty_starts, empty_ends).tolist() == [-1]
+
+
+def test_build_synonym_maps_mentions_to_pairs(make_evaluator):
+    evaluator = make_evaluator()
+    texts = ["Anna walks", "she smiles at Ben", "", "Anna and Ben"]
+    prefix_len = len(evaluator.roles_str) + 1
+    coref = evaluator._predict_joined(texts, evaluator.roles_str)
+    starts, ends = C.pair_offsets(texts, prefix_len)
+    
+    _, origins, cids = evaluator._build_synonym(coref, starts, ends, NAMES)
+    assert cids == {0: ["Anna"], 1: ["Ben"], 2: [], 3: ["Anna", "Ben"]}
+    assert origins[3] == ["Anna", "Ben"]
+
+
+# ============================================================
+# Reference Cache
+# ============================================================
+
+def test_reference_coreference_reused_from_cache(make_evaluator, tmp_path):
+    rng = random.Random(0)
+    ref_texts, gen_texts = _pair_texts(rng, 12), _pair_texts(rng, 12)
+    ref_events = [ADEvent(start=10.0 * k, end=10.0 * k + 5, text=t or "door", index=k)
+                  for k, t in enumerate(ref_texts)]
+    gen_events = [ADEvent(start=10.0 * k, end=10.0 * k + 5, text=t or "car", index=k)
+                  for k, t in enumerate(gen_texts)]
+    pairs = DPMatcher().match(gen_events, ref_events)
+    
+    first = make_evaluator(cache_dir=str(tmp_path))
+    expected = first.evaluate_batch(pairs, show_progress=False)
+    assert len(first.coref_model.calls) == 2
+    assert any(p['ref_characters'] for p in expected.pairs)
+    
+    second = make_evaluator(cache_dir=str(tmp_path))
+    result = second.evaluate_batch(pairs, show_progress=False)
+    (call,) = second.coref_model.calls  # generated side only
+    assert call[0].endswith(" ".join(p.combined_gen_text for p in pairs if p.matched))
+    assert [p['score'] for p in result.pairs] == [p['score'] for p in expected.pairs]
+    assert [p['ref_characters'] for p in result.pairs] == [p['ref_characters'] for p in expected.pairs]
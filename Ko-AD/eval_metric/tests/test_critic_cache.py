@@ -0,0 +1,78 @@
+"""CRITIC reference cache keys and storage."""
+
+import json
+
+from eval_metric.evaluators import critic_cache as CC
+from eval_metric.evaluators.critic_cache import CRITICCache
+
+
+SETTINGS = {'model': 'FCoref', 'fastcoref': '2.1.6', 'transformers': '4.40.0', 'coref_mode': 'full'}
+
+
+def test_round_trip_and_missing_entries(tmp_path):
+    cache = CRITICCache(str(tmp_path))
+    value = {'clusters': [[[0, 4], [10, 14]]], 'characters': {'0': ["Anna"], '3': ["Anna", "Bén"]}}
+    assert cache.get('coref', 'abc') is None
+    
+    cache.put('coref', 'abc', value)
+    assert CRITICCache(str(tmp_path)).get('coref', 'abc') == value
+    assert cache.get('characters', 'abc') is None  # kinds are separate
+    
+    # Overwrites replace the entry; unreadable entries count as missing
+    cache.put('coref', 'abc', {'characters': {}})
+    assert cache.get('coref', 'abc') == {'characters': {}}
+    with open(cache._path('coref', 'bad'), 'w', encoding='utf-8') as f:
+        f.write('{"truncated": ')
+    assert cache.get('coref', 'bad') is None
+    assert not [p for p in (tmp_path / 'coref').iterdir() if p.suffix == '.tmp']
+
+
+def test_coref_key_depends_on_texts_roles_and_settings():
+    key = CRITICCache.coref_key(["Anna walks", "Ben runs"], "Anna and Ben.", SETTINGS)
+    assert key == CRITICCache.coref_key(["Anna walks", "Ben runs"], "Anna and Ben.", dict(SETTINGS))
+    
+    assert key != CRITICCache.coref_key(["Ben runs", "Anna walks"], "Anna and Ben.", SETTINGS)
+    assert key != CRITICCache.coref_key(["Anna walks Ben", "runs"], "Anna and Ben.", SETTINGS)
+    assert key != CRITICCache.coref_key(["Anna walks", "Ben runs", ""], "Anna and Ben.", SETTINGS)
+    assert key != CRITICCache.coref_key(["Anna walks", "Ben runs"], "Anna.", SETTINGS)
+    windowed = {**SETTINGS, 'coref_mode': 'windowed', 'window_chars': 4000, 'window_overlap': 2}
+    assert key != CRITICCache.coref_key(["Anna walks", "Ben runs"], "Anna and Ben.", windowed)
+
+
+def test_characters_key_follows_file_contents(tmp_path):
+    first = tmp_path / "a.csv"
+    first.write_text("start,end,text\n0,1,Anna walks\n")
+    copy = tmp_path / "b.csv"
+    copy.write_text(first.read_text())
+    
+    key = CRITICCache.characters_key(str(first), 2, False)
+    assert key == CRITICCache.characters_key(str(copy), 2, False)
+    assert key != CRITICCache.characters_key(str(first), 3, False)
+    assert key != CRITICCache.characters_key(str(first), 2, True)
+    
+    copy.write_text("start,end,text\n0,1,Ben runs\n")
+    assert key != CRITICCache.characters_key(str(copy), 2, False)
+
+
+def test_cached_characters_extracted_once(tmp_path, monkeypatch):
+    csv_path = tmp_path / "ref.csv"
+    csv_path.write_text("start,end,text\n0,1,Anna walks\n")
+    calls = []
+    
+    def extract(path, min_count=2, use_spacy=True):
+        calls.append(path)
+        return ["Anna", "Bén"]
+    
+    monkeypatch.setattr(CC, 'extract_characters_from_csv', extract)
+    cache_dir = str(tmp_path / "cache")
+    assert CC.cached_characters_from_csv(str(csv_path), cache_dir, use_spacy=False) == ["Anna", "Bén"]
+    assert CC.cached_characters_from_csv(str(csv_path), cache_dir, use_spacy=False) == ["Anna", "Bén"]
+    assert len(calls) == 1
+    
+    # Stored as plain JSON
+    (entry,) = (tmp_path / "cache" / "characters").iterdir()
+    assert json.loads(entry.read_text(encoding='utf-8')) == ["Anna", "Bén"]
+    
+    # Without a cache directory nothing is stored
+    CC.cached_characters_from_csv(str(csv_path), None, use_spacy=False)
+    assert len(calls) == 2
@@ -0,0 +1,62 @@
+"""EmbeddingCache shard storage and compaction."""
+
+import os
+
+import numpy as np
+
+from eval_metric.embeddings import EmbeddingCache
+
+
+def _shards(cache):
+    return [name for name in os.listdir(cache.cache_dir) if name.endswith('.npz')]
+
+
+def _arrays(rng, texts):
+    return {t: rng.random(8).astype(np.float32) for t in texts}
+
+
+def test_round_trip_across_instances(tmp_path):
+    rng = np.random.default_rng(0)
+    stored = _arrays(rng, [f"text {k}" for k in range(10)])
+    EmbeddingCache(str(tmp_path), "model").put_many(stored)
+
+    found = EmbeddingCache(str(tmp_path), "model").get_many(list(stored) + ["missing"])
+    assert set(found) == set(stored)
+    for text, array in stored.items():
+        assert found[text].shape == array.shape
+        np.testing.assert_array_equal(found[text], array)
+
+
+def test_compacts_once_shard_count_exceeds_limit(tmp_path):
+    rng = np.random.default_rng(1)
+    cache = EmbeddingCache(str(tmp_path), "model", max_shards=4)
+    stored = {}
+    for batch in range(11):
+        arrays = _arrays(rng, [f"batch {batch} text {k}" for k in range(3)])
+        cache.put_many(arrays)
+        stored.update(arrays)
+        assert len(_shards(cache)) <= 4
+
+    found = EmbeddingCache(str(tmp_path), "model", max_shards=4).get_many(list(stored))
+    assert set(found) == set(stored)
+    for text, array in stored.items():
+        np.testing.assert_array_equal(found[text], array)
+
+
+def test_compacts_existing_shards_on_load(tmp_path):
+    rng = np.random.default_rng(2)
+    stored = {}
+    for batch in range(6):
+        arrays = _arrays(rng, [f"batch {batch} text {k}" for k in range(2)])
+        EmbeddingCache(str(tmp_path), "model").put_many(arrays)
+        stored.update(arrays)
+    assert len(_shards(EmbeddingCache(str(tmp_path), "model"))) == 6
+
+    cache = EmbeddingCache(str(tmp_path), "model", max_shards=3)
+    found = cache.get_many(list(stored))
+    assert len(_shards(cache)) == 1
+    assert set(found) == set(stored)
+
+    reloaded = EmbeddingCache(str(tmp_path), "model").get_many(list(stored))
+    for text, array in stored.items():
+        np.testing.assert_array_equal(reloaded[text], array)
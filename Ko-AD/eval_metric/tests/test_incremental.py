@@ -0,0 +1,123 @@
+"""IncrementalMatcher.apply() must agree with a fresh match() on the edited events."""
+
+import random
+
+import pytest
+
+from eval_metric.utils import ADEvent
+from eval_metric.matchers import ClusterMatcher, OverlapMatcher, DPMatcher, AssignmentMatcher, AnchoredDPMatcher
+from eval_metric.incremental import IncrementalMatcher, EventEdit
+
+
+WORDS = ["man", "woman", "door", "car", "runs", "opens", "looks", "smiles", "rain", "night"]
+
+
+def _text(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5)))
+
+
+def _random_events(rng, n, horizon):
+    events = []
+    for _ in range(n):
+        start = round(rng.uniform(-5, horizon), 1)
+        events.append((start, round(start + rng.uniform(0.2, 12), 1), _text(rng)))
+    events.sort()
+    return [ADEvent(start=s, end=e, text=t, index=k) for k, (s, e, t) in enumerate(events)]
+
+
+def _random_edit(rng, gen_events, horizon):
+    kind = rng.choice(['insert', 'delete', 'modify'])
+    if kind != 'insert' and gen_events:
+        target = rng.choice(gen_events)
+        start, end = target.start, target.start
+    else:
+        start = end = round(rng.uniform(0, horizon), 1)
+    events = []
+    if kind != 'delete':
+        new_start = round(start + rng.uniform(-2, 2), 1)
+        events.append(ADEvent(start=new_start, end=round(new_start + rng.uniform(0.2, 40), 1), text=_text(rng)))
+    return EventEdit(start=start, end=end, events=events)
+
+
+def _signature(pairs):
+    return [(p.match_type, p.matched, p.gen_indices, p.ref_indices) for p in pairs]
+
+
+@pytest.mark.parametrize('matcher', [ClusterMatcher(0.5), ClusterMatcher(1.0), OverlapMatcher(0.5)])
+@pytest.mark.parametrize('seed', range(40))
+def test_apply_matches_full_run(matcher, seed):
+    rng = random.Random(seed)
+    horizon = 120
+    gen_events = _random_events(rng, rng.randint(0, 25), horizon)
+    ref_events = _random_events(rng, rng.randint(1, 25), horizon)
+    
+    inc = IncrementalMatcher(matcher)
+    state = inc.start(gen_events, ref_events)
+    for _ in range(8):
+        state = inc.apply(state, _random_edit(rng, state.gen_events, horizon))
+        full = inc.start(state.gen_events, ref_events)
+        assert _signature(state.pairs) == _signature(full.pairs)
+        assert state.coverage == full.coverage
+
+
+@pytest.mark.parametrize('matcher', [DPMatcher(), DPMatcher(w_time=0.7, w_text=0.3, gap_penalty_ref=-0.05),
+                                     DPMatcher(dp_fill='loop'), DPMatcher(band_sec=15.0)])
+@pytest.mark.parametrize('seed', range(40))
+def test_dp_apply_matches_full_run(matcher, seed):
+    rng = random.Random(seed)
+    horizon = 300
+    gen_events = _random_events(rng, rng.randint(0, 60), horizon)
+    ref_events = _random_events(rng, rng.randint(1, 60), horizon)
+    
+    inc = IncrementalMatcher(matcher)
+    state = inc.start(gen_events, ref_events)
+    assert _signature(state.pairs) == _signature(matcher.match(gen_events, ref_events))
+    for _ in range(8):
+        previous = state
+        state = inc.apply(state, _random_edit(rng, state.gen_events, horizon))
+        full = matcher.match(state.gen_events, ref_events)
+        assert _signature(state.pairs) == _signature(full)
+        assert [p.score for p in state.pairs] == [p.score for p in full]
+        assert state.coverage == inc.start(state.gen_events, ref_events).coverage
+    
+    # Earlier states stay usable after later edits
+    again = inc.apply(previous, EventEdit(start=0, end=horizon))
+    assert _signature(again.pairs) == _signature(matcher.match(again.gen_events, ref_events))
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_dp_apply_is_optimal_with_ties(seed):
+    # Temporal IoU gives many zero similarities, so several alignments can share
+    # the optimal score; any of them is a correct result
+    matcher = DPMatcher(time_soft=False)
+    rng = random.Random(seed)
+    horizon = 300
+    gen_events = _random_events(rng, rng.randint(0, 60), horizon)
+    ref_events = _random_events(rng, rng.randint(1, 60), horizon)
+    
+    inc = IncrementalMatcher(matcher)
+    state = inc.start(gen_events, ref_events)
+    for _ in range(8):
+        state = inc.apply(state, _random_edit(rng, state.gen_events, horizon))
+        full = matcher.match(state.gen_events, ref_events)
+        assert sum(p.score for p in state.pairs) == pytest.approx(sum(p.score for p in full), abs=1e-9)
+        assert sorted(e.index for p in state.pairs for e in p.gen_events) == sorted(e.index for e in state.gen_events)
+        if state.gen_events:
+            assert sorted(j for p in state.pairs for j in p.ref_positions) == list(range(len(ref_events)))
+
+
+def test_unmatched_cluster_members_are_reclustered():
+    gen_events = [ADEvent(start=-5, end=0.6, text="a", index=0), ADEvent(start=0, end=10, text="b", index=1)]
+    ref_events = [ADEvent(start=30, end=40, text="c", index=0)]
+    inc = IncrementalMatcher(ClusterMatcher(0.5))
+    
+    state = inc.apply(inc.start(gen_events, ref_events),
+                      EventEdit(start=2, end=2, events=[ADEvent(start=2, end=35, text="d")]))
+    assert _signature(state.pairs) == [('cluster', True, [0, 1, 2], [0])]
+    assert state.coverage['gen_matched'] == 3
+
+
+@pytest.mark.parametrize('matcher', [AssignmentMatcher(), AnchoredDPMatcher()])
+def test_dp_subclasses_are_rejected(matcher):
+    with pytest.raises(ValueError):
+        IncrementalMatcher(matcher)
@@ -0,0 +1,93 @@
+"""Regression tests for the matchers against their straightforward reference versions."""
+
+import random
+
+import numpy as np
+import pytest
+
+from eval_metric.utils import ADEvent
+from eval_metric import matchers
+from eval_metric.matchers import AssignmentMatcher, ClusterMatcher, UnionFind
+
+
+def _pairwise_clusters(events, min_overlap):
+    """The original all-pairs clustering, kept as the reference."""
+    uf = UnionFind(len(events))
+    for i in range(len(events)):
+        for j in range(i + 1, len(events)):
+            if events[i].overlaps_with(events[j], min_overlap):
+                uf.union(i, j)
+    return uf
+
+
+def _partition(uf, n):
+    groups = {}
+    for i in range(n):
+        groups.setdefault(uf.find(i), []).append(i)
+    return sorted(groups.values())
+
+
+def _random_events(rng, n):
+    events = []
+    for k in range(n):
+        # A coarse grid makes touching intervals and exact-threshold overlaps common
+        start = rng.randint(0, 60) * 0.5
+        if rng.random() < 0.3 and events:
+            start = rng.choice(events).end  # touches an earlier event
+        end = start + rng.choice([0.0, 0.25, 0.5, 1.0, 1.5, 3.0, 8.0])
+        events.append(ADEvent(start=start, end=end, text=f"event {k}", index=k))
+    return events
+
+
+@pytest.mark.parametrize('min_overlap', [-1.0, 0.0, 0.25, 0.5, 1.0, 3.0])
+@pytest.mark.parametrize('seed', range(50))
+def test_sweep_clusters_match_pairwise(min_overlap, seed):
+    rng = random.Random(seed)
+    events = _random_events(rng, rng.randint(0, 40))
+    starts = np.array([e.start for e in events], dtype=float)
+    ends = np.array([e.end for e in events], dtype=float)
+    
+    uf = ClusterMatcher(min_overlap)._build_clusters(starts, ends)
+    assert _partition(uf, len(events)) == _partition(_pairwise_clusters(events, min_overlap), len(events))
+
+
+def test_touching_intervals():
+    events = [ADEvent(start=0.0, end=1.0, text="a"), ADEvent(start=1.0, end=2.0, text="b")]
+    starts = np.array([0.0, 1.0])
+    ends = np.array([1.0, 2.0])
+    # Touching intervals overlap by zero seconds: related only at a zero threshold
+    assert _partition(ClusterMatcher(0.0)._build_clusters(starts, ends), 2) == [[0, 1]]
+    assert _partition(ClusterMatcher(0.5)._build_clusters(starts, ends), 2) == [[0], [1]]
+    assert _partition(_pairwise_clusters(events, 0.0), 2) == [[0, 1]]
+
+
+def _signature(pairs):
+    return [(p.match_type, p.matched, p.gen_indices, p.ref_indices) for p in pairs]
+
+
+def test_assignment_small_input_stays_in_process():
+    rng = random.Random(0)
+    gen_events, ref_events = _random_events(rng, 30), _random_events(rng, 30)
+    matcher = AssignmentMatcher(n_jobs=2)
+    pairs = matcher.match(gen_events, ref_events)
+    assert matcher._executor is None
+    assert matcher.last_stats['n_jobs'] == 1
+    assert _signature(pairs) == _signature(AssignmentMatcher().match(gen_events, ref_events))
+
+
+def test_assignment_reuses_worker_pool(monkeypatch):
+    monkeypatch.setattr(matchers, '_PARALLEL_ASSIGNMENT_CELLS', 0)
+    rng = random.Random(1)
+    gen_events, ref_events = _random_events(rng, 30), _random_events(rng, 30)
+    matcher = AssignmentMatcher(n_jobs=2, window_sec=1.0)
+    try:
+        first = matcher.match(gen_events, ref_events)
+        executor = matcher._executor
+        second = matcher.match(gen_events, ref_events)
+        assert executor is not None and matcher._executor is executor
+        assert matcher.last_stats['n_jobs'] == 2
+    finally:
+        matcher.close()
+    assert matcher._executor is None
+    expected = _signature(AssignmentMatcher(window_sec=1.0).match(gen_events, ref_events))
+    assert _signature(first) == _signature(second) == expected
@@ -0,0 +1,102 @@
+"""Memoized METEOR lexicon against NLTK's meteor_score."""
+
+import random
+
+import pytest
+
+pytest.importorskip('nltk')
+from nltk.stem.porter import PorterStemmer
+from nltk.translate.meteor_score import meteor_score
+
+from eval_metric.evaluators import meteor as M
+
+
+class _FakeLemma:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class _FakeSynset:
+    def __init__(self, names):
+        self._lemmas = [_FakeLemma(n) for n in names]
+
+    def lemmas(self):
+        return self._lemmas
+
+
+class _FakeWordNet:
+    """Small WordNet stand-in with overlapping synsets and multi-word lemmas."""
+
+    SYNSETS = {
+        'walks': [['walk', 'walks', 'go_on_foot'], ['walk', 'stroll']],
+        'looks': [['look', 'looks'], ['look', 'appear', 'seem'], ['search', 'look']],
+        'man': [['man', 'adult_male'], ['man', 'homo', 'human']],
+        'car': [['car', 'auto', 'automobile']],
+        'runs': [['run', 'runs', 'go'], ['run', 'operate']],
+        'door': [['door', 'doorway']],
+    }
+
+    def __init__(self):
+        self.calls = 0
+
+    def synsets(self, word):
+        self.calls += 1
+        return [_FakeSynset(names) for names in self.SYNSETS.get(word, [])]
+
+    def ensure_loaded(self):
+        pass
+
+
+WORDS = ['man', 'human', 'car', 'auto', 'walks', 'stroll', 'walk', 'looks', 'seem',
+         'search', 'runs', 'go', 'operate', 'door', 'doorway', 'the', 'a', 'slowly']
+
+
+def _sentence(rng):
+    return [rng.choice(WORDS) for _ in range(rng.randint(1, 12))]
+
+
+def test_cached_wordnet_matches_reader():
+    rng = random.Random(0)
+    reader = _FakeWordNet()
+    cached = M.CachedWordNet(reader)
+    stemmer = M.CachedStemmer()
+    for _ in range(300):
+        gen, ref = _sentence(rng), _sentence(rng)
+        expected = meteor_score([ref], gen, stemmer=PorterStemmer(), wordnet=_FakeWordNet())
+        assert meteor_score([ref], gen, stemmer=stemmer, wordnet=cached) == expected
+    # One lookup per distinct word
+    assert reader.calls <= len(WORDS)
+
+
+def test_synonyms_drop_multiword_lemmas_once():
+    cached = M.CachedWordNet(_FakeWordNet())
+    assert cached.synonyms('walks') == ['walk', 'walks', 'stroll']
+    assert cached.synonyms('unknown') == []
+
+
+def test_pair_score_uses_nltk_defaults(monkeypatch):
+    monkeypatch.setattr(M, 'word_tokenize', str.split)
+    monkeypatch.setattr(M, '_STEMMER', M.CachedStemmer())
+    monkeypatch.setattr(M, '_WORDNET', M.CachedWordNet(_FakeWordNet()))
+    rng = random.Random(1)
+    for _ in range(100):
+        gen, ref = _sentence(rng), _sentence(rng)
+        expected = meteor_score([ref], gen, wordnet=_FakeWordNet())
+        assert M.meteor_score_pair(' '.join(gen), ' '.join(ref)) == expected
+
+
+def test_failed_pair_reports_error(monkeypatch):
+    def tokenize(text):
+        if text == 'bad':
+            raise ValueError('cannot tokenize')
+        return text.split()
+
+    monkeypatch.setattr(M, 'word_tokenize', tokenize)
+    monkeypatch.setattr(M, '_STEMMER', M.CachedStemmer())
+    monkeypatch.setattr(M, '_WORDNET', M.CachedWordNet(_FakeWordNet()))
+    results = M.meteor_scores([('the man', 'a man'), ('bad', 'a car'), ('car', 'auto')])
+    assert results[0][1] is None and results[2][1] is None
+    assert results[1] == (None, 'cannot tokenize')
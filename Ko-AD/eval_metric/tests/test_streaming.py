@@ -0,0 +1,91 @@
+"""Streaming matchers against their batch counterparts."""
+
+import random
+
+import pytest
+
+from eval_metric.utils import ADEvent
+from eval_metric.matchers import ClusterMatcher, DPMatcher, OverlapMatcher
+from eval_metric.streaming import StreamingClusterMatcher, StreamingDPMatcher, StreamingOverlapMatcher
+
+
+def _random_events(rng, n, horizon, prefix, max_len=8.0):
+    words = ["man", "woman", "door", "car", "runs", "opens", "looks", "smiles"]
+    events = []
+    for _ in range(n):
+        start = round(rng.uniform(0, horizon), 1)
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(2, 5)))
+        events.append((start, round(start + rng.uniform(0.5, max_len), 1), f"{prefix} {text}"))
+    events.sort()
+    return [ADEvent(start=s, end=e, text=t, index=k) for k, (s, e, t) in enumerate(events)]
+
+
+def _signature(pairs):
+    return [(p.match_type, [e.index for e in p.gen_events], [e.index for e in p.ref_events]) for p in pairs]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_overlap_stream_matches_batch(seed):
+    rng = random.Random(seed)
+    gen_events = _random_events(rng, 60, 300, "gen")
+    ref_events = _random_events(rng, 60, 300, "ref", max_len=rng.choice([8.0, 80.0]))
+    
+    streamed = StreamingOverlapMatcher(0.5).match(gen_events, ref_events)
+    assert _signature(streamed) == _signature(OverlapMatcher(0.5).match(gen_events, ref_events))
+
+
+def _tied_events(rng, n, prefix):
+    # A coarse grid of start times with short and zero-length events makes
+    # equal starts across clusters common
+    events = []
+    for k in range(n):
+        start = rng.randint(0, 40) * 0.5
+        end = start + rng.choice([0.0, 0.25, 0.5, 1.0, 1.5, 3.0, 8.0])
+        events.append(ADEvent(start=start, end=end, text=f"{prefix} {k}", index=k))
+    events.sort(key=lambda e: e.start)  # stable: equal starts stay in random order
+    return events
+
+
+@pytest.mark.parametrize('min_overlap', [0.0, 0.25, 0.5, 1.0])
+@pytest.mark.parametrize('seed', range(40))
+def test_cluster_stream_matches_batch(min_overlap, seed):
+    rng = random.Random(seed)
+    gen_events = _tied_events(rng, rng.randint(0, 30), "gen")
+    ref_events = _tied_events(rng, rng.randint(0, 30), "ref")
+    
+    streamed = StreamingClusterMatcher(min_overlap).match(gen_events, ref_events)
+    assert _signature(streamed) == _signature(ClusterMatcher(min_overlap).match(gen_events, ref_events))
+
+
+def test_overlap_window_pruned_past_long_reference():
+    # A reference spanning the whole stream must not keep expired ones alive
+    ref_events = [ADEvent(start=0.0, end=10000.0, text="long", index=0)]
+    ref_events += [ADEvent(start=float(t), end=t + 1.0, text="short", index=t) for t in range(1, 1000)]
+    gen_events = [ADEvent(start=t + 0.2, end=t + 0.9, text="gen", index=t) for t in range(1, 1000)]
+    
+    matcher = StreamingOverlapMatcher(0.5)
+    largest = 0
+    original = matcher._gen_pair
+    
+    def tracking_gen_pair(gen_event, window):
+        nonlocal largest
+        largest = max(largest, len(window))
+        return original(gen_event, window)
+    
+    matcher._gen_pair = tracking_gen_pair
+    list(matcher.match_stream(gen_events, ref_events))
+    assert largest <= 4
+
+
+@pytest.mark.parametrize('band', [{'band_sec': 5.0}, {'band_radius': 2}, {'band_sec': 3.0, 'band_radius': 1}])
+@pytest.mark.parametrize('seed', range(15))
+def test_dp_stream_loss_within_reported_bound(band, seed):
+    rng = random.Random(seed)
+    gen_events = _random_events(rng, rng.randint(20, 80), 600, "gen")
+    ref_events = _random_events(rng, rng.randint(20, 80), 600, "ref")
+    
+    streaming = StreamingDPMatcher(window_sec=60.0, lookahead_sec=20.0, **band)
+    stream_score = sum(p.score for p in streaming.match(gen_events, ref_events))
+    global_score = sum(p.score for p in DPMatcher(**band).match(gen_events, ref_events))
+    
+    assert global_score - stream_score <= streaming.last_stats['max_score_loss'] + 1e-9
@@ -0,0 +1,88 @@
+"""Sweep settings scored from shared similarity components must match the matchers themselves."""
+
+import random
+
+import pytest
+
+from eval_metric.utils import ADEvent
+from eval_metric.matchers import get_matcher
+from eval_metric.sweep import SimilarityCache, expand_grid, _match_setting
+
+
+def _random_events(rng, n, prefix):
+    words = ["man", "woman", "door", "car", "runs", "opens", "looks", "smiles", "at", "the"]
+    events = []
+    for k in range(n):
+        start = round(rng.uniform(0, 200), 1)
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(2, 6)))
+        events.append((start, round(start + rng.uniform(0.5, 6), 1), f"{prefix} {text}"))
+    events.sort()
+    return [ADEvent(start=s, end=e, text=t, index=k) for k, (s, e, t) in enumerate(events)]
+
+
+def _signature(pairs):
+    return [(p.match_type, p.gen_indices, p.ref_indices, round(float(p.score or 0), 12)) for p in pairs]
+
+
+GRID = {
+    'method': ['dp', 'assignment'],
+    'w_time': [0.3, 0.6],
+    'time_soft': [True, False],
+    'band_sec': [None, 15.0],
+    'band_radius': [None, 2],
+    'window_sec': [5.0, 20.0],
+}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_cached_settings_match_matchers(seed):
+    rng = random.Random(seed)
+    gen_events = _random_events(rng, rng.randint(5, 40), "gen")
+    ref_events = _random_events(rng, rng.randint(5, 40), "ref")
+    settings = expand_grid(GRID, base={'dp_fill': 'wavefront', 'text_sim': 'token'})
+    cache = SimilarityCache(gen_events, ref_events, settings)
+    
+    for setting in settings:
+        kwargs = {k: v for k, v in setting.items() if k != 'method'}
+        expected = get_matcher(setting['method'], **kwargs).match(gen_events, ref_events)
+        assert _signature(_match_setting(setting, gen_events, ref_events, cache)) == _signature(expected)
+
+
+def test_settings_keep_band_fill_and_text_keys():
+    base = {'method': 'dp', 'band_sec': 20.0, 'band_radius': None, 'dp_fill': 'loop',
+            'text_sim': 'embedding', 'embedding_model': 'some-model', 'n_jobs': None}
+    (setting,) = expand_grid({}, base=base)
+    assert setting['band_sec'] == 20.0
+    assert setting['dp_fill'] == 'loop'
+    assert setting['text_sim'] == 'embedding'
+    assert setting['embedding_model'] == 'some-model'
+    
+    (token_setting,) = expand_grid({'text_sim': 'token'}, base=base)
+    assert 'embedding_model' not in token_setting
+
+
+def test_anchored_settings_keep_anchor_keys_and_match_matcher():
+    grid = {
+        'method': 'dp_anchored',
+        'anchor_min_text_sim': [0.4, 0.8],
+        'anchor_margin': 0.1,
+        'n_jobs': 1,
+        'window_sec': 5.0,
+    }
+    settings = expand_grid(grid, base={'w_time': 0.5, 'time_soft': False, 'time_scale': 10.0,
+                                       'text_sim': 'token', 'embedding_model': 'some-model'})
+    assert len(settings) == 2
+    for setting in settings:
+        assert setting['anchor_margin'] == 0.1
+        assert setting['n_jobs'] == 1
+        assert setting['w_time'] == 0.5
+        for key in ('window_sec', 'time_scale', 'embedding_model'):
+            assert key not in setting
+    
+    rng = random.Random(0)
+    gen_events = _random_events(rng, 30, "gen")
+    ref_events = _random_events(rng, 30, "ref")
+    for setting in settings:
+        kwargs = {k: v for k, v in setting.items() if k != 'method'}
+        expected = get_matcher('dp_anchored', **kwargs).match(gen_events, ref_events)
+        assert _signature(_match_setting(setting, gen_events, ref_events, None)) == _signature(expected)
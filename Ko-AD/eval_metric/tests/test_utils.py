@@ -0,0 +1,47 @@
+"""MatchedPair construction, equality and representation."""
+
+import pytest
+
+from eval_metric.utils import ADEvent, EventTable, MatchedPair
+
+
+GEN = [
+    ADEvent(start=1.0, end=3.0, text="A man walks", index=4),
+    ADEvent(start=0.5, end=2.0, text="He stops", index=7),
+]
+REF = [ADEvent(start=0.8, end=2.5, text="A man stops walking", index=2)]
+
+
+def test_from_events_derives_fields():
+    pair = MatchedPair.from_events(GEN, REF, True, 'cluster')
+    assert pair.gen_indices == [4, 7] and pair.ref_indices == [2]
+    assert pair.combined_gen_text == "He stops A man walks"  # start-time order
+    assert (pair.gen_start, pair.gen_end, pair.ref_start, pair.ref_end) == (0.5, 3.0, 0.8, 2.5)
+    assert pair.num_gen_items == 2 and pair.score is None
+    
+    empty = MatchedPair.from_events([], REF, False, 'reference_only')
+    assert empty.gen_indices == [] and empty.gen_start is None and empty.combined_gen_text == ''
+
+
+def test_equality_compares_events_not_storage():
+    table = EventTable(
+        start=[e.start for e in GEN], end=[e.end for e in GEN],
+        texts=[e.text for e in GEN], index=[e.index for e in GEN],
+    )
+    from_table = MatchedPair(table, REF, [0, 1], [0], True, 'cluster')
+    from_list = MatchedPair.from_events(list(GEN), list(REF), True, 'cluster')
+    assert from_table == from_list
+    
+    assert from_list != MatchedPair.from_events(GEN, REF, True, 'cluster', score=0.5)
+    assert from_list != MatchedPair.from_events(GEN, REF, True, 'dp')
+    assert from_list != MatchedPair.from_events(GEN[:1], REF, True, 'cluster')
+    assert from_list != "not a pair"
+    with pytest.raises(TypeError):
+        hash(from_list)
+
+
+def test_repr_lists_pair_fields():
+    text = repr(MatchedPair.from_events(GEN, REF, True, 'cluster', score=0.25))
+    for field in ("gen_indices=[4, 7]", "ref_indices=[2]", "combined_ref_text='A man stops walking'",
+                  "gen_start=0.5", "ref_end=2.5", "matched=True", "match_type='cluster'", "score=0.25"):
+        assert field in text
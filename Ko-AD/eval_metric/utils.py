@@ -5,24 +5,22 @@ This module provides shared functionality used across matchers and evaluators:
 - Timestamp conversion
 - Data loading (JSON/CSV)
 - Output filename generation
-- Data classes
+- Data classes and the columnar EventTable
 """
 
 import os
 import json
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Union
 
 
-@dataclass
-class ADEvent:
-    """Audio Description Event with start time, end time, and text."""
-    start: float
-    end: float
-    text: str
-    index: int = -1  # Original index in the list
+class _EventMethods:
+    """Interval helpers shared by ADEvent and EventView (expects start/end/text/index)."""
+    
+    __slots__ = ()
     
     def duration(self) -> float:
         """Return duration of the event in seconds."""
@@ -51,30 +49,341 @@ class ADEvent:
         }
 
 
-@dataclass
+@dataclass(slots=True)
+class ADEvent(_EventMethods):
+    """Audio Description Event with start time, end time, and text."""
+    start: float
+    end: float
+    text: str
+    index: int = -1  # Original index in the list
+
+
+class EventView(_EventMethods):
+    """Read-only view of one row of an EventTable, usable wherever an ADEvent is read."""
+    
+    __slots__ = ('_table', '_pos')
+    
+    def __init__(self, table: 'EventTable', pos: int):
+        self._table = table
+        self._pos = pos
+    
+    @property
+    def start(self) -> float:
+        return float(self._table.start[self._pos])
+    
+    @property
+    def end(self) -> float:
+        return float(self._table.end[self._pos])
+    
+    @property
+    def text(self) -> str:
+        return self._table.text(self._pos)
+    
+    @property
+    def index(self) -> int:
+        return int(self._table.index[self._pos])
+    
+    def __repr__(self) -> str:
+        return f"EventView(start={self.start!r}, end={self.end!r}, text={self.text!r}, index={self.index!r})"
+
+
+class EventTable:
+    """
+    Columnar store for a sequence of AD events.
+    
+    Start/end times and original indices are NumPy arrays and all texts live
+    in one string buffer addressed by offsets, so a table holds a handful of
+    objects regardless of its length. It behaves like a read-only list of
+    ADEvent: len(), iteration and integer indexing (yielding EventView rows),
+    while slicing or indexing with an array yields another EventTable that
+    shares the same buffers.
+    """
+    
+    __slots__ = ('start', 'end', 'index', '_text_buf', '_text_lo', '_text_hi')
+    
+    def __init__(
+        self,
+        start: Any,
+        end: Any,
+        texts: List[str],
+        index: Optional[Any] = None
+    ):
+        """
+        Build a table from columns.
+        
+        Args:
+            start: Start times in seconds
+            end: End times in seconds
+            texts: Event texts
+            index: Original indices (default: 0..n-1)
+        """
+        self.start = np.asarray(start, dtype=float)
+        self.end = np.asarray(end, dtype=float)
+        n = len(self.start)
+        if len(self.end) != n or len(texts) != n:
+            raise ValueError("start, end and texts must have the same length")
+        self.index = np.arange(n, dtype=np.int64) if index is None else np.asarray(index, dtype=np.int64)
+        
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=n)
+        self._text_buf = ''.join(texts)
+        self._text_hi = np.cumsum(lengths)
+        self._text_lo = self._text_hi - lengths
+    
+    @classmethod
+    def from_events(cls, events: List[ADEvent]) -> 'EventTable':
+        """Build a table from a list of ADEvent (or EventView) objects."""
+        if isinstance(events, EventTable):
+            return events
+        return cls(
+            start=[e.start for e in events],
+            end=[e.end for e in events],
+            texts=[e.text for e in events],
+            index=[e.index for e in events],
+        )
+    
+    def __len__(self) -> int:
+        return len(self.start)
+    
+    def __iter__(self):
+        return (EventView(self, pos) for pos in range(len(self)))
+    
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            pos = int(key)
+            if pos < 0:
+                pos += len(self)
+            if not 0 <= pos < len(self):
+                raise IndexError("EventTable index out of range")
+            return EventView(self, pos)
+        return self.take(key)
+    
+    def __repr__(self) -> str:
+        return f"EventTable({len(self)} events)"
+    
+    def take(self, positions: Any) -> 'EventTable':
+        """
+        Select rows by slice, boolean mask or position array.
+        
+        Args:
+            positions: Anything NumPy accepts as an index
+            
+        Returns:
+            EventTable sharing this table's text buffer
+        """
+        table = object.__new__(EventTable)
+        table.start = self.start[positions]
+        table.end = self.end[positions]
+        table.index = self.index[positions]
+        table._text_buf = self._text_buf
+        table._text_lo = self._text_lo[positions]
+        table._text_hi = self._text_hi[positions]
+        return table
+    
+    def text(self, pos: int) -> str:
+        """Return the text of the event at pos."""
+        return self._text_buf[self._text_lo[pos]:self._text_hi[pos]]
+    
+    def texts(self, positions: Optional[List[int]] = None) -> List[str]:
+        """Return texts for the given positions (default: all, in order)."""
+        buf = self._text_buf
+        if positions is None:
+            return [buf[lo:hi] for lo, hi in zip(self._text_lo.tolist(), self._text_hi.tolist())]
+        return [buf[self._text_lo[p]:self._text_hi[p]] for p in positions]
+    
+    def sort_by_start(self) -> 'EventTable':
+        """Return the table ordered by start time (stable)."""
+        return self.take(np.argsort(self.start, kind='stable'))
+    
+    def to_events(self) -> List[ADEvent]:
+        """Materialize the rows as ADEvent objects."""
+        return [
+            ADEvent(start=s, end=e, text=t, index=i)
+            for s, e, t, i in zip(self.start.tolist(), self.end.tolist(), self.texts(), self.index.tolist())
+        ]
+
+
+# Anything the matchers accept as an event sequence
+EventSequence = Union[List[ADEvent], EventTable]
+
+
+def _event_span(source: EventSequence, positions: List[int]) -> Tuple[Optional[float], Optional[float]]:
+    """Return (min start, max end) over source[positions], or (None, None) if empty."""
+    if len(positions) == 0:
+        return None, None
+    if isinstance(source, EventTable):
+        idx = np.asarray(positions, dtype=np.int64)
+        return float(source.start[idx].min()), float(source.end[idx].max())
+    return min(source[p].start for p in positions), max(source[p].end for p in positions)
+
+
+def _event_indices(source: EventSequence, positions: List[int]) -> List[int]:
+    """Return the original indices of source[positions]."""
+    if isinstance(source, EventTable):
+        return source.index[np.asarray(positions, dtype=np.int64)].tolist()
+    return [source[p].index for p in positions]
+
+
+def _combined_text(source: EventSequence, positions: List[int], separator: str = ' ') -> str:
+    """Join texts of source[positions] in start-time order (as combine_texts does)."""
+    if len(positions) == 0:
+        return ''
+    if isinstance(source, EventTable):
+        idx = np.asarray(positions, dtype=np.int64)
+        ordered = idx[np.argsort(source.start[idx], kind='stable')]
+        return separator.join(source.texts(ordered.tolist()))
+    return combine_texts([source[p] for p in positions], separator)
+
+
 class MatchedPair:
-    """A matched pair of generated and reference AD events."""
-    gen_events: List[ADEvent]
-    ref_events: List[ADEvent]
-    gen_indices: List[int]
-    ref_indices: List[int]
-    combined_gen_text: str
-    combined_ref_text: str
-    gen_start: float
-    gen_end: float
-    ref_start: Optional[float]
-    ref_end: Optional[float]
-    matched: bool
-    match_type: str
-    score: Optional[float] = None
+    """
+    A matched group of generated and reference AD events.
+    
+    Events are referred to by position in the sequences given to the matcher
+    (a list of ADEvent or an EventTable). Event objects, original indices,
+    time spans and combined texts are derived from those on access instead
+    of being copied into every pair.
+    
+    Pairs built from plain event lists use from_events(). Pairs compare
+    equal when their events (start, end, text, index), matched flag, match
+    type and score are equal, wherever the events are stored.
+    """
+    
+    __slots__ = (
+        'gen_source', 'ref_source', 'gen_positions', 'ref_positions',
+        'matched', 'match_type', 'score',
+    )
+    
+    def __init__(
+        self,
+        gen_source: EventSequence,
+        ref_source: EventSequence,
+        gen_positions: List[int],
+        ref_positions: List[int],
+        matched: bool,
+        match_type: str,
+        score: Optional[float] = None
+    ):
+        """
+        Initialize MatchedPair.
+        
+        Args:
+            gen_source: Generated events the matcher was given
+            ref_source: Reference events the matcher was given
+            gen_positions: Positions of the pair's events in gen_source
+            ref_positions: Positions of the pair's events in ref_source
+            matched: Whether the pair has both generated and reference events
+            match_type: Matcher-specific label (e.g. 'cluster', 'generated_only')
+            score: Optional evaluation score
+        """
+        self.gen_source = gen_source
+        self.ref_source = ref_source
+        self.gen_positions = gen_positions
+        self.ref_positions = ref_positions
+        self.matched = matched
+        self.match_type = match_type
+        self.score = score
+    
+    @classmethod
+    def from_events(
+        cls,
+        gen_events: List[ADEvent],
+        ref_events: List[ADEvent],
+        matched: bool,
+        match_type: str,
+        score: Optional[float] = None
+    ) -> 'MatchedPair':
+        """
+        Build a pair whose sources are exactly its own events.
+        
+        Indices, time spans and combined texts are derived from the events.
+        
+        Args:
+            gen_events: Generated events of the pair
+            ref_events: Reference events of the pair
+            matched: Whether the pair has both generated and reference events
+            match_type: Matcher-specific label (e.g. 'cluster', 'generated_only')
+            score: Optional evaluation score
+        """
+        return cls(
+            gen_source=gen_events,
+            ref_source=ref_events,
+            gen_positions=list(range(len(gen_events))),
+            ref_positions=list(range(len(ref_events))),
+            matched=matched,
+            match_type=match_type,
+            score=score,
+        )
+    
+    @property
+    def gen_events(self) -> List[ADEvent]:
+        return [self.gen_source[p] for p in self.gen_positions]
+    
+    @property
+    def ref_events(self) -> List[ADEvent]:
+        return [self.ref_source[p] for p in self.ref_positions]
+    
+    @property
+    def gen_indices(self) -> List[int]:
+        return _event_indices(self.gen_source, self.gen_positions)
+    
+    @property
+    def ref_indices(self) -> List[int]:
+        return _event_indices(self.ref_source, self.ref_positions)
+    
+    @property
+    def combined_gen_text(self) -> str:
+        return _combined_text(self.gen_source, self.gen_positions)
+    
+    @property
+    def combined_ref_text(self) -> str:
+        return _combined_text(self.ref_source, self.ref_positions)
+    
+    @property
+    def gen_start(self) -> Optional[float]:
+        return _event_span(self.gen_source, self.gen_positions)[0]
+    
+    @property
+    def gen_end(self) -> Optional[float]:
+        return _event_span(self.gen_source, self.gen_positions)[1]
+    
+    @property
+    def ref_start(self) -> Optional[float]:
+        return _event_span(self.ref_source, self.ref_positions)[0]
+    
+    @property
+    def ref_end(self) -> Optional[float]:
+        return _event_span(self.ref_source, self.ref_positions)[1]
     
     @property
     def num_gen_items(self) -> int:
-        return len(self.gen_events)
+        return len(self.gen_positions)
     
     @property
     def num_ref_items(self) -> int:
-        return len(self.ref_events)
+        return len(self.ref_positions)
+    
+    def _compare_key(self) -> tuple:
+        events = [
+            [(e.start, e.end, e.text, e.index) for e in side]
+            for side in (self.gen_events, self.ref_events)
+        ]
+        return (*events, self.matched, self.match_type, self.score)
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MatchedPair):
+            return NotImplemented
+        return self._compare_key() == other._compare_key()
+    
+    __hash__ = None  # mutable, like the dataclass it replaced
+    
+    def __repr__(self) -> str:
+        return (
+            f"MatchedPair(gen_indices={self.gen_indices!r}, ref_indices={self.ref_indices!r}, "
+            f"combined_gen_text={self.combined_gen_text!r}, combined_ref_text={self.combined_ref_text!r}, "
+            f"gen_start={self.gen_start!r}, gen_end={self.gen_end!r}, "
+            f"ref_start={self.ref_start!r}, ref_end={self.ref_end!r}, "
+            f"matched={self.matched!r}, match_type={self.match_type!r}, score={self.score!r})"
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for DataFrame/JSON output."""
@@ -131,7 +440,7 @@ def timestamp_to_seconds(timestamp_str: str) -> float:
         return float(timestamp_str)
 
 
-def load_generated_ad(file_path: str) -> List[ADEvent]:
+def load_generated_ad(file_path: str) -> EventTable:
     """
     Load AI-generated AD from JSON file.
     
@@ -151,26 +460,26 @@ def load_generated_ad(file_path: str) -> List[ADEvent]:
         file_path: Path to JSON file
         
     Returns:
-        List of ADEvent objects sorted by start time
+        EventTable sorted by start time
     """
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    events = []
-    for idx, item in enumerate(data.get('audio_descriptions', [])):
-        start = timestamp_to_seconds(item['start_time'])
-        end = timestamp_to_seconds(item['end_time'])
-        text = item.get('description', item.get('text', ''))
-        events.append(ADEvent(start=start, end=end, text=text, index=idx))
+    items = data.get('audio_descriptions', [])
+    events = EventTable(
+        start=[timestamp_to_seconds(item['start_time']) for item in items],
+        end=[timestamp_to_seconds(item['end_time']) for item in items],
+        texts=[item.get('description', item.get('text', '')) for item in items],
+    )
     
-    return sorted(events, key=lambda x: x.start)
+    return events.sort_by_start()
 
 
 def load_reference_ad(
     file_path: str, 
     time_range: Optional[Tuple[float, float]] = None,
     filter_ad_only: bool = True
-) -> List[ADEvent]:
+) -> EventTable:
     """
     Load reference AD from CSV file.
     
@@ -186,7 +495,7 @@ def load_reference_ad(
         filter_ad_only: If True and speech_type column exists, filter to 'ad' only
         
     Returns:
-        List of ADEvent objects sorted by start time
+        EventTable sorted by start time
     """
     df = pd.read_csv(file_path)
     
@@ -199,31 +508,31 @@ def load_reference_ad(
         min_time, max_time = time_range
         df = df[(df['start'] <= max_time) & (df['end'] >= min_time)].copy()
     
-    events = []
-    for idx, (_, row) in enumerate(df.iterrows()):
-        events.append(ADEvent(
-            start=float(row['start']),
-            end=float(row['end']),
-            text=str(row['text']),
-            index=idx
-        ))
+    events = EventTable(
+        start=df['start'].to_numpy(dtype=float),
+        end=df['end'].to_numpy(dtype=float),
+        texts=[str(t) for t in df['text'].tolist()],
+    )
     
-    return sorted(events, key=lambda x: x.start)
+    return events.sort_by_start()
 
 
-def get_time_range(events: List[ADEvent]) -> Tuple[float, float]:
+def get_time_range(events: EventSequence) -> Tuple[float, float]:
     """
     Get the time range covered by a list of events.
     
     Args:
-        events: List of ADEvent objects
+        events: List of ADEvent objects or an EventTable
         
     Returns:
         Tuple of (min_start_time, max_end_time)
     """
-    if not events:
+    if not len(events):
         return (0.0, 0.0)
     
+    if isinstance(events, EventTable):
+        return (float(events.start.min()), float(events.end.max()))
+    
     min_start = min(e.start for e in events)
     max_end = max(e.end for e in events)
     return (min_start, max_end)
@@ -271,18 +580,18 @@ def generate_output_filename(
     return os.path.join(output_dir, filename)
 
 
-def combine_texts(events: List[ADEvent], separator: str = ' ') -> str:
+def combine_texts(events: EventSequence, separator: str = ' ') -> str:
     """
     Combine text from multiple events into a single string.
     
     Args:
-        events: List of ADEvent objects
+        events: List of ADEvent objects or an EventTable
         separator: String to use between texts (default: space)
         
     Returns:
         Combined text string
     """
-    if not events:
+    if not len(events):
         return ''
     
     # Sort by start time and combine
@@ -291,8 +600,8 @@ def combine_texts(events: List[ADEvent], separator: str = ' ') -> str:
 
 
 def calculate_coverage_stats(
-    gen_events: List[ADEvent],
-    ref_events: List[ADEvent],
+    gen_events: EventSequence,
+    ref_events: EventSequence,
     matched_pairs: List[MatchedPair]
 ) -> Dict[str, Any]:
     """